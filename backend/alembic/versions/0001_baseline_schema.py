@@ -0,0 +1,285 @@
+"""baseline schema
+
+Schema of the models as of the last hand-written SQL migration
+(migrations/008_add_sync_tombstones.sql). Databases created before Alembic
+are stamped at this revision by app.db.migrate instead of running it.
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-18 15:28:44.716583
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ENUM_TYPES = [
+    'equipmenttype', 'gender', 'membercategory', 'discipline', 'memberstatus', 'userrole',
+    'licensestatus', 'messagepriority', 'paymenttype', 'paymentmethod', 'paymentstatus',
+    'transactiontype', 'transactioncategory',
+]
+
+
+def upgrade() -> None:
+    op.create_table('clubs',
+    sa.Column('name', sa.String(length=200), nullable=False),
+    sa.Column('city', sa.String(length=100), nullable=True),
+    sa.Column('slogan', sa.String(length=500), nullable=True),
+    sa.Column('logo_url', sa.Text(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('device_id', sa.String(length=100), nullable=True),
+    sa.Column('sync_version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('equipment',
+    sa.Column('club_id', sa.String(length=36), nullable=False),
+    sa.Column('name', sa.String(length=200), nullable=False),
+    sa.Column('equipment_type', sa.Enum('JUDOGI', 'BELT', 'ZORI', 'BAG', 'PROTECTION', 'OTHER', name='equipmenttype'), nullable=False),
+    sa.Column('size', sa.String(length=50), nullable=True),
+    sa.Column('price', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('stock_quantity', sa.Integer(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('device_id', sa.String(length=100), nullable=True),
+    sa.Column('sync_version', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['club_id'], ['clubs.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_equipment_club_sync_version', 'equipment', ['club_id', 'sync_version'], unique=False)
+    op.create_table('members',
+    sa.Column('club_id', sa.String(length=36), nullable=False),
+    sa.Column('first_name', sa.String(length=100), nullable=False),
+    sa.Column('last_name', sa.String(length=100), nullable=False),
+    sa.Column('date_of_birth', sa.Date(), nullable=False),
+    sa.Column('gender', sa.Enum('MALE', 'FEMALE', name='gender'), nullable=False),
+    sa.Column('phone', sa.String(length=20), nullable=True),
+    sa.Column('email', sa.String(length=100), nullable=True),
+    sa.Column('address', sa.Text(), nullable=True),
+    sa.Column('photo_url', sa.String(length=500), nullable=True),
+    sa.Column('parent_name', sa.String(length=200), nullable=True),
+    sa.Column('parent_phone', sa.String(length=20), nullable=True),
+    sa.Column('parent_email', sa.String(length=100), nullable=True),
+    sa.Column('category', sa.Enum('MINI_POUSSIN', 'POUSSIN', 'BENJAMIN', 'MINIME', 'CADET', 'JUNIOR', 'SENIOR', 'VETERAN', name='membercategory'), nullable=False),
+    sa.Column('discipline', sa.Enum('JUDO', 'JU_JITSU', 'TAISO', name='discipline'), nullable=False),
+    sa.Column('belt_level', sa.String(length=50), nullable=False),
+    sa.Column('status', sa.Enum('ACTIVE', 'SUSPENDED', 'PENDING', 'INACTIVE', name='memberstatus'), nullable=False),
+    sa.Column('medical_certificate_url', sa.String(length=500), nullable=True),
+    sa.Column('medical_certificate_expiry', sa.Date(), nullable=True),
+    sa.Column('monthly_fee', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('registration_fee', sa.Numeric(precision=15, scale=2), nullable=True),
+    sa.Column('has_discount', sa.Boolean(), nullable=True),
+    sa.Column('discount_percentage', sa.Numeric(precision=5, scale=2), nullable=True),
+    sa.Column('registration_date', sa.Date(), nullable=False),
+    sa.Column('last_renewal_date', sa.Date(), nullable=True),
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('device_id', sa.String(length=100), nullable=True),
+    sa.Column('sync_version', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['club_id'], ['clubs.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_members_club_sync_version', 'members', ['club_id', 'sync_version'], unique=False)
+    op.create_table('sync_devices',
+    sa.Column('club_id', sa.String(length=36), nullable=False),
+    sa.Column('device_id', sa.String(length=100), nullable=False),
+    sa.Column('last_seq', sa.Integer(), nullable=False),
+    sa.Column('last_seen_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['club_id'], ['clubs.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('club_id', 'device_id')
+    )
+    op.create_table('sync_sequences',
+    sa.Column('club_id', sa.String(length=36), nullable=False),
+    sa.Column('last_seq', sa.Integer(), nullable=False),
+    sa.Column('purged_seq', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['club_id'], ['clubs.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('club_id')
+    )
+    op.create_table('sync_tombstones',
+    sa.Column('club_id', sa.String(length=36), nullable=False),
+    sa.Column('entity', sa.String(length=50), nullable=False),
+    sa.Column('record_id', sa.String(length=36), nullable=False),
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('device_id', sa.String(length=100), nullable=True),
+    sa.Column('sync_version', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['club_id'], ['clubs.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_sync_tombstones_club_sync_version', 'sync_tombstones', ['club_id', 'sync_version'], unique=False)
+    op.create_table('users',
+    sa.Column('club_id', sa.String(length=36), nullable=False),
+    sa.Column('email', sa.String(length=100), nullable=False),
+    sa.Column('hashed_password', sa.String(length=200), nullable=False),
+    sa.Column('first_name', sa.String(length=100), nullable=False),
+    sa.Column('last_name', sa.String(length=100), nullable=False),
+    sa.Column('phone', sa.String(length=20), nullable=True),
+    sa.Column('role', sa.Enum('ADMIN', 'SECRETARY', name='userrole'), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('device_id', sa.String(length=100), nullable=True),
+    sa.Column('sync_version', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['club_id'], ['clubs.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+    op.create_table('attendances',
+    sa.Column('club_id', sa.String(length=36), nullable=False),
+    sa.Column('member_id', sa.String(length=36), nullable=False),
+    sa.Column('attendance_date', sa.Date(), nullable=False),
+    sa.Column('is_present', sa.Boolean(), nullable=False),
+    sa.Column('recorded_by', sa.String(length=36), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('device_id', sa.String(length=100), nullable=True),
+    sa.Column('sync_version', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['club_id'], ['clubs.id'], ),
+    sa.ForeignKeyConstraint(['member_id'], ['members.id'], ),
+    sa.ForeignKeyConstraint(['recorded_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_attendances_club_sync_version', 'attendances', ['club_id', 'sync_version'], unique=False)
+    op.create_table('equipment_purchases',
+    sa.Column('club_id', sa.String(length=36), nullable=False),
+    sa.Column('member_id', sa.String(length=36), nullable=False),
+    sa.Column('equipment_id', sa.String(length=36), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('unit_price', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('total_amount', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('purchase_date', sa.Date(), nullable=False),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('device_id', sa.String(length=100), nullable=True),
+    sa.Column('sync_version', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['club_id'], ['clubs.id'], ),
+    sa.ForeignKeyConstraint(['equipment_id'], ['equipment.id'], ),
+    sa.ForeignKeyConstraint(['member_id'], ['members.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_equipment_purchases_club_sync_version', 'equipment_purchases', ['club_id', 'sync_version'], unique=False)
+    op.create_table('licenses',
+    sa.Column('club_id', sa.String(length=36), nullable=False),
+    sa.Column('member_id', sa.String(length=36), nullable=False),
+    sa.Column('license_number', sa.String(length=100), nullable=True),
+    sa.Column('season', sa.String(length=20), nullable=False),
+    sa.Column('issue_date', sa.Date(), nullable=False),
+    sa.Column('expiry_date', sa.Date(), nullable=False),
+    sa.Column('amount', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('status', sa.Enum('ACTIVE', 'EXPIRED', 'PENDING', name='licensestatus'), nullable=False),
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('device_id', sa.String(length=100), nullable=True),
+    sa.Column('sync_version', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['club_id'], ['clubs.id'], ),
+    sa.ForeignKeyConstraint(['member_id'], ['members.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_licenses_club_sync_version', 'licenses', ['club_id', 'sync_version'], unique=False)
+    op.create_table('messages',
+    sa.Column('club_id', sa.String(length=36), nullable=False),
+    sa.Column('title', sa.String(length=200), nullable=False),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('priority', sa.Enum('LOW', 'NORMAL', 'HIGH', name='messagepriority'), nullable=False),
+    sa.Column('is_published', sa.Boolean(), nullable=False),
+    sa.Column('sent_by', sa.String(length=36), nullable=True),
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('device_id', sa.String(length=100), nullable=True),
+    sa.Column('sync_version', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['club_id'], ['clubs.id'], ),
+    sa.ForeignKeyConstraint(['sent_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_messages_club_sync_version', 'messages', ['club_id', 'sync_version'], unique=False)
+    op.create_table('payments',
+    sa.Column('club_id', sa.String(length=36), nullable=False),
+    sa.Column('member_id', sa.String(length=36), nullable=False),
+    sa.Column('amount', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('payment_type', sa.Enum('MONTHLY_FEE', 'REGISTRATION', 'EQUIPMENT', 'LICENSE', 'OTHER', name='paymenttype'), nullable=False),
+    sa.Column('payment_method', sa.Enum('CASH', 'MOBILE_MONEY', 'BANK_TRANSFER', name='paymentmethod'), nullable=False),
+    sa.Column('payment_date', sa.Date(), nullable=False),
+    sa.Column('status', sa.Enum('PAID', 'PENDING', 'LATE', 'CANCELLED', name='paymentstatus'), nullable=False),
+    sa.Column('month_year', sa.String(length=7), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('receipt_number', sa.String(length=50), nullable=True),
+    sa.Column('recorded_by', sa.String(length=36), nullable=True),
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('device_id', sa.String(length=100), nullable=True),
+    sa.Column('sync_version', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['club_id'], ['clubs.id'], ),
+    sa.ForeignKeyConstraint(['member_id'], ['members.id'], ),
+    sa.ForeignKeyConstraint(['recorded_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_payments_club_sync_version', 'payments', ['club_id', 'sync_version'], unique=False)
+    op.create_table('transactions',
+    sa.Column('club_id', sa.String(length=36), nullable=False),
+    sa.Column('transaction_type', sa.Enum('INCOME', 'EXPENSE', name='transactiontype'), nullable=False),
+    sa.Column('category', sa.Enum('MEMBERSHIP_FEE', 'EQUIPMENT_SALE', 'LICENSE_FEE', 'SUBSIDY', 'DONATION', 'RENT', 'UTILITIES', 'EQUIPMENT_PURCHASE', 'SALARY', 'INSURANCE', 'OTHER', name='transactioncategory'), nullable=False),
+    sa.Column('amount', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('transaction_date', sa.Date(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('reference', sa.String(length=100), nullable=True),
+    sa.Column('recorded_by', sa.String(length=36), nullable=True),
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('device_id', sa.String(length=100), nullable=True),
+    sa.Column('sync_version', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['club_id'], ['clubs.id'], ),
+    sa.ForeignKeyConstraint(['recorded_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_transactions_club_sync_version', 'transactions', ['club_id', 'sync_version'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_transactions_club_sync_version', table_name='transactions')
+    op.drop_table('transactions')
+    op.drop_index('idx_payments_club_sync_version', table_name='payments')
+    op.drop_table('payments')
+    op.drop_index('idx_messages_club_sync_version', table_name='messages')
+    op.drop_table('messages')
+    op.drop_index('idx_licenses_club_sync_version', table_name='licenses')
+    op.drop_table('licenses')
+    op.drop_index('idx_equipment_purchases_club_sync_version', table_name='equipment_purchases')
+    op.drop_table('equipment_purchases')
+    op.drop_index('idx_attendances_club_sync_version', table_name='attendances')
+    op.drop_table('attendances')
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+    op.drop_table('users')
+    op.drop_index('idx_sync_tombstones_club_sync_version', table_name='sync_tombstones')
+    op.drop_table('sync_tombstones')
+    op.drop_table('sync_sequences')
+    op.drop_table('sync_devices')
+    op.drop_index('idx_members_club_sync_version', table_name='members')
+    op.drop_table('members')
+    op.drop_index('idx_equipment_club_sync_version', table_name='equipment')
+    op.drop_table('equipment')
+    op.drop_table('clubs')
+    for name in ENUM_TYPES:
+        sa.Enum(name=name).drop(op.get_bind(), checkfirst=True)
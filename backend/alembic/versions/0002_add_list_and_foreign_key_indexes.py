@@ -0,0 +1,55 @@
+"""add list and foreign key indexes
+
+One (club_id, sort key, id) index per default list sort, so keyset pages
+are read in index order, plus the member_id lookups of the member detail
+screens. Plain CREATE INDEX blocks writes on each table while it builds.
+No (club_id, updated_at) indexes: since sync pulls by sync_version, no
+query filters on updated_at, and (club_id, sync_version) is already
+indexed on every synced table.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 15:35:28.987086
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('idx_attendances_club_attendance_date', 'attendances', ['club_id', 'attendance_date', 'id'], unique=False)
+    op.create_index('idx_attendances_member_attendance_date', 'attendances', ['member_id', 'attendance_date'], unique=False)
+    op.create_index('idx_equipment_purchases_club_purchase_date', 'equipment_purchases', ['club_id', 'purchase_date', 'id'], unique=False)
+    op.create_index('idx_equipment_purchases_member_id', 'equipment_purchases', ['member_id'], unique=False)
+    op.create_index('idx_licenses_club_expiry_date', 'licenses', ['club_id', 'expiry_date', 'id'], unique=False)
+    op.create_index('idx_licenses_member_id', 'licenses', ['member_id'], unique=False)
+    op.create_index('idx_members_club_last_name', 'members', ['club_id', 'last_name', 'id'], unique=False)
+    op.create_index('idx_messages_club_created_at', 'messages', ['club_id', 'created_at', 'id'], unique=False)
+    op.create_index('idx_payments_club_month_year', 'payments', ['club_id', 'month_year'], unique=False)
+    op.create_index('idx_payments_club_payment_date', 'payments', ['club_id', 'payment_date', 'id'], unique=False)
+    op.create_index('idx_payments_member_payment_date', 'payments', ['member_id', 'payment_date'], unique=False)
+    op.create_index('idx_transactions_club_transaction_date', 'transactions', ['club_id', 'transaction_date', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_transactions_club_transaction_date', table_name='transactions')
+    op.drop_index('idx_payments_member_payment_date', table_name='payments')
+    op.drop_index('idx_payments_club_payment_date', table_name='payments')
+    op.drop_index('idx_payments_club_month_year', table_name='payments')
+    op.drop_index('idx_messages_club_created_at', table_name='messages')
+    op.drop_index('idx_members_club_last_name', table_name='members')
+    op.drop_index('idx_licenses_member_id', table_name='licenses')
+    op.drop_index('idx_licenses_club_expiry_date', table_name='licenses')
+    op.drop_index('idx_equipment_purchases_member_id', table_name='equipment_purchases')
+    op.drop_index('idx_equipment_purchases_club_purchase_date', table_name='equipment_purchases')
+    op.drop_index('idx_attendances_member_attendance_date', table_name='attendances')
+    op.drop_index('idx_attendances_club_attendance_date', table_name='attendances')
@@ -0,0 +1,58 @@
+"""member search indexes
+
+Accent- and case-insensitive member search (app/core/search.py). Needs the
+unaccent and pg_trgm contrib extensions, which ship with the official
+postgres images and are trusted, so the database owner can create them.
+The index expressions must stay identical to the ones the search query
+builds.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 16:05:12.381406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+NAME_DOCUMENT = (
+    "f_unaccent(lower(first_name || ' ' || last_name || ' ' || "
+    "coalesce(parent_name, '') || ' ' || coalesce(email, '')))"
+)
+PHONE_DOCUMENT = (
+    "regexp_replace(coalesce(phone, ''), '[^0-9]', '', 'g') || ' ' || "
+    "regexp_replace(coalesce(parent_phone, ''), '[^0-9]', '', 'g')"
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent SCHEMA public")
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm SCHEMA public")
+    # unaccent() is only STABLE because its dictionary could change, which
+    # rules it out of index expressions; pinning the dictionary makes the
+    # wrapper safe to declare IMMUTABLE.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION f_unaccent(text) RETURNS text
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+        AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$
+    """)
+    op.execute(f"CREATE INDEX idx_members_search_names ON members USING gin (({NAME_DOCUMENT}) gin_trgm_ops)")
+    op.execute(f"CREATE INDEX idx_members_search_phones ON members USING gin (({PHONE_DOCUMENT}) gin_trgm_ops)")
+    op.execute("CREATE INDEX idx_members_club_last_name_key ON members (club_id, (f_unaccent(lower(last_name))) text_pattern_ops)")
+    op.execute("CREATE INDEX idx_members_club_first_name_key ON members (club_id, (f_unaccent(lower(first_name))) text_pattern_ops)")
+
+
+def downgrade() -> None:
+    op.drop_index('idx_members_club_first_name_key', table_name='members')
+    op.drop_index('idx_members_club_last_name_key', table_name='members')
+    op.drop_index('idx_members_search_phones', table_name='members')
+    op.drop_index('idx_members_search_names', table_name='members')
+    op.execute("DROP FUNCTION IF EXISTS f_unaccent(text)")
+    # The extensions stay installed: other objects may depend on them.
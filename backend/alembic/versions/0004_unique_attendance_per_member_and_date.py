@@ -0,0 +1,64 @@
+"""unique attendance per member and date
+
+Roll calls upsert on (member_id, attendance_date). Existing duplicates are
+removed first: the most recently synced row of each pair is kept and the
+others get a tombstone, so devices drop them on their next pull. The
+unique index replaces idx_attendances_member_attendance_date, which
+covered the same columns.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 17:12:40.529813
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TEMPORARY TABLE duplicate_attendances AS
+        SELECT id, club_id, device_id,
+               row_number() OVER (PARTITION BY club_id ORDER BY id) AS n,
+               count(*) OVER (PARTITION BY club_id) AS total
+        FROM (
+            SELECT id, club_id, device_id,
+                   row_number() OVER (
+                       PARTITION BY member_id, attendance_date
+                       ORDER BY sync_version DESC, updated_at DESC, id
+                   ) AS rank
+            FROM attendances
+        ) ranked
+        WHERE rank > 1
+    """)
+    # Same numbering as allocate_change_seq: one block of sequence values
+    # per club, reserved by bumping its counter.
+    op.execute("""
+        INSERT INTO sync_sequences (club_id, last_seq, purged_seq)
+        SELECT club_id, max(total), 0 FROM duplicate_attendances GROUP BY club_id
+        ON CONFLICT (club_id) DO UPDATE SET last_seq = sync_sequences.last_seq + excluded.last_seq
+    """)
+    op.execute("""
+        INSERT INTO sync_tombstones (id, club_id, entity, record_id, device_id, sync_version)
+        SELECT gen_random_uuid()::text, d.club_id, 'attendances', d.id, d.device_id, s.last_seq - d.total + d.n
+        FROM duplicate_attendances d JOIN sync_sequences s ON s.club_id = d.club_id
+    """)
+    op.execute("DELETE FROM attendances WHERE id IN (SELECT id FROM duplicate_attendances)")
+    op.execute("DROP TABLE duplicate_attendances")
+
+    op.drop_index('idx_attendances_member_attendance_date', table_name='attendances')
+    op.create_unique_constraint('uq_attendances_member_attendance_date', 'attendances', ['member_id', 'attendance_date'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_attendances_member_attendance_date', 'attendances', type_='unique')
+    op.create_index('idx_attendances_member_attendance_date', 'attendances', ['member_id', 'attendance_date'], unique=False)
+    # Removed duplicates are not restored.
@@ -0,0 +1,145 @@
+"""attendance monthly rollups
+
+Per member and per category monthly counts of recorded and present
+attendances, backfilled from the existing rows and then maintained by
+statement-level triggers on attendances. The triggers see every write
+path, including the core upserts of /sync/push and roll calls that
+bypass the ORM, and aggregate a whole statement before touching the
+rollups, so a 500 row sync batch costs a handful of row updates.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 18:02:17.604238
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CATEGORY = postgresql.ENUM(
+    'MINI_POUSSIN', 'POUSSIN', 'BENJAMIN', 'MINIME', 'CADET', 'JUNIOR', 'SENIOR', 'VETERAN',
+    name='membercategory', create_type=False
+)
+
+# The member month keeps the category it was first recorded under, so
+# removing an attendance later decrements the same category bucket even
+# if the member has moved up since.
+ROLL_UP = """
+    CREATE OR REPLACE FUNCTION roll_up_attendances() RETURNS trigger
+    LANGUAGE plpgsql AS $function$
+    DECLARE
+        changes text;
+    BEGIN
+        changes := CASE TG_OP
+            WHEN 'INSERT' THEN 'SELECT club_id, member_id, attendance_date, 1 AS sign, is_present FROM new_rows'
+            WHEN 'DELETE' THEN 'SELECT club_id, member_id, attendance_date, -1 AS sign, is_present FROM old_rows'
+            ELSE 'SELECT club_id, member_id, attendance_date, 1 AS sign, is_present FROM new_rows
+                  UNION ALL
+                  SELECT club_id, member_id, attendance_date, -1 AS sign, is_present FROM old_rows'
+        END;
+        EXECUTE format($sql$
+            WITH deltas AS (
+                SELECT club_id, member_id, date_trunc('month', attendance_date)::date AS month,
+                       sum(sign) AS sessions, sum(sign * is_present::int) AS present
+                FROM (%s) changes
+                GROUP BY 1, 2, 3
+                HAVING sum(sign) <> 0 OR sum(sign * is_present::int) <> 0
+            ), member_months AS (
+                INSERT INTO attendance_member_months (club_id, member_id, month, category, sessions, present)
+                SELECT d.club_id, d.member_id, d.month, m.category, d.sessions, d.present
+                FROM deltas d JOIN members m ON m.id = d.member_id
+                ON CONFLICT (club_id, member_id, month) DO UPDATE
+                SET sessions = attendance_member_months.sessions + excluded.sessions,
+                    present = attendance_member_months.present + excluded.present
+                RETURNING club_id, member_id, month, category
+            )
+            INSERT INTO attendance_category_months (club_id, category, month, sessions, present)
+            SELECT mm.club_id, mm.category, mm.month, sum(d.sessions), sum(d.present)
+            FROM member_months mm JOIN deltas d USING (club_id, member_id, month)
+            GROUP BY 1, 2, 3
+            ON CONFLICT (club_id, category, month) DO UPDATE
+            SET sessions = attendance_category_months.sessions + excluded.sessions,
+                present = attendance_category_months.present + excluded.present
+        $sql$, changes);
+        RETURN NULL;
+    END
+    $function$
+"""
+
+
+def upgrade() -> None:
+    op.create_table('attendance_member_months',
+    sa.Column('club_id', sa.String(length=36), nullable=False),
+    sa.Column('member_id', sa.String(length=36), nullable=False),
+    sa.Column('month', sa.Date(), nullable=False),
+    sa.Column('category', CATEGORY, nullable=False),
+    sa.Column('sessions', sa.Integer(), nullable=False),
+    sa.Column('present', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['club_id'], ['clubs.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['member_id'], ['members.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('club_id', 'member_id', 'month')
+    )
+    op.create_index('idx_attendance_member_months_club_month', 'attendance_member_months', ['club_id', 'month'], unique=False)
+    op.create_table('attendance_category_months',
+    sa.Column('club_id', sa.String(length=36), nullable=False),
+    sa.Column('category', CATEGORY, nullable=False),
+    sa.Column('month', sa.Date(), nullable=False),
+    sa.Column('sessions', sa.Integer(), nullable=False),
+    sa.Column('present', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['club_id'], ['clubs.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('club_id', 'category', 'month')
+    )
+
+    # Writers are held off until the backfill and the triggers commit
+    # together, so no attendance is counted twice or missed.
+    op.execute("LOCK TABLE attendances IN SHARE MODE")
+    op.execute("""
+        INSERT INTO attendance_member_months (club_id, member_id, month, category, sessions, present)
+        SELECT a.club_id, a.member_id, date_trunc('month', a.attendance_date)::date, m.category,
+               count(*), count(*) FILTER (WHERE a.is_present)
+        FROM attendances a JOIN members m ON m.id = a.member_id
+        GROUP BY 1, 2, 3, 4
+    """)
+    op.execute("""
+        INSERT INTO attendance_category_months (club_id, category, month, sessions, present)
+        SELECT club_id, category, month, sum(sessions), sum(present)
+        FROM attendance_member_months
+        GROUP BY 1, 2, 3
+    """)
+
+    op.execute(ROLL_UP)
+    # Transition tables allow a single event per trigger.
+    op.execute("""
+        CREATE TRIGGER attendances_roll_up_insert AFTER INSERT ON attendances
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION roll_up_attendances()
+    """)
+    op.execute("""
+        CREATE TRIGGER attendances_roll_up_update AFTER UPDATE ON attendances
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION roll_up_attendances()
+    """)
+    op.execute("""
+        CREATE TRIGGER attendances_roll_up_delete AFTER DELETE ON attendances
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION roll_up_attendances()
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS attendances_roll_up_delete ON attendances")
+    op.execute("DROP TRIGGER IF EXISTS attendances_roll_up_update ON attendances")
+    op.execute("DROP TRIGGER IF EXISTS attendances_roll_up_insert ON attendances")
+    op.execute("DROP FUNCTION IF EXISTS roll_up_attendances()")
+    op.drop_table('attendance_category_months')
+    op.drop_index('idx_attendance_member_months_club_month', table_name='attendance_member_months')
+    op.drop_table('attendance_member_months')
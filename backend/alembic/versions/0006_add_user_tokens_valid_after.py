@@ -0,0 +1,30 @@
+"""add user tokens_valid_after
+
+Durable token revocation: read routes trust token claims, so a role
+change stamps the user and older tokens are rejected on every worker,
+with or without Redis.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 09:41:03.118524
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('tokens_valid_after', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'tokens_valid_after')
@@ -1,21 +1,168 @@
-from fastapi import APIRouter, Depends
+import uuid
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import Float, and_, cast, func, literal_column, or_, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from typing import List, Optional
 from app.db.base import get_db
-from app.core.deps import get_current_user
-from app.models.user import User
-from app.models.attendance import Attendance
+from app.core.pagination import ListParams, ListSpec, paginate
+from app.core.deps import get_current_principal, get_read_db, get_token_principal
+from app.models.attendance import Attendance, AttendanceCategoryMonth, AttendanceMemberMonth
+from app.models.member import Member, MemberCategory
+from app.models.sync import allocate_change_seq
+from app.schemas.auth import Principal
+from app.schemas.attendance import (
+    AttendanceResponse, AttendanceSessionRequest, AttendanceSessionSummary,
+    CategoryAttendanceRate, MemberAttendanceRate, MonthlyAttendanceRate
+)
 
 router = APIRouter()
 
-@router.get("/")
-def get_attendances(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    attendances = db.query(Attendance).filter(Attendance.club_id == current_user.club_id).all()
-    return attendances
+ATTENDANCE_LIST = ListSpec(
+    Attendance, sort=["attendance_date", "created_at"], default_sort="-attendance_date",
+    filters=["member_id", "is_present"], date_field="attendance_date"
+)
 
-@router.post("/")
-def create_attendance(attendance_data: dict, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+@router.get("/", response_model=List[AttendanceResponse])
+async def get_attendances(response: Response, params: ListParams = Depends(), current_user: Principal = Depends(get_token_principal), db: AsyncSession = Depends(get_read_db)):
+    return await paginate(db, select(Attendance).where(Attendance.club_id == current_user.club_id), ATTENDANCE_LIST, params, response)
+
+def window_start(months: int) -> date:
+    # The current month counts as the last of the window.
+    today = date.today()
+    index = today.year * 12 + today.month - months
+    return date(index // 12, index % 12 + 1, 1)
+
+def attendance_rate(sessions, present):
+    return (cast(present, Float) / func.nullif(sessions, 0)).label("rate")
+
+@router.get("/rates/members", response_model=List[MemberAttendanceRate])
+async def get_member_rates(
+    months: int = Query(3, ge=1, le=60),
+    category: Optional[MemberCategory] = None,
+    current_user: Principal = Depends(get_token_principal),
+    db: AsyncSession = Depends(get_read_db)
+):
+    sessions = func.sum(AttendanceMemberMonth.sessions)
+    present = func.sum(AttendanceMemberMonth.present)
+    query = (
+        select(
+            Member.id.label("member_id"), Member.first_name, Member.last_name, Member.category,
+            sessions.label("sessions"), present.label("present"), attendance_rate(sessions, present),
+        )
+        .join(AttendanceMemberMonth, AttendanceMemberMonth.member_id == Member.id)
+        .where(AttendanceMemberMonth.club_id == current_user.club_id, AttendanceMemberMonth.month >= window_start(months))
+        .group_by(Member.id)
+        .having(sessions > 0)
+        .order_by(Member.last_name, Member.first_name, Member.id)
+    )
+    if category:
+        query = query.where(Member.category == category)
+    result = await db.execute(query)
+    return result.mappings().all()
+
+@router.get("/rates/members/{member_id}", response_model=List[MonthlyAttendanceRate])
+async def get_member_monthly_rates(
+    member_id: str,
+    months: int = Query(12, ge=1, le=60),
+    current_user: Principal = Depends(get_token_principal),
+    db: AsyncSession = Depends(get_read_db)
+):
+    rollup = AttendanceMemberMonth
+    result = await db.execute(
+        select(rollup.month, rollup.sessions, rollup.present, attendance_rate(rollup.sessions, rollup.present))
+        .where(
+            rollup.club_id == current_user.club_id, rollup.member_id == member_id,
+            rollup.month >= window_start(months), rollup.sessions > 0,
+        )
+        .order_by(rollup.month)
+    )
+    return result.mappings().all()
+
+@router.get("/rates/categories", response_model=List[CategoryAttendanceRate])
+async def get_category_rates(
+    months: int = Query(3, ge=1, le=60),
+    current_user: Principal = Depends(get_token_principal),
+    db: AsyncSession = Depends(get_read_db)
+):
+    rollup = AttendanceCategoryMonth
+    result = await db.execute(
+        select(rollup.category, rollup.month, rollup.sessions, rollup.present, attendance_rate(rollup.sessions, rollup.present))
+        .where(rollup.club_id == current_user.club_id, rollup.month >= window_start(months), rollup.sessions > 0)
+        .order_by(rollup.category, rollup.month)
+    )
+    return result.mappings().all()
+
+@router.post("/", response_model=AttendanceResponse)
+def create_attendance(attendance_data: dict, current_user: Principal = Depends(get_current_principal), db: Session = Depends(get_db)):
     attendance = Attendance(**attendance_data, club_id=current_user.club_id, recorded_by=current_user.id)
     db.add(attendance)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        if "uq_attendances_member_attendance_date" not in str(e.orig):
+            raise
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Attendance already recorded for this member and date"
+        )
     db.refresh(attendance)
     return attendance
+
+@router.post("/session", response_model=AttendanceSessionSummary)
+def record_session(session_data: AttendanceSessionRequest, current_user: Principal = Depends(get_current_principal), db: Session = Depends(get_db)):
+    club_id = current_user.club_id
+    # A member sent twice keeps the last entry: one INSERT cannot update
+    # the same row twice.
+    entries = {entry.member_id: entry for entry in session_data.entries}
+    known = set(db.scalars(select(Member.id).where(Member.club_id == club_id, Member.id.in_(entries))))
+    unknown = sorted(entries.keys() - known)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Unknown members: {', '.join(unknown)}"
+        )
+
+    table = Attendance.__table__
+    seq = allocate_change_seq(db, club_id, len(entries))
+    stmt = insert(table).values([
+        dict(
+            id=str(uuid.uuid4()), club_id=club_id, member_id=entry.member_id,
+            attendance_date=session_data.attendance_date, is_present=entry.is_present,
+            notes=entry.notes, recorded_by=current_user.id, sync_version=seq + offset,
+        )
+        for offset, entry in enumerate(entries.values())
+    ])
+    # Rows whose flag and notes did not change are left alone, so devices
+    # do not pull them again; their reserved sequence values go unused.
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.member_id, table.c.attendance_date],
+        set_={
+            "is_present": stmt.excluded.is_present,
+            "notes": func.coalesce(stmt.excluded.notes, table.c.notes),
+            "recorded_by": stmt.excluded.recorded_by,
+            "sync_version": stmt.excluded.sync_version,
+            "updated_at": func.now(),
+        },
+        where=or_(
+            table.c.is_present.is_distinct_from(stmt.excluded.is_present),
+            and_(stmt.excluded.notes.isnot(None), table.c.notes.is_distinct_from(stmt.excluded.notes)),
+        )
+    ).returning(literal_column("xmax = 0"))
+    # xmax is zero on freshly inserted rows and set on updated ones.
+    written = db.scalars(stmt).all()
+
+    db.commit()
+
+    # After the upsert every member of this roll call holds the submitted
+    # flag; other attendances recorded that day are not part of it.
+    present = sum(entry.is_present for entry in entries.values())
+    created = sum(written)
+    return AttendanceSessionSummary(
+        attendance_date=session_data.attendance_date, present=present, absent=len(entries) - present,
+        created=created, updated=len(written) - created, unchanged=len(entries) - len(written),
+    )
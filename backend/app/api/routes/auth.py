@@ -1,24 +1,28 @@
 from datetime import timedelta
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.db.base import get_db
-from app.core.security import verify_password, get_password_hash, create_access_token
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.base import get_async_db
+from app.core.security import verify_and_update_password_async, get_password_hash_async, create_access_token
 from app.core.config import settings
-from app.core.deps import get_current_user
+from app.core.deps import get_token_principal
+from app.core.throttling import client_address, reset_throttle, throttle
 from app.models.user import User, UserRole
 from app.models.club import Club
-from app.schemas.auth import Token, LoginRequest, RegisterRequest
+from app.schemas.auth import Principal, Token, LoginRequest, RegisterRequest, UserResponse
 from datetime import date
 
 router = APIRouter()
 
 @router.post("/register", response_model=Token)
-def register(request: RegisterRequest, db: Session = Depends(get_db)):
+async def register(request: RegisterRequest, http_request: Request, db: AsyncSession = Depends(get_async_db)):
     import logging
     logger = logging.getLogger(__name__)
 
+    throttle("register-ip", client_address(http_request), settings.REGISTER_RATE_LIMIT_PER_IP, settings.REGISTER_RATE_LIMIT_WINDOW_SECONDS)
+
     logger.info(f"Registration attempt for email: {request.email}")
-    existing_user = db.query(User).filter(User.email == request.email).first()
+    existing_user = await db.scalar(select(User).where(User.email == request.email))
     if existing_user:
         logger.warning(f"Email already exists: {request.email}")
         raise HTTPException(
@@ -32,10 +36,10 @@ def register(request: RegisterRequest, db: Session = Depends(get_db)):
         is_active=True
     )
     db.add(new_club)
-    db.flush()
+    await db.flush()
 
     logger.info(f"Hashing password for new user...")
-    hashed_pwd = get_password_hash(request.password)
+    hashed_pwd = await get_password_hash_async(request.password)
     logger.info(f"Password hashed successfully, length: {len(hashed_pwd)}")
 
     new_user = User(
@@ -49,8 +53,7 @@ def register(request: RegisterRequest, db: Session = Depends(get_db)):
         is_active=True
     )
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
 
     logger.info(f"User created successfully: {new_user.email}")
 
@@ -67,12 +70,16 @@ def register(request: RegisterRequest, db: Session = Depends(get_db)):
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.post("/login", response_model=Token)
-def login(request: LoginRequest, db: Session = Depends(get_db)):
+async def login(request: LoginRequest, http_request: Request, db: AsyncSession = Depends(get_async_db)):
     import logging
     logger = logging.getLogger(__name__)
 
+    email = request.email.lower()
+    throttle("login-ip", client_address(http_request), settings.LOGIN_RATE_LIMIT_PER_IP, settings.LOGIN_RATE_LIMIT_WINDOW_SECONDS)
+    throttle("login-email", email, settings.LOGIN_RATE_LIMIT_PER_EMAIL, settings.LOGIN_RATE_LIMIT_WINDOW_SECONDS)
+
     logger.info(f"Login attempt for email: {request.email}")
-    user = db.query(User).filter(User.email == request.email).first()
+    user = await db.scalar(select(User).where(User.email == request.email))
 
     if not user:
         logger.warning(f"User not found: {request.email}")
@@ -82,7 +89,7 @@ def login(request: LoginRequest, db: Session = Depends(get_db)):
         )
 
     logger.info(f"User found: {user.email}, checking password...")
-    password_valid = verify_password(request.password, user.hashed_password)
+    password_valid, new_hash = await verify_and_update_password_async(request.password, user.hashed_password)
     logger.info(f"Password valid: {password_valid}")
 
     if not password_valid:
@@ -99,6 +106,13 @@ def login(request: LoginRequest, db: Session = Depends(get_db)):
             detail="User account is inactive"
         )
 
+    reset_throttle("login-email", email)
+
+    if new_hash:
+        logger.info(f"Rehashing password for user: {user.email}")
+        user.hashed_password = new_hash
+        await db.commit()
+
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         data={
@@ -111,13 +125,26 @@ def login(request: LoginRequest, db: Session = Depends(get_db)):
 
     return {"access_token": access_token, "token_type": "bearer"}
 
-@router.get("/me")
-def get_current_user_info(current_user: User = Depends(get_current_user)):
+@router.get("/me", response_model=UserResponse)
+async def get_current_user_info(current_user: Principal = Depends(get_token_principal), db: AsyncSession = Depends(get_async_db)):
+    user = await db.get(User, current_user.id)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found"
+        )
+
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User account is inactive"
+        )
+
     return {
-        "id": current_user.id,
-        "email": current_user.email,
-        "first_name": current_user.first_name,
-        "last_name": current_user.last_name,
-        "role": current_user.role.value if isinstance(current_user.role, UserRole) else current_user.role,
-        "club_id": current_user.club_id
+        "id": user.id,
+        "email": user.email,
+        "first_name": user.first_name,
+        "last_name": user.last_name,
+        "role": user.role.value if isinstance(user.role, UserRole) else user.role,
+        "club_id": user.club_id
     }
@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 from app.db.base import get_db
-from app.core.deps import get_current_user
-from app.models.user import User
+from app.core.deps import get_current_principal, get_token_principal
+from app.models.club import Club
+from app.schemas.auth import Principal
 from pydantic import BaseModel
 
 router = APIRouter()
@@ -13,24 +14,33 @@ class ClubUpdate(BaseModel):
     slogan: str | None = None
     logo_url: str | None = None
 
-@router.get("/my-club")
-def get_my_club(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+class ClubResponse(BaseModel):
+    id: str
+    club_name: str
+    city: str | None = None
+    slogan: str | None = None
+    logo: str | None = None
+    is_active: bool
+
+@router.get("/my-club", response_model=ClubResponse)
+def get_my_club(current_user: Principal = Depends(get_token_principal), db: Session = Depends(get_db)):
+    club = db.query(Club).filter(Club.id == current_user.club_id).first()
     return {
-        "id": str(current_user.club.id),
-        "club_name": current_user.club.name,
-        "city": current_user.club.city,
-        "slogan": current_user.club.slogan,
-        "logo": current_user.club.logo_url,
-        "is_active": current_user.club.is_active
+        "id": str(club.id),
+        "club_name": club.name,
+        "city": club.city,
+        "slogan": club.slogan,
+        "logo": club.logo_url,
+        "is_active": club.is_active
     }
 
-@router.put("/my-club")
+@router.put("/my-club", response_model=ClubResponse)
 def update_my_club(
     club_data: ClubUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
-    club = current_user.club
+    club = db.query(Club).filter(Club.id == current_user.club_id).first()
     club.name = club_data.name
     club.city = club_data.city
     club.slogan = club_data.slogan
@@ -1,10 +1,14 @@
+import time
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from app.db.base import get_db
 from app.core.security import get_password_hash
-from app.core.deps import get_current_user
+from app.core.deps import get_current_principal, require_role
+from app.core.principals import invalidate_principal, revoke_tokens
 from app.models.user import User, UserRole
+from app.schemas.auth import Principal
 from pydantic import BaseModel, EmailStr
+from typing import List, Optional
 
 router = APIRouter()
 
@@ -23,18 +27,20 @@ class EmployeeUpdate(BaseModel):
     phone: str = None
     role: str = None
 
-@router.get("")
+class EmployeeResponse(BaseModel):
+    id: str
+    first_name: str
+    last_name: str
+    email: str
+    phone: Optional[str] = None
+    role: str
+    is_active: bool
+
+@router.get("", response_model=List[EmployeeResponse])
 def get_employees(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(require_role("ADMIN", detail="Only admins can view employees")),
     db: Session = Depends(get_db)
 ):
-    user_role = current_user.role.value if isinstance(current_user.role, UserRole) else current_user.role
-    if user_role != "ADMIN":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only admins can view employees"
-        )
-
     employees = db.query(User).filter(
         User.club_id == current_user.club_id
     ).all()
@@ -49,10 +55,10 @@ def get_employees(
         "is_active": emp.is_active
     } for emp in employees]
 
-@router.post("")
+@router.post("", response_model=EmployeeResponse)
 def create_employee(
     employee: EmployeeCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     user_role = current_user.role.value if isinstance(current_user.role, UserRole) else current_user.role
@@ -102,11 +108,11 @@ def create_employee(
         "is_active": new_employee.is_active
     }
 
-@router.put("/{employee_id}")
+@router.put("/{employee_id}", response_model=EmployeeResponse)
 def update_employee(
     employee_id: str,
     employee: EmployeeUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     user_role = current_user.role.value if isinstance(current_user.role, UserRole) else current_user.role
@@ -150,10 +156,13 @@ def update_employee(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid role"
             )
+        if existing_employee.role != UserRole[employee.role.upper()]:
+            revoke_tokens(existing_employee)
         existing_employee.role = UserRole[employee.role.upper()]
 
     db.commit()
     db.refresh(existing_employee)
+    invalidate_principal(existing_employee.id, existing_employee.tokens_valid_after)
 
     return {
         "id": existing_employee.id,
@@ -168,7 +177,7 @@ def update_employee(
 @router.delete("/{employee_id}")
 def delete_employee(
     employee_id: str,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     user_role = current_user.role.value if isinstance(current_user.role, UserRole) else current_user.role
@@ -198,5 +207,7 @@ def delete_employee(
 
     db.delete(employee)
     db.commit()
+    # One second past now, so no token from this second survives either.
+    invalidate_principal(employee_id, int(time.time()) + 1)
 
     return {"message": "Employee deleted successfully"}
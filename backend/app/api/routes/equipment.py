@@ -1,32 +1,44 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from typing import List
 from app.db.base import get_db
-from app.core.deps import get_current_user
-from app.models.user import User
+from app.core.pagination import ListParams, ListSpec, paginate
+from app.core.deps import get_current_principal, get_read_db, get_token_principal
 from app.models.equipment import Equipment, EquipmentPurchase
+from app.schemas.auth import Principal
+from app.schemas.equipment import EquipmentResponse, EquipmentPurchaseResponse
 
 router = APIRouter()
 
-@router.get("/")
-def get_equipment(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    equipment = db.query(Equipment).filter(Equipment.club_id == current_user.club_id).all()
-    return equipment
+EQUIPMENT_LIST = ListSpec(
+    Equipment, sort=["name", "price", "created_at"], default_sort="name",
+    filters=["equipment_type", "size"]
+)
+PURCHASE_LIST = ListSpec(
+    EquipmentPurchase, sort=["purchase_date", "total_amount", "created_at"], default_sort="-purchase_date",
+    filters=["member_id", "equipment_id"], date_field="purchase_date"
+)
+
+@router.get("/", response_model=List[EquipmentResponse])
+async def get_equipment(response: Response, params: ListParams = Depends(), current_user: Principal = Depends(get_token_principal), db: AsyncSession = Depends(get_read_db)):
+    return await paginate(db, select(Equipment).where(Equipment.club_id == current_user.club_id), EQUIPMENT_LIST, params, response)
 
-@router.post("/")
-def create_equipment(equipment_data: dict, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+@router.post("/", response_model=EquipmentResponse)
+def create_equipment(equipment_data: dict, current_user: Principal = Depends(get_current_principal), db: Session = Depends(get_db)):
     equipment = Equipment(**equipment_data, club_id=current_user.club_id)
     db.add(equipment)
     db.commit()
     db.refresh(equipment)
     return equipment
 
-@router.get("/purchases")
-def get_purchases(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    purchases = db.query(EquipmentPurchase).filter(EquipmentPurchase.club_id == current_user.club_id).all()
-    return purchases
+@router.get("/purchases", response_model=List[EquipmentPurchaseResponse])
+async def get_purchases(response: Response, params: ListParams = Depends(), current_user: Principal = Depends(get_token_principal), db: AsyncSession = Depends(get_read_db)):
+    return await paginate(db, select(EquipmentPurchase).where(EquipmentPurchase.club_id == current_user.club_id), PURCHASE_LIST, params, response)
 
-@router.post("/purchases")
-def create_purchase(purchase_data: dict, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+@router.post("/purchases", response_model=EquipmentPurchaseResponse)
+def create_purchase(purchase_data: dict, current_user: Principal = Depends(get_current_principal), db: Session = Depends(get_db)):
     purchase = EquipmentPurchase(**purchase_data, club_id=current_user.club_id)
     db.add(purchase)
     db.commit()
@@ -1,19 +1,28 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from typing import List
 from app.db.base import get_db
-from app.core.deps import get_current_user
-from app.models.user import User
+from app.core.pagination import ListParams, ListSpec, paginate
+from app.core.deps import get_current_principal, get_read_db, get_token_principal
 from app.models.license import License
+from app.schemas.auth import Principal
+from app.schemas.license import LicenseResponse
 
 router = APIRouter()
 
-@router.get("/")
-def get_licenses(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    licenses = db.query(License).filter(License.club_id == current_user.club_id).all()
-    return licenses
+LICENSE_LIST = ListSpec(
+    License, sort=["expiry_date", "issue_date", "created_at"], default_sort="-expiry_date",
+    filters=["member_id", "status", "season"], date_field="expiry_date"
+)
 
-@router.post("/")
-def create_license(license_data: dict, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+@router.get("/", response_model=List[LicenseResponse])
+async def get_licenses(response: Response, params: ListParams = Depends(), current_user: Principal = Depends(get_token_principal), db: AsyncSession = Depends(get_read_db)):
+    return await paginate(db, select(License).where(License.club_id == current_user.club_id), LICENSE_LIST, params, response)
+
+@router.post("/", response_model=LicenseResponse)
+def create_license(license_data: dict, current_user: Principal = Depends(get_current_principal), db: Session = Depends(get_db)):
     license = License(**license_data, club_id=current_user.club_id)
     db.add(license)
     db.commit()
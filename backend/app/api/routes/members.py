@@ -1,40 +1,63 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List
 from app.db.base import get_db
-from app.core.deps import get_current_user
-from app.models.user import User
+from app.core.pagination import ListParams, ListSpec, paginate
+from app.core.search import member_search_query
+from app.core.deps import get_current_principal, get_read_db, get_token_principal
 from app.models.member import Member
+from app.schemas.auth import Principal
+from app.schemas.member import MemberResponse, MemberSearchResult
 
 router = APIRouter()
 
-@router.get("/")
-def get_members(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    members = db.query(Member).filter(Member.club_id == current_user.club_id).all()
-    return members
+MEMBER_LIST = ListSpec(
+    Member, sort=["last_name", "first_name", "registration_date", "created_at"], default_sort="last_name",
+    filters=["status", "category", "discipline", "gender", "belt_level"], date_field="registration_date"
+)
 
-@router.get("/{member_id}")
-def get_member(member_id: str, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    member = db.query(Member).filter(
+@router.get("/", response_model=List[MemberResponse])
+async def get_members(response: Response, params: ListParams = Depends(), current_user: Principal = Depends(get_token_principal), db: AsyncSession = Depends(get_read_db)):
+    return await paginate(db, select(Member).where(Member.club_id == current_user.club_id), MEMBER_LIST, params, response)
+
+@router.get("/search", response_model=List[MemberSearchResult])
+async def search_members(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(20, ge=1, le=50),
+    offset: int = Query(0, ge=0, le=500),
+    current_user: Principal = Depends(get_token_principal),
+    db: AsyncSession = Depends(get_read_db)
+):
+    if not q.strip():
+        raise HTTPException(status_code=422, detail="Empty search")
+    result = await db.execute(member_search_query(current_user.club_id, q).limit(limit).offset(offset))
+    return result.mappings().all()
+
+@router.get("/{member_id}", response_model=MemberResponse)
+async def get_member(member_id: str, current_user: Principal = Depends(get_token_principal), db: AsyncSession = Depends(get_read_db)):
+    result = await db.execute(select(*Member.__table__.columns).where(
         Member.id == member_id,
         Member.club_id == current_user.club_id
-    ).first()
+    ))
+    member = result.mappings().first()
 
     if not member:
         raise HTTPException(status_code=404, detail="Member not found")
 
     return member
 
-@router.post("/")
-def create_member(member_data: dict, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+@router.post("/", response_model=MemberResponse)
+def create_member(member_data: dict, current_user: Principal = Depends(get_current_principal), db: Session = Depends(get_db)):
     member = Member(**member_data, club_id=current_user.club_id)
     db.add(member)
     db.commit()
     db.refresh(member)
     return member
 
-@router.put("/{member_id}")
-def update_member(member_id: str, member_data: dict, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+@router.put("/{member_id}", response_model=MemberResponse)
+def update_member(member_id: str, member_data: dict, current_user: Principal = Depends(get_current_principal), db: Session = Depends(get_db)):
     member = db.query(Member).filter(
         Member.id == member_id,
         Member.club_id == current_user.club_id
@@ -51,7 +74,7 @@ def update_member(member_id: str, member_data: dict, current_user: User = Depend
     return member
 
 @router.delete("/{member_id}")
-def delete_member(member_id: str, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def delete_member(member_id: str, current_user: Principal = Depends(get_current_principal), db: Session = Depends(get_db)):
     member = db.query(Member).filter(
         Member.id == member_id,
         Member.club_id == current_user.club_id
@@ -1,19 +1,28 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from typing import List
 from app.db.base import get_db
-from app.core.deps import get_current_user
-from app.models.user import User
+from app.core.pagination import ListParams, ListSpec, paginate
+from app.core.deps import get_current_principal, get_read_db, get_token_principal
 from app.models.message import Message
+from app.schemas.auth import Principal
+from app.schemas.message import MessageResponse
 
 router = APIRouter()
 
-@router.get("/")
-def get_messages(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    messages = db.query(Message).filter(Message.club_id == current_user.club_id).all()
-    return messages
+MESSAGE_LIST = ListSpec(
+    Message, sort=["created_at"], default_sort="-created_at",
+    filters=["priority", "is_published"], date_field="created_at"
+)
 
-@router.post("/")
-def create_message(message_data: dict, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+@router.get("/", response_model=List[MessageResponse])
+async def get_messages(response: Response, params: ListParams = Depends(), current_user: Principal = Depends(get_token_principal), db: AsyncSession = Depends(get_read_db)):
+    return await paginate(db, select(Message).where(Message.club_id == current_user.club_id), MESSAGE_LIST, params, response)
+
+@router.post("/", response_model=MessageResponse)
+def create_message(message_data: dict, current_user: Principal = Depends(get_current_principal), db: Session = Depends(get_db)):
     message = Message(**message_data, club_id=current_user.club_id, sent_by=current_user.id)
     db.add(message)
     db.commit()
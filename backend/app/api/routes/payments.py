@@ -1,19 +1,28 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from typing import List
 from app.db.base import get_db
-from app.core.deps import get_current_user
-from app.models.user import User
+from app.core.pagination import ListParams, ListSpec, paginate
+from app.core.deps import get_current_principal, get_read_db, get_token_principal
 from app.models.payment import Payment
+from app.schemas.auth import Principal
+from app.schemas.payment import PaymentResponse
 
 router = APIRouter()
 
-@router.get("/")
-def get_payments(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    payments = db.query(Payment).filter(Payment.club_id == current_user.club_id).all()
-    return payments
+PAYMENT_LIST = ListSpec(
+    Payment, sort=["payment_date", "amount", "created_at"], default_sort="-payment_date",
+    filters=["member_id", "status", "payment_type", "payment_method", "month_year"], date_field="payment_date"
+)
 
-@router.post("/")
-def create_payment(payment_data: dict, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+@router.get("/", response_model=List[PaymentResponse])
+async def get_payments(response: Response, params: ListParams = Depends(), current_user: Principal = Depends(get_token_principal), db: AsyncSession = Depends(get_read_db)):
+    return await paginate(db, select(Payment).where(Payment.club_id == current_user.club_id), PAYMENT_LIST, params, response)
+
+@router.post("/", response_model=PaymentResponse)
+def create_payment(payment_data: dict, current_user: Principal = Depends(get_current_principal), db: Session = Depends(get_db)):
     payment = Payment(**payment_data, club_id=current_user.club_id, recorded_by=current_user.id)
     db.add(payment)
     db.commit()
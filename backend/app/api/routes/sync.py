@@ -1,104 +1,702 @@
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+import hashlib
+import json
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from pathlib import Path
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, Request, Response, status
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import FileResponse, StreamingResponse
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import Integer, String, and_, bindparam, func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Dict, Any
-from datetime import datetime
-from app.db.base import get_db
-from app.core.deps import get_current_user
-from app.models.user import User
-from app.models import Member, Payment, License, Equipment, EquipmentPurchase, Attendance, Transaction, Message
+from typing import List, Dict, Any, Optional
+from app.db.base import get_async_db, AsyncSessionLocal
+from app.db.routing import open_read_session
+from app.core.cache import MemoryCache, get_cache, get_json, set_json
+from app.core.config import settings
+from app.core.deps import get_current_principal_async, get_read_db, get_stream_principal, get_token_principal
+from app.core.encoding import (
+    NDJSON, body_too_large, compress_stream_async, decode_body, encoder_for,
+    negotiate_content_encoding, negotiate_media_type, parse_header_tokens
+)
+from app.core.notifications import broker
+from app.core.security import create_stream_ticket
+from app.models.sync import (
+    MODEL_MAP, SyncTombstone, allocate_change_seq, changes_published, get_change_seq,
+    get_purged_seq, lock_change_seq, purge_tombstones, register_device
+)
+from app.schemas.auth import Principal
+from app.schemas.sync import SyncPullRequest, SyncPushChanges
 
 router = APIRouter()
 
-MODEL_MAP = {
-    "members": Member,
-    "payments": Payment,
-    "licenses": License,
-    "equipment": Equipment,
-    "equipment_purchases": EquipmentPurchase,
-    "attendances": Attendance,
-    "transactions": Transaction,
-    "messages": Message,
+# Unique keys other than the id. Devices create rows offline under their own
+# ids, so two of them can record the same member and day; the second push
+# gets the server row back as a conflict instead of a unique violation.
+NATURAL_KEYS = {
+    "attendances": ("member_id", "attendance_date"),
 }
 
-@router.post("/pull")
-def pull_changes(
-    last_sync: Dict[str, str],
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    changes = {}
+TOMBSTONES = "tombstones"
+
+# Named column projections; None streams every column of the entity.
+SYNC_PROFILES = {
+    "full": {entity_name: None for entity_name in MODEL_MAP},
+    "coach": {
+        "members": [
+            "first_name", "last_name", "date_of_birth", "gender", "category",
+            "discipline", "belt_level", "status", "photo_url", "medical_certificate_expiry"
+        ],
+        "attendances": ["member_id", "attendance_date", "is_present", "recorded_by"],
+        "licenses": ["member_id", "season", "expiry_date", "status"],
+    },
+}
+
+PROJECTION_COLUMNS = ["id", "sync_version"]
+
+SNAPSHOT_PAGE_SIZE = 2 ** 31 - 2
+
+SERVER_COLUMNS = {"id", "club_id", "updated_at", "sync_version"}
 
+push_changes_adapter = TypeAdapter(SyncPushChanges)
+
+def resolve_projection(request: SyncPullRequest) -> Dict[str, list]:
+    profile = request.profile or "full"
+    if profile not in SYNC_PROFILES:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Unknown sync profile: {profile}"
+        )
+
+    selection = dict(SYNC_PROFILES[profile])
+    if request.entities is not None:
+        selection = {entity_name: selection.get(entity_name) for entity_name in request.entities}
+    selection.update(request.columns)
+
+    unknown = [entity_name for entity_name in selection if entity_name not in MODEL_MAP]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Unknown sync entities: {', '.join(unknown)}"
+        )
+
+    projection = {}
     for entity_name, model_class in MODEL_MAP.items():
-        last_sync_time = last_sync.get(entity_name)
+        if entity_name not in selection:
+            continue
+        table = model_class.__table__
+        names = selection[entity_name]
+        if names is None:
+            projection[entity_name] = list(table.columns)
+            continue
 
-        query = db.query(model_class).filter(model_class.club_id == current_user.club_id)
+        unknown = [name for name in names if name not in table.columns]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Unknown columns for {entity_name}: {', '.join(unknown)}"
+            )
+        names = list(dict.fromkeys(PROJECTION_COLUMNS + names))
+        projection[entity_name] = [table.c[name] for name in names]
+    return projection
 
-        if last_sync_time:
-            try:
-                sync_datetime = datetime.fromisoformat(last_sync_time)
-                query = query.filter(model_class.updated_at > sync_datetime)
-            except ValueError:
-                pass
+def record_payloads(entity_name: str, columns, layout: str):
+    names = [c.name for c in columns]
 
-        records = query.all()
-        changes[entity_name] = [
+    def to_payloads(records):
+        if layout == "columnar":
+            return [{
+                "type": "rows",
+                "entity": entity_name,
+                "rows": [list(record) for record in records]
+            }]
+        return [
             {
+                "type": "record",
+                "entity": entity_name,
                 "id": record.id,
-                "data": {c.name: getattr(record, c.name) for c in record.__table__.columns},
-                "updated_at": record.updated_at.isoformat()
+                "data": dict(zip(names, record)),
+                "seq": record.sync_version
             }
             for record in records
         ]
 
+    header = {"type": "columns", "entity": entity_name, "columns": names} if layout == "columnar" else None
+    return header, to_payloads
+
+def tombstone_payloads(records):
+    return [
+        {"type": "delete", "entity": tombstone.entity, "id": tombstone.record_id, "seq": tombstone.sync_version}
+        for tombstone in records
+    ]
+
+async def stream_entity_changes(db: AsyncSession, cursor_name: str, query, model_class, cursor: int, watermark: int, page_size: int, to_payloads, encode, header=None):
+    query = (
+        query.where(model_class.sync_version > cursor)
+        .order_by(model_class.sync_version)
+        .limit(page_size + 1)
+        .execution_options(yield_per=settings.SYNC_PULL_CHUNK_SIZE)
+    )
+
+    sent = 0
+    has_more = False
+    last = cursor
+
+    result = await db.stream(query)
+    async for chunk in result.partitions():
+        if sent + len(chunk) > page_size:
+            chunk = chunk[:page_size - sent]
+            has_more = True
+
+        payloads = to_payloads(chunk) if chunk else []
+        if header and sent == 0 and chunk:
+            payloads.insert(0, header)
+        sent += len(chunk)
+        if chunk:
+            last = chunk[-1].sync_version
+
+        if has_more:
+            break
+        payloads.append({"type": "cursor", "entity": cursor_name, "cursor": last})
+        yield b"".join(encode(payload) for payload in payloads)
+
+    if not has_more:
+        last = max(last, watermark)
+        payloads = []
+    payloads.append({"type": "cursor", "entity": cursor_name, "cursor": last, "has_more": has_more})
+    yield b"".join(encode(payload) for payload in payloads)
+
+# Every change notification makes each open device pull, so this worker
+# remembers what it last wrote: the device row is only written when its
+# acknowledged seq moves or SYNC_DEVICE_TOUCH_SECONDS have passed, and a
+# club's tombstones are purged at most once per SYNC_TOMBSTONE_PURGE_SECONDS.
+device_acks = MemoryCache(settings.CACHE_MEMORY_MAX_ENTRIES)
+
+async def acknowledge_device(club_id: str, device_id: str, acknowledged_seq: int):
+    ack_key = f"sync:ack:{club_id}:{device_id}"
+    register = device_acks.get(ack_key) != str(acknowledged_seq)
+    purge = device_acks.add(f"sync:purge:{club_id}", "1", settings.SYNC_TOMBSTONE_PURGE_SECONDS)
+    if not register and not purge:
+        return
+
+    # The pull itself may read from the replica; device bookkeeping and the
+    # tombstone purge it allows are writes, so they go to the primary.
+    async with AsyncSessionLocal() as db:
+        if register:
+            await db.run_sync(register_device, club_id, device_id, acknowledged_seq)
+        if purge:
+            await db.run_sync(purge_tombstones, club_id, settings.SYNC_DEVICE_RETENTION_DAYS)
+        await db.commit()
+    if register:
+        device_acks.set(ack_key, str(acknowledged_seq), settings.SYNC_DEVICE_TOUCH_SECONDS)
+
+async def stream_changes(club_id: str, device_id: Optional[str], request: SyncPullRequest, projection: Dict[str, list], encode):
+    page_size = request.page_size or settings.SYNC_PULL_PAGE_SIZE
+    cursors = request.cursors
+    async with await open_read_session(club_id) as db:
+        watermark = await db.run_sync(get_change_seq, club_id)
+        tombstone_cursor = cursors.get(TOMBSTONES)
+
+        if tombstone_cursor is not None and tombstone_cursor < await db.run_sync(get_purged_seq, club_id):
+            yield encode({"type": "reset"})
+            cursors = {}
+            tombstone_cursor = None
+
+        if device_id:
+            await acknowledge_device(club_id, device_id, tombstone_cursor if tombstone_cursor is not None else watermark)
+
+        if tombstone_cursor is None:
+            yield encode({"type": "cursor", "entity": TOMBSTONES, "cursor": watermark, "has_more": False})
+        else:
+            query = select(SyncTombstone.entity, SyncTombstone.record_id, SyncTombstone.sync_version).where(
+                SyncTombstone.club_id == club_id,
+                SyncTombstone.entity.in_(projection.keys())
+            )
+            async for chunk in stream_entity_changes(db, TOMBSTONES, query, SyncTombstone, tombstone_cursor, watermark, page_size, tombstone_payloads, encode):
+                yield chunk
+
+        for entity_name, columns in projection.items():
+            model_class = MODEL_MAP[entity_name]
+            cursor = cursors.get(entity_name) or 0
+            query = select(*columns).where(model_class.club_id == club_id)
+            header, to_payloads = record_payloads(entity_name, columns, request.layout)
+            async for chunk in stream_entity_changes(db, entity_name, query, model_class, cursor, watermark, page_size, to_payloads, encode, header):
+                yield chunk
+
+        yield encode({"type": "end", "sync_seq": watermark})
+
+@router.post("/pull")
+async def pull_changes(
+    request: SyncPullRequest,
+    accept: Optional[str] = Header(default=None),
+    accept_encoding: Optional[str] = Header(default=None),
+    x_device_id: Optional[str] = Header(default=None, max_length=100),
+    current_user: Principal = Depends(get_token_principal)
+):
+    projection = resolve_projection(request)
+    media_type = negotiate_media_type(accept)
+    content_encoding = negotiate_content_encoding(accept_encoding)
+    headers = {"Vary": "Accept, Accept-Encoding"}
+    if content_encoding:
+        headers["Content-Encoding"] = content_encoding
+
+    chunks = stream_changes(current_user.club_id, x_device_id, request, projection, encoder_for(media_type))
+    return StreamingResponse(
+        compress_stream_async(chunks, content_encoding),
+        media_type=media_type,
+        headers=headers
+    )
+
+def load_snapshot(club_id: str) -> Optional[dict]:
+    directory = Path(settings.SYNC_SNAPSHOT_DIR)
+    try:
+        snapshot = json.loads((directory / f"{club_id}.json").read_text())
+    except (OSError, ValueError):
+        return None
+    if not (directory / snapshot["file"]).exists():
+        return None
+    return snapshot
+
+async def build_snapshot(club_id: str) -> Optional[dict]:
+    # A snapshot is the columnar pull of a device without cursors, stored
+    # gzipped on disk; one worker builds it while the others keep serving.
+    lock_key = f"sync:snapshot:{club_id}"
+    if not get_cache().add(lock_key, "1", settings.SYNC_SNAPSHOT_BUILD_TIMEOUT):
+        return None
+
+    directory = Path(settings.SYNC_SNAPSHOT_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    tmp = directory / f".{club_id}.{uuid.uuid4().hex}.tmp"
+    try:
+        request = SyncPullRequest.model_construct(
+            cursors={}, page_size=SNAPSHOT_PAGE_SIZE, layout="columnar",
+            profile=None, entities=None, columns={}
+        )
+        encode_ndjson = encoder_for(NDJSON)
+        snapshot = {"club_id": club_id}
+
+        def encode(payload):
+            if payload["type"] == "end":
+                snapshot["seq"] = payload["sync_seq"]
+            return encode_ndjson(payload)
+
+        chunks = stream_changes(club_id, None, request, resolve_projection(request), encode)
+        with open(tmp, "wb") as f:
+            async for part in compress_stream_async(chunks, "gzip"):
+                f.write(part)
+
+        previous = load_snapshot(club_id)
+        snapshot["file"] = f"{club_id}-{snapshot['seq']}.ndjson.gz"
+        snapshot["size"] = tmp.stat().st_size
+        snapshot["built_at"] = datetime.now(timezone.utc).isoformat()
+        os.replace(tmp, directory / snapshot["file"])
+        tmp.write_text(json.dumps(snapshot))
+        os.replace(tmp, directory / f"{club_id}.json")
+
+        # The previous blob may still be in flight to a device, so only the
+        # ones before it are removed.
+        keep = {snapshot["file"], previous["file"] if previous else None}
+        for path in directory.glob(f"{club_id}-*.ndjson.gz"):
+            if path.name not in keep:
+                path.unlink(missing_ok=True)
+        return snapshot
+    finally:
+        tmp.unlink(missing_ok=True)
+        get_cache().delete(lock_key)
+
+def snapshot_is_stale(db: Session, snapshot: dict) -> bool:
+    built_at = datetime.fromisoformat(snapshot["built_at"])
+    if datetime.now(timezone.utc) - built_at > timedelta(hours=settings.SYNC_SNAPSHOT_MAX_AGE_HOURS):
+        return True
+    return get_change_seq(db, snapshot["club_id"]) - snapshot["seq"] > settings.SYNC_SNAPSHOT_MAX_LAG
+
+@router.get("/snapshot")
+async def get_snapshot(
+    background_tasks: BackgroundTasks,
+    accept_encoding: Optional[str] = Header(default=None),
+    current_user: Principal = Depends(get_token_principal),
+    db: AsyncSession = Depends(get_read_db)
+):
+    if "gzip" not in parse_header_tokens(accept_encoding):
+        raise HTTPException(
+            status_code=status.HTTP_406_NOT_ACCEPTABLE,
+            detail="Snapshots are only served gzip-encoded"
+        )
+
+    club_id = current_user.club_id
+    snapshot = load_snapshot(club_id)
+
+    # Tombstones older than the snapshot may already be purged, which would
+    # force the device into a reset right after bootstrapping.
+    if snapshot is None or snapshot["seq"] < await db.run_sync(get_purged_seq, club_id):
+        snapshot = await build_snapshot(club_id)
+        if snapshot is None:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Snapshot is being built",
+                headers={"Retry-After": "30"}
+            )
+    elif await db.run_sync(snapshot_is_stale, snapshot):
+        background_tasks.add_task(build_snapshot, club_id)
+
+    return FileResponse(
+        Path(settings.SYNC_SNAPSHOT_DIR) / snapshot["file"],
+        media_type=NDJSON,
+        headers={
+            "Content-Encoding": "gzip",
+            "Cache-Control": "private, no-cache",
+            "ETag": f'"{snapshot["seq"]}"',
+            "X-Sync-Seq": str(snapshot["seq"])
+        }
+    )
+
+@router.post("/events/ticket")
+def create_events_ticket(current_user: Principal = Depends(get_token_principal)):
     return {
-        "changes": changes,
-        "sync_timestamp": datetime.utcnow().isoformat()
+        "ticket": create_stream_ticket(current_user),
+        "expires_in": settings.SYNC_EVENTS_TICKET_SECONDS
     }
 
-@router.post("/push")
-def push_changes(
-    changes: Dict[str, List[Dict[str, Any]]],
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    results = {"success": [], "errors": []}
+@router.get("/events")
+async def change_events(current_user: Principal = Depends(get_stream_principal)):
+    club_id = current_user.club_id
 
-    for entity_name, records in changes.items():
-        if entity_name not in MODEL_MAP:
+    async def events():
+        queue = broker.subscribe(club_id)
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                try:
+                    seq = await asyncio.wait_for(queue.get(), settings.SYNC_EVENTS_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"id: {seq}\nevent: change\ndata: {json.dumps({'seq': seq})}\n\n"
+        finally:
+            broker.unsubscribe(club_id, queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@lru_cache(maxsize=None)
+def column_adapters(model_class) -> Dict[str, TypeAdapter]:
+    # asyncpg binds parameters with their declared types instead of letting
+    # PostgreSQL cast text, so dates and amounts sent as JSON are parsed here.
+    return {
+        c.name: TypeAdapter(Optional[c.type.python_type])
+        for c in model_class.__table__.columns
+        if not isinstance(c.type, String)
+    }
+
+def validate_records(entity_name: str, model_class, records: List[Dict[str, Any]], club_id: str, device_id: Optional[str]):
+    columns = model_class.__table__.columns
+    rows = {}
+    base_versions = {}
+    errors = []
+
+    for record_data in records:
+        record_id = record_data.get("id")
+        data = record_data.get("data")
+        # Only an explicit flag or an explicit null deletes: a record that
+        # merely lacks its data is a client bug, not a delete.
+        deleted = (
+            record_data.get("deleted") is True
+            or ("data" in record_data and data is None)
+            or (isinstance(data, dict) and data.get("deleted") is True)
+        )
+
+        if not record_id or not (deleted or isinstance(data, dict)):
+            errors.append({"entity": entity_name, "id": record_id, "error": "Record must have an id and a data object"})
+            continue
+
+        base_versions.setdefault(record_id, record_data.get("base_version", (data or {}).get("sync_version")))
+        if deleted:
+            rows[record_id] = None
             continue
 
-        model_class = MODEL_MAP[entity_name]
+        row = {key: value for key, value in data.items() if key in columns and key not in SERVER_COLUMNS}
+        invalid = None
+        for key, adapter in column_adapters(model_class).items():
+            if key in row:
+                try:
+                    row[key] = adapter.validate_python(row[key])
+                except ValidationError:
+                    invalid = key
+                    break
+        if invalid:
+            errors.append({"entity": entity_name, "id": record_id, "error": f"Invalid value for {invalid}"})
+            continue
+
+        row["id"] = record_id
+        row["club_id"] = club_id
+        if device_id:
+            row["device_id"] = device_id
+        rows[record_id] = {**(rows.get(record_id) or {}), **row}
+
+    upserts = [row for row in rows.values() if row is not None]
+    deletes = [record_id for record_id, row in rows.items() if row is None]
+    return upserts, deletes, base_versions, errors
+
+def missing_required_columns(model_class, row: Dict[str, Any]) -> List[str]:
+    return [
+        c.name for c in model_class.__table__.columns
+        if not c.nullable and c.default is None and c.server_default is None and c.name not in row
+    ]
+
+def upsert_rows(db: Session, model_class, rows: List[Dict[str, Any]], base_versions: Dict[str, Any]) -> set:
+    # Compare-and-set: a row is only overwritten at the version the device
+    # based its edit on. The versions were already compared under the club
+    # lock taken by lock_change_seq; the condition keeps the write correct
+    # on its own. Rows it skips are not returned.
+    table = model_class.__table__
+    shapes = {}
+    for row in rows:
+        shapes.setdefault(tuple(sorted(row)), []).append({**row, "base_version": base_versions[row["id"]]})
+
+    applied = set()
+    for keys, group in shapes.items():
+        stmt = insert(table)
+        update_columns = {key: stmt.excluded[key] for key in keys if key not in ("id", "club_id", "created_at")}
+        update_columns["updated_at"] = func.now()
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.id],
+            set_=update_columns,
+            where=and_(
+                table.c.club_id == stmt.excluded.club_id,
+                table.c.sync_version == bindparam("base_version", type_=Integer)
+            )
+        ).returning(table.c.id)
+        applied.update(db.scalars(stmt, group))
+    return applied
+
+def apply_entity_changes(db: Session, entity_name: str, model_class, records: List[Dict[str, Any]], club_id: str, device_id: Optional[str], results: Dict[str, list]):
+    rows, deletes, base_versions, errors = validate_records(entity_name, model_class, records, club_id, device_id)
+    results["errors"].extend(errors)
+    if not rows and not deletes:
+        return
 
-        for record_data in records:
+    table = model_class.__table__
+    existing = {
+        server_row["id"]: dict(server_row)
+        for server_row in db.execute(
+            select(table).where(table.c.id.in_([row["id"] for row in rows] + deletes))
+        ).mappings()
+    }
+
+    upsert_entity_rows(db, entity_name, model_class, rows, existing, base_versions, club_id, results)
+    delete_entity_rows(db, entity_name, model_class, deletes, existing, base_versions, club_id, results)
+
+def conflict_entry(entity_name: str, record_id: str, base_version, server_row):
+    return {
+        "entity": entity_name,
+        "id": record_id,
+        "base_version": base_version,
+        "server_version": server_row["sync_version"] if server_row else None,
+        "server": server_row
+    }
+
+def upsert_entity_rows(db: Session, entity_name: str, model_class, rows, existing, base_versions, club_id: str, results: Dict[str, list]):
+    valid_rows = []
+    for row in rows:
+        server_row = existing.get(row["id"])
+        server_version = server_row["sync_version"] if server_row else None
+        base_version = base_versions[row["id"]]
+        if server_row and server_row["club_id"] != club_id:
+            results["errors"].append({"entity": entity_name, "id": row["id"], "error": "Record belongs to another club"})
+        elif base_version != server_version:
+            results["conflicts"].append(conflict_entry(entity_name, row["id"], base_version, server_row))
+        elif server_row:
+            current = {key: value for key, value in server_row.items() if key not in SERVER_COLUMNS}
+            valid_rows.append({**current, **row})
+        elif missing_required_columns(model_class, row):
+            missing = ", ".join(missing_required_columns(model_class, row))
+            results["errors"].append({"entity": entity_name, "id": row["id"], "error": f"Missing required fields: {missing}"})
+        else:
+            valid_rows.append(row)
+
+    if entity_name in NATURAL_KEYS:
+        valid_rows = claim_natural_keys(db, entity_name, model_class, valid_rows, base_versions, club_id, results)
+    if not valid_rows:
+        return
+
+    seq = allocate_change_seq(db, club_id, len(valid_rows))
+    for offset, row in enumerate(valid_rows):
+        row["sync_version"] = seq + offset
+
+    try:
+        with db.begin_nested():
+            applied_ids = upsert_rows(db, model_class, valid_rows, base_versions)
+        attempted = valid_rows
+    except SQLAlchemyError:
+        applied_ids = set()
+        attempted = []
+        for row in valid_rows:
             try:
-                record_id = record_data.get("id")
-                data = record_data.get("data", {})
-
-                data["club_id"] = current_user.club_id
-
-                existing = db.query(model_class).filter(model_class.id == record_id).first()
-
-                if existing:
-                    for key, value in data.items():
-                        if key not in ["id", "created_at"]:
-                            setattr(existing, key, value)
-                    db.commit()
-                    results["success"].append({"entity": entity_name, "id": record_id, "action": "updated"})
-                else:
-                    new_record = model_class(**data)
-                    db.add(new_record)
-                    db.commit()
-                    results["success"].append({"entity": entity_name, "id": record_id, "action": "created"})
-
-            except Exception as e:
-                db.rollback()
+                with db.begin_nested():
+                    applied_ids |= upsert_rows(db, model_class, [row], base_versions)
+                attempted.append(row)
+            except SQLAlchemyError as e:
                 results["errors"].append({
                     "entity": entity_name,
-                    "id": record_data.get("id"),
-                    "error": str(e)
+                    "id": row["id"],
+                    "error": str(getattr(e, "orig", None) or e)
                 })
 
-    return {
+    applied = [row for row in attempted if row["id"] in applied_ids]
+    skipped = [row["id"] for row in attempted if row["id"] not in applied_ids]
+    if skipped:
+        table = model_class.__table__
+        for server_row in db.execute(select(table).where(table.c.id.in_(skipped))).mappings():
+            if server_row["club_id"] != club_id:
+                results["errors"].append({"entity": entity_name, "id": server_row["id"], "error": "Record belongs to another club"})
+            else:
+                results["conflicts"].append(conflict_entry(entity_name, server_row["id"], base_versions[server_row["id"]], dict(server_row)))
+
+    for row in applied:
+        action = "updated" if row["id"] in existing else "created"
+        results["success"].append({"entity": entity_name, "id": row["id"], "action": action, "version": row["sync_version"]})
+
+def claim_natural_keys(db: Session, entity_name: str, model_class, rows, base_versions, club_id: str, results: Dict[str, list]):
+    table = model_class.__table__
+    key_columns = [table.c[name] for name in NATURAL_KEYS[entity_name]]
+    keys = {tuple(row.get(name) for name in NATURAL_KEYS[entity_name]) for row in rows}
+    holders = {
+        tuple(server_row[name] for name in NATURAL_KEYS[entity_name]): dict(server_row)
+        for server_row in db.execute(select(table).where(tuple_(*key_columns).in_(keys))).mappings()
+    }
+
+    claimed = []
+    for row in rows:
+        server_row = holders.get(tuple(row.get(name) for name in NATURAL_KEYS[entity_name]))
+        if server_row is None or server_row["id"] == row["id"]:
+            claimed.append(row)
+        elif server_row["club_id"] != club_id:
+            results["errors"].append({"entity": entity_name, "id": row["id"], "error": "Record belongs to another club"})
+        else:
+            # The device replaces its row with the server one, whose id differs.
+            results["conflicts"].append(conflict_entry(entity_name, row["id"], base_versions[row["id"]], server_row))
+    return claimed
+
+def delete_entity_rows(db: Session, entity_name: str, model_class, deletes, existing, base_versions, club_id: str, results: Dict[str, list]):
+    for record_id in deletes:
+        server_row = existing.get(record_id)
+        base_version = base_versions[record_id]
+
+        if server_row and server_row["club_id"] != club_id:
+            results["errors"].append({"entity": entity_name, "id": record_id, "error": "Record belongs to another club"})
+            continue
+        if server_row and base_version is not None and base_version != server_row["sync_version"]:
+            results["conflicts"].append(conflict_entry(entity_name, record_id, base_version, server_row))
+            continue
+
+        if server_row:
+            try:
+                with db.begin_nested():
+                    db.delete(db.get(model_class, record_id))
+                    db.flush()
+            except SQLAlchemyError as e:
+                results["errors"].append({
+                    "entity": entity_name,
+                    "id": record_id,
+                    "error": str(getattr(e, "orig", None) or e)
+                })
+                continue
+
+        results["success"].append({"entity": entity_name, "id": record_id, "action": "deleted", "version": None})
+
+def apply_changes(db: Session, changes: Dict[str, List[Dict[str, Any]]], club_id: str, device_id: Optional[str] = None) -> Dict[str, list]:
+    results = {"success": [], "errors": [], "conflicts": []}
+    lock_change_seq(db, club_id)
+
+    for entity_name, records in changes.items():
+        if entity_name not in MODEL_MAP:
+            continue
+        apply_entity_changes(db, entity_name, MODEL_MAP[entity_name], records, club_id, device_id, results)
+
+    db.commit()
+    return results
+
+async def read_push_changes(request: Request) -> SyncPushChanges:
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > settings.SYNC_MAX_PUSH_BYTES:
+            raise body_too_large(settings.SYNC_MAX_PUSH_BYTES)
+
+    payload = decode_body(
+        bytes(body),
+        request.headers.get("content-type"),
+        request.headers.get("content-encoding"),
+        settings.SYNC_MAX_PUSH_BYTES
+    )
+    try:
+        return push_changes_adapter.validate_python(payload)
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+
+def push_fingerprint(changes: SyncPushChanges) -> str:
+    payload = json.dumps(changes, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+def reserve_idempotency_key(cache_key: str, fingerprint: str) -> Optional[dict]:
+    # The short-lived marker keeps a retry from re-applying a batch that is
+    # still running; it is replaced by the response once the batch commits.
+    marker = json.dumps({"fingerprint": fingerprint})
+    if get_cache().add(cache_key, marker, settings.SYNC_IDEMPOTENCY_LOCK_SECONDS):
+        return None
+
+    entry = get_json(cache_key) or {}
+    if entry.get("fingerprint") != fingerprint:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Idempotency-Key already used for a different batch"
+        )
+    if "response" not in entry:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A batch with this Idempotency-Key is still being applied"
+        )
+    return entry["response"]
+
+@router.post("/push")
+async def push_changes(
+    response: Response,
+    changes: SyncPushChanges = Depends(read_push_changes),
+    x_device_id: Optional[str] = Header(default=None, max_length=100),
+    idempotency_key: Optional[str] = Header(default=None, max_length=255),
+    current_user: Principal = Depends(get_current_principal_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    cache_key = None
+    if idempotency_key:
+        cache_key = f"sync:push:{current_user.club_id}:{idempotency_key}"
+        fingerprint = push_fingerprint(changes)
+        stored = reserve_idempotency_key(cache_key, fingerprint)
+        if stored is not None:
+            response.headers["Idempotent-Replayed"] = "true"
+            return stored
+
+    try:
+        results = await db.run_sync(apply_changes, changes, current_user.club_id, x_device_id)
+    except Exception:
+        if cache_key:
+            get_cache().delete(cache_key)
+        raise
+    await changes_published(db)
+
+    body = {
         "results": results,
         "sync_timestamp": datetime.utcnow().isoformat()
     }
+    if cache_key:
+        set_json(cache_key, {"fingerprint": fingerprint, "response": body}, settings.SYNC_IDEMPOTENCY_TTL_SECONDS)
+    return body
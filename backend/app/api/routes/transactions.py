@@ -1,19 +1,28 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from typing import List
 from app.db.base import get_db
-from app.core.deps import get_current_user
-from app.models.user import User
+from app.core.pagination import ListParams, ListSpec, paginate
+from app.core.deps import get_current_principal, get_read_db, get_token_principal
 from app.models.transaction import Transaction
+from app.schemas.auth import Principal
+from app.schemas.transaction import TransactionResponse
 
 router = APIRouter()
 
-@router.get("/")
-def get_transactions(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    transactions = db.query(Transaction).filter(Transaction.club_id == current_user.club_id).all()
-    return transactions
+TRANSACTION_LIST = ListSpec(
+    Transaction, sort=["transaction_date", "amount", "created_at"], default_sort="-transaction_date",
+    filters=["transaction_type", "category"], date_field="transaction_date"
+)
 
-@router.post("/")
-def create_transaction(transaction_data: dict, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+@router.get("/", response_model=List[TransactionResponse])
+async def get_transactions(response: Response, params: ListParams = Depends(), current_user: Principal = Depends(get_token_principal), db: AsyncSession = Depends(get_read_db)):
+    return await paginate(db, select(Transaction).where(Transaction.club_id == current_user.club_id), TRANSACTION_LIST, params, response)
+
+@router.post("/", response_model=TransactionResponse)
+def create_transaction(transaction_data: dict, current_user: Principal = Depends(get_current_principal), db: Session = Depends(get_db)):
     transaction = Transaction(**transaction_data, club_id=current_user.club_id, recorded_by=current_user.id)
     db.add(transaction)
     db.commit()
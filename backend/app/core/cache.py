@@ -0,0 +1,162 @@
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import Any, Optional
+from app.core.config import settings
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+class MemoryCache:
+    # Per-process TTL store, also the fallback when Redis is unreachable:
+    # entries expire on read and the least recently used are evicted first.
+    available = True
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def _live(self, key: str):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self.entries[key]
+            return None
+        return entry
+
+    def _store(self, key: str, value: str, ttl: int):
+        self.entries[key] = (time.monotonic() + ttl, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        with self.lock:
+            entry = self._live(key)
+            if entry is None:
+                return None
+            self.entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: str, ttl: int):
+        with self.lock:
+            self._store(key, value, ttl)
+
+    def add(self, key: str, value: str, ttl: int) -> bool:
+        with self.lock:
+            if self._live(key):
+                return False
+            self._store(key, value, ttl)
+            return True
+
+    def delete(self, key: str):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def hit_window(self, key: str, limit: int, window: int) -> float:
+        now = time.monotonic()
+        with self.lock:
+            entry = self._live(key)
+            hits = entry[1] if entry else deque()
+            while hits and hits[0] <= now - window:
+                hits.popleft()
+            if len(hits) >= limit:
+                return hits[0] + window - now
+            hits.append(now)
+            self._store(key, hits, window)
+            return 0.0
+
+# Sliding window over a sorted set of hit timestamps, evaluated atomically so
+# concurrent workers cannot both take the last slot.
+HIT_WINDOW_SCRIPT = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+if redis.call('ZCARD', KEYS[1]) < tonumber(ARGV[3]) then
+    redis.call('ZADD', KEYS[1], now, ARGV[4])
+    redis.call('PEXPIRE', KEYS[1], math.ceil(window * 1000))
+    return '0'
+end
+local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+return tostring(tonumber(oldest[2]) + window - now)
+"""
+
+class RedisCache:
+    # The cache only accelerates: while Redis fails, reads miss, writes are
+    # dropped, add() lets the caller proceed and throttling fails open.
+    # After an error Redis is left alone for REDIS_RETRY_SECONDS, so an
+    # outage does not cost every request a socket timeout.
+    def __init__(self, client):
+        self.client = client
+        self.hit_window_script = client.register_script(HIT_WINDOW_SCRIPT)
+        self.retry_at = 0.0
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self.retry_at
+
+    def call(self, fallback, fn, *args, **kwargs):
+        if not self.available:
+            return fallback
+        try:
+            return fn(*args, **kwargs)
+        except redis.RedisError:
+            self.retry_at = time.monotonic() + settings.REDIS_RETRY_SECONDS
+            return fallback
+
+    def get(self, key: str) -> Optional[str]:
+        return self.call(None, self.client.get, key)
+
+    def set(self, key: str, value: str, ttl: int):
+        self.call(None, self.client.set, key, value, ex=ttl)
+
+    def add(self, key: str, value: str, ttl: int) -> bool:
+        return bool(self.call(True, self.client.set, key, value, ex=ttl, nx=True))
+
+    def delete(self, key: str):
+        self.call(None, self.client.delete, key)
+
+    def hit_window(self, key: str, limit: int, window: int) -> float:
+        now = time.time()
+        args = [now, window, limit, f"{now}:{uuid.uuid4().hex}"]
+        return float(self.call(0.0, self.hit_window_script, keys=[key], args=args))
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_redis():
+    if redis is None:
+        return None
+    try:
+        client = redis.Redis.from_url(
+            settings.REDIS_URL,
+            decode_responses=True,
+            socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT
+        )
+        client.ping()
+        return client
+    except redis.RedisError:
+        return None
+
+def get_cache():
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                client = get_redis()
+                _cache = RedisCache(client) if client else MemoryCache(settings.CACHE_MEMORY_MAX_ENTRIES)
+    return _cache
+
+def get_json(key: str) -> Any:
+    value = get_cache().get(key)
+    return json.loads(value) if value is not None else None
+
+def set_json(key: str, value: Any, ttl: int):
+    get_cache().set(key, json.dumps(value, separators=(",", ":")), ttl)
@@ -1,21 +1,98 @@
-from fastapi import Depends, HTTPException, status
+from typing import Optional
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.db.base import get_db
-from app.core.security import decode_token
-from app.models.user import User
-from app.schemas.auth import TokenData
+from app.db.base import get_async_db, get_db
+from app.db.routing import open_read_session
+from app.core.principals import claims_revoked, load_principal, tokens_revoked
+from app.core.security import STREAM_TICKET, decode_token
+from app.schemas.auth import Principal, TokenData
 
 security = HTTPBearer()
 
-def get_current_user(
+def get_current_principal(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
-) -> User:
-    token = credentials.credentials
+) -> Principal:
+    return authenticate_principal(db, credentials.credentials)
+
+async def get_current_principal_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> Principal:
+    # Shares the route's session, so a cache miss costs no extra connection.
+    return await db.run_sync(authenticate_principal, credentials.credentials)
+
+def get_token_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> Principal:
+    return claims_principal(credentials.credentials)
+
+async def get_read_db(current_user: Principal = Depends(get_token_principal)):
+    async with await open_read_session(current_user.club_id) as db:
+        yield db
+
+def get_stream_principal(ticket: str = Query(...)) -> Principal:
+    # EventSource cannot send an Authorization header, and URLs end up in
+    # access logs: the stream only accepts a short-lived ticket, which in
+    # turn is refused as a bearer token.
+    return claims_principal(ticket, STREAM_TICKET)
+
+def require_role(*roles: str, detail: str = "Insufficient permissions"):
+    def check_role(current_user: Principal = Depends(get_token_principal)) -> Principal:
+        if current_user.role not in roles:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=detail,
+            )
+        return current_user
+    return check_role
+
+def claims_principal(token: str, token_type: Optional[str] = None) -> Principal:
+    # Read-only routes trust the signed claims and never read users: role
+    # changes and deletions leave a revocation marker in Redis. Without
+    # Redis, or while it is unreachable, the cached principal decides
+    # instead, which reads users on a cache miss. A revocation made while
+    # Redis was down, or lost with its data, is only enforced by the write
+    # routes until the older tokens expire.
+    payload = decoded_claims(token, token_type)
+    if not payload.get("club_id") or not payload.get("role"):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token payload",
+        )
+
+    revoked = claims_revoked(payload["sub"], payload.get("iat"))
+    if revoked is None:
+        check_principal(payload)
+    elif revoked:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+        )
+
+    return Principal(
+        id=payload["sub"],
+        club_id=payload["club_id"],
+        role=payload["role"],
+        is_active=True
+    )
+
+def authenticate_principal(db: Session, token: str) -> Principal:
+    user_id = verified_claims(token, db)["sub"]
+    # Served from the cache verified_claims just filled.
+    return load_principal(db, user_id)
+
+def verified_claims(token: str, db: Optional[Session] = None) -> dict:
+    payload = decoded_claims(token)
+    check_principal(payload, db)
+    return payload
+
+def decoded_claims(token: str, token_type: Optional[str] = None) -> dict:
     payload = decode_token(token)
 
-    if not payload:
+    if not payload or payload.get("typ") != token_type:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials",
@@ -27,33 +104,32 @@ def get_current_user(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token payload",
         )
+    return payload
 
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
+def check_principal(payload: dict, db: Optional[Session] = None):
+    principal = load_principal(db, payload["sub"])
+    if not principal:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
         )
 
-    if not user.is_active:
+    if tokens_revoked(principal, payload.get("iat")):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+        )
+
+    if not principal.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="User account is inactive",
         )
 
-    return user
-
 def get_token_data(
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> TokenData:
-    token = credentials.credentials
-    payload = decode_token(token)
-
-    if not payload:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials",
-        )
+    payload = verified_claims(credentials.credentials)
 
     return TokenData(
         user_id=payload.get("sub"),
@@ -0,0 +1,163 @@
+import gzip
+import io
+import json
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Iterable, Iterator, Optional, Tuple
+from fastapi import HTTPException, status
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+NDJSON = "application/x-ndjson"
+MSGPACK = "application/x-msgpack"
+
+class RouteGZipMiddleware(GZipMiddleware):
+    # GZip buffers a response until it has enough to compress, which would
+    # hold back a long-lived stream such as server-sent events.
+    def __init__(self, app: ASGIApp, exclude_paths: Iterable[str] = (), **options):
+        super().__init__(app, **options)
+        self.exclude_paths = frozenset(exclude_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+def serialize_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not serializable")
+
+def parse_header_tokens(header: Optional[str]) -> list:
+    tokens = []
+    for part in (header or "").split(","):
+        token, *params = [item.strip() for item in part.split(";")]
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if token and quality > 0:
+            tokens.append(token.lower())
+    return tokens
+
+def negotiate_media_type(accept: Optional[str]) -> str:
+    if msgpack and MSGPACK in parse_header_tokens(accept):
+        return MSGPACK
+    return NDJSON
+
+def negotiate_content_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    tokens = parse_header_tokens(accept_encoding)
+    if zstandard and "zstd" in tokens:
+        return "zstd"
+    if "gzip" in tokens:
+        return "gzip"
+    return None
+
+def encoder_for(media_type: str):
+    if media_type == MSGPACK:
+        return lambda payload: msgpack.packb(payload, default=serialize_value)
+    return lambda payload: (json.dumps(payload, default=serialize_value, separators=(",", ":")) + "\n").encode()
+
+def stream_compressor(content_encoding: Optional[str]) -> Optional[Tuple[Callable[[bytes], bytes], Callable[[], bytes]]]:
+    # Each chunk ends on a sync cursor, so it is flushed whole: the client can
+    # decode and checkpoint it without waiting for the rest of the stream.
+    if content_encoding is None:
+        return None
+
+    if content_encoding == "zstd":
+        compressor = zstandard.ZstdCompressor(level=3).compressobj()
+        flush_block = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        return (lambda chunk: compressor.compress(chunk) + compressor.flush(flush_block)), compressor.flush
+
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return (lambda chunk: compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)), compressor.flush
+
+def compress_stream(chunks: Iterable[bytes], content_encoding: Optional[str]) -> Iterator[bytes]:
+    compressor = stream_compressor(content_encoding)
+    if compressor is None:
+        yield from chunks
+        return
+
+    compress, finish = compressor
+    for chunk in chunks:
+        yield compress(chunk)
+    yield finish()
+
+async def compress_stream_async(chunks: AsyncIterable[bytes], content_encoding: Optional[str]) -> AsyncIterator[bytes]:
+    compressor = stream_compressor(content_encoding)
+    if compressor is None:
+        async for chunk in chunks:
+            yield chunk
+        return
+
+    compress, finish = compressor
+    async for chunk in chunks:
+        yield compress(chunk)
+    yield finish()
+
+def body_too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Request body exceeds {max_bytes} bytes"
+    )
+
+def read_bounded(reader, max_bytes: int) -> bytes:
+    # Decompressed in steps, so a small compressed body cannot expand past
+    # the limit in memory.
+    body = bytearray()
+    while True:
+        chunk = reader.read(max_bytes + 1 - len(body))
+        if not chunk:
+            return bytes(body)
+        body += chunk
+        if len(body) > max_bytes:
+            raise body_too_large(max_bytes)
+
+def decode_body(body: bytes, content_type: Optional[str], content_encoding: Optional[str], max_bytes: int) -> Any:
+    if len(body) > max_bytes:
+        raise body_too_large(max_bytes)
+
+    encodings = parse_header_tokens(content_encoding)
+    try:
+        for encoding in reversed(encodings):
+            if encoding == "gzip":
+                body = read_bounded(gzip.GzipFile(fileobj=io.BytesIO(body)), max_bytes)
+            elif encoding == "zstd" and zstandard:
+                body = read_bounded(zstandard.ZstdDecompressor().stream_reader(io.BytesIO(body)), max_bytes)
+            elif encoding != "identity":
+                raise HTTPException(
+                    status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                    detail=f"Unsupported content encoding: {encoding}"
+                )
+
+        if msgpack and MSGPACK in parse_header_tokens(content_type):
+            return msgpack.unpackb(body)
+        return json.loads(body)
+    except HTTPException:
+        raise
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Malformed request body"
+        )
@@ -0,0 +1,80 @@
+import asyncio
+import json
+import threading
+from typing import Dict, Optional, Set
+from app.core.cache import get_redis, redis
+from app.core.config import settings
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+CHANNEL_PREFIX = "sync:club:"
+
+class ChangeBroker:
+    # One Redis subscription per worker fans change notifications out to the
+    # club's open streams; without Redis, notifications stay in this process.
+    def __init__(self):
+        self.subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.listener: Optional[asyncio.Task] = None
+        self.publisher = None
+        self.publisher_checked = False
+        self.lock = threading.Lock()
+
+    def get_publisher(self):
+        with self.lock:
+            if not self.publisher_checked:
+                self.publisher = get_redis()
+                self.publisher_checked = True
+        return self.publisher
+
+    def publish(self, club_id: str, seq: int):
+        message = json.dumps({"club_id": club_id, "seq": seq})
+        publisher = self.get_publisher()
+        if publisher is not None:
+            try:
+                publisher.publish(f"{CHANNEL_PREFIX}{club_id}", message)
+            except redis.RedisError:
+                pass
+        elif self.loop is not None:
+            self.loop.call_soon_threadsafe(self.dispatch, message)
+
+    def dispatch(self, message: str):
+        payload = json.loads(message)
+        for queue in list(self.subscribers.get(payload["club_id"], ())):
+            # A pending notification already makes the client pull everything
+            # up to now, so later ones for the same club can be dropped.
+            if queue.empty():
+                queue.put_nowait(payload["seq"])
+
+    async def listen(self):
+        client = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
+        pubsub = client.pubsub()
+        await pubsub.psubscribe(f"{CHANNEL_PREFIX}*")
+        try:
+            async for message in pubsub.listen():
+                if message["type"] == "pmessage":
+                    self.dispatch(message["data"])
+        finally:
+            await pubsub.close()
+            await client.close()
+
+    def subscribe(self, club_id: str) -> asyncio.Queue:
+        self.loop = asyncio.get_running_loop()
+        if self.get_publisher() is not None and aioredis and (self.listener is None or self.listener.done()):
+            self.listener = self.loop.create_task(self.listen())
+
+        queue = asyncio.Queue(maxsize=1)
+        self.subscribers.setdefault(club_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, club_id: str, queue: asyncio.Queue):
+        queues = self.subscribers.get(club_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self.subscribers[club_id]
+
+broker = ChangeBroker()
@@ -0,0 +1,144 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime, time, timedelta, timezone
+from typing import List, Optional
+from fastapi import HTTPException, Query, Request, Response, status
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+
+class ListSpec:
+    # Declares, per model, which columns a list endpoint may be sorted and
+    # filtered on. Sort columns must be NOT NULL: rows with a NULL key would
+    # fall outside every keyset comparison and silently drop from the pages.
+    def __init__(self, model, sort: List[str], default_sort: str, filters: List[str] = (), date_field: Optional[str] = None):
+        columns = model.__table__.columns
+        self.model = model
+        self.sort_fields = {name: getattr(model, name) for name in sort}
+        for name in sort:
+            assert not columns[name].nullable, f"{model.__name__}.{name} is nullable"
+        self.default_sort = default_sort
+        self.filters = {name: getattr(model, name) for name in filters}
+        self.adapters = {
+            name: TypeAdapter(columns[name].type.python_type)
+            for name in [*sort, *filters]
+        }
+        self.date_field = getattr(model, date_field) if date_field else None
+        self.date_is_datetime = bool(date_field) and columns[date_field].type.python_type is datetime
+
+class ListParams:
+    def __init__(
+        self,
+        request: Request,
+        limit: int = Query(settings.LIST_PAGE_SIZE, ge=1, le=settings.LIST_MAX_PAGE_SIZE),
+        cursor: Optional[str] = None,
+        sort: Optional[str] = Query(None, description="Sort field, prefixed with - for descending order"),
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        include_total: bool = False,
+    ):
+        self.query_params = request.query_params
+        self.limit = limit
+        self.cursor = cursor
+        self.sort = sort
+        self.date_from = date_from
+        self.date_to = date_to
+        self.include_total = include_total
+
+def invalid(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=detail)
+
+def encode_cursor(sort: str, value, row_id: str) -> str:
+    payload = json.dumps({"s": sort, "v": value, "id": row_id}, default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> dict:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(payload, dict) or not {"s", "v", "id"} <= payload.keys():
+            raise ValueError
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise invalid("Invalid cursor")
+    return payload
+
+def parse_value(spec: ListSpec, name: str, raw):
+    try:
+        return spec.adapters[name].validate_python(raw)
+    except ValidationError:
+        raise invalid(f"Invalid value for {name}")
+
+def apply_filters(query, spec: ListSpec, params: ListParams):
+    for name, column in spec.filters.items():
+        values = [parse_value(spec, name, raw) for raw in params.query_params.getlist(name)]
+        if len(values) == 1:
+            query = query.where(column == values[0])
+        elif values:
+            query = query.where(column.in_(values))
+
+    if (params.date_from or params.date_to) and spec.date_field is None:
+        raise invalid("This list has no date range filter")
+    if params.date_from:
+        start = params.date_from
+        if spec.date_is_datetime:
+            start = datetime.combine(start, time.min, tzinfo=timezone.utc)
+        query = query.where(spec.date_field >= start)
+    if params.date_to:
+        # date_to is inclusive; on timestamp columns that means the whole day.
+        if spec.date_is_datetime:
+            end = datetime.combine(params.date_to + timedelta(days=1), time.min, tzinfo=timezone.utc)
+            query = query.where(spec.date_field < end)
+        else:
+            query = query.where(spec.date_field <= params.date_to)
+    return query
+
+def resolve_sort(spec: ListSpec, params: ListParams):
+    sort = params.sort or spec.default_sort
+    name = sort.lstrip("-")
+    if name not in spec.sort_fields:
+        raise invalid(f"Cannot sort by {name}; allowed: {', '.join(spec.sort_fields)}")
+    return sort, name
+
+def page_query(query, spec: ListSpec, params: ListParams):
+    # Orders the filtered query by (sort key, id), seeks past the cursor and
+    # fetches one extra row to tell whether another page follows. Rows are
+    # read as plain column mappings: building ORM instances only to
+    # serialize them would cost more than the response model itself.
+    sort, name = resolve_sort(spec, params)
+    descending = sort.startswith("-")
+    column = spec.sort_fields[name]
+    row_id = spec.model.id
+
+    if params.cursor:
+        cursor = decode_cursor(params.cursor)
+        if cursor["s"] != sort:
+            raise invalid("Cursor does not match the requested sort")
+        key = tuple_(column, row_id)
+        after = (parse_value(spec, name, cursor["v"]), cursor["id"])
+        query = query.where(key < after if descending else key > after)
+
+    if descending:
+        query = query.order_by(column.desc(), row_id.desc())
+    else:
+        query = query.order_by(column.asc(), row_id.asc())
+    return query.with_only_columns(*spec.model.__table__.columns).limit(params.limit + 1)
+
+def count_query(query):
+    return select(func.count()).select_from(query.order_by(None).subquery())
+
+async def paginate(db: AsyncSession, query, spec: ListSpec, params: ListParams, response: Response) -> list:
+    # Returns one page of rows and advertises the next one through the
+    # X-Next-Cursor header, so the body keeps the plain list shape.
+    sort, name = resolve_sort(spec, params)
+    query = apply_filters(query, spec, params)
+    if params.include_total:
+        response.headers["X-Total-Count"] = str(await db.scalar(count_query(query)))
+
+    result = await db.execute(page_query(query, spec, params))
+    rows = result.mappings().all()
+    if len(rows) > params.limit:
+        rows = rows[:params.limit]
+        last = rows[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(sort, last[name], last["id"])
+    return rows
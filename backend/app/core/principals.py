@@ -0,0 +1,91 @@
+import time
+from typing import Optional
+from sqlalchemy.orm import Session
+from app.core.cache import MemoryCache, RedisCache, get_cache
+from app.core.config import settings
+from app.db.base import SessionLocal
+from app.models.user import User
+from app.schemas.auth import Principal
+
+# The local tier answers most requests without a network hop; its short TTL
+# bounds how long another worker can keep serving an invalidated entry.
+local_principals = MemoryCache(settings.PRINCIPAL_CACHE_MAX_ENTRIES)
+
+def principal_key(user_id: str) -> str:
+    return f"principal:{user_id}"
+
+def revocation_key(user_id: str) -> str:
+    return f"tokens_valid_after:{user_id}"
+
+def shared_cache() -> Optional[RedisCache]:
+    cache = get_cache()
+    return cache if isinstance(cache, RedisCache) else None
+
+def load_principal(db: Optional[Session], user_id: str) -> Optional[Principal]:
+    key = principal_key(user_id)
+    value = local_principals.get(key)
+
+    if value is None:
+        shared = shared_cache()
+        value = shared.get(key) if shared else None
+        if value is None:
+            row = fetch_principal_row(db, user_id)
+            if row is None:
+                return None
+            value = Principal(
+                id=row.id,
+                club_id=row.club_id,
+                role=row.role.value,
+                is_active=row.is_active,
+                tokens_valid_after=row.tokens_valid_after
+            ).model_dump_json()
+            if shared:
+                shared.set(key, value, settings.PRINCIPAL_CACHE_REDIS_TTL_SECONDS)
+        local_principals.set(key, value, settings.PRINCIPAL_CACHE_TTL_SECONDS)
+
+    return Principal.model_validate_json(value)
+
+def fetch_principal_row(db: Optional[Session], user_id: str):
+    # Routes that only trust token claims have no session of their own; a
+    # cache miss reads the primary, so a revocation is never missed on a
+    # lagging replica.
+    if db is None:
+        with SessionLocal() as session:
+            return fetch_principal_row(session, user_id)
+    return db.query(
+        User.id, User.club_id, User.role, User.is_active, User.tokens_valid_after
+    ).filter(User.id == user_id).first()
+
+def invalidate_principal(user_id: str, tokens_valid_after: Optional[int] = None):
+    key = principal_key(user_id)
+    local_principals.delete(key)
+    shared = shared_cache()
+    if shared:
+        shared.delete(key)
+        # Every token issued before the revocation has expired once the
+        # token lifetime has passed, and the marker with it.
+        ttl = (tokens_valid_after or 0) + settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60 - int(time.time())
+        if tokens_valid_after is not None and ttl > 0:
+            shared.set(revocation_key(user_id), str(tokens_valid_after), ttl)
+
+def revoke_tokens(user: User):
+    # Takes effect with the caller's commit, which must be followed by
+    # invalidate_principal(user.id, user.tokens_valid_after); other workers
+    # see it once their local entry expires. iat has whole-second
+    # precision, so a token issued in the same second as the revocation,
+    # such as the re-login that follows a role change, is still accepted.
+    user.tokens_valid_after = int(time.time())
+
+def tokens_revoked(principal: Principal, issued_at: Optional[int]) -> bool:
+    return principal.tokens_valid_after is not None and int(issued_at or 0) < principal.tokens_valid_after
+
+def claims_revoked(user_id: str, issued_at: Optional[int]) -> Optional[bool]:
+    # None when Redis cannot tell: revocations made by other workers are
+    # only visible there.
+    shared = shared_cache()
+    if shared is None:
+        return None
+    valid_after = shared.get(revocation_key(user_id))
+    if valid_after is None and not shared.available:
+        return None
+    return valid_after is not None and int(issued_at or 0) < int(valid_after)
@@ -0,0 +1,73 @@
+import re
+from sqlalchemy import case, func, literal, literal_column, or_, select
+from app.models.member import Member
+
+# These expressions must match, character for character, the index
+# definitions of alembic revision 0003; Postgres only uses an expression
+# index for the very same expression.
+NAME_DOCUMENT = literal_column(
+    "f_unaccent(lower(first_name || ' ' || last_name || ' ' || "
+    "coalesce(parent_name, '') || ' ' || coalesce(email, '')))"
+)
+PHONE_DOCUMENT = literal_column(
+    "regexp_replace(coalesce(phone, ''), '[^0-9]', '', 'g') || ' ' || "
+    "regexp_replace(coalesce(parent_phone, ''), '[^0-9]', '', 'g')"
+)
+LAST_NAME_KEY = literal_column("f_unaccent(lower(last_name))")
+FIRST_NAME_KEY = literal_column("f_unaccent(lower(first_name))")
+
+# Below three characters a term has no trigram to look up, so it only
+# matches as a name prefix.
+MIN_TRIGRAM_LENGTH = 3
+
+def inline(value: str):
+    # Rendered as a constant, so the planner can fold f_unaccent() over it
+    # and match LIKE prefixes against the btree indexes even when asyncpg
+    # reuses a prepared statement.
+    return literal(value, literal_execute=True)
+
+def folded(value: str):
+    return func.f_unaccent(func.lower(inline(value)))
+
+def escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+def member_search_query(club_id: str, term: str):
+    # Ranked by name prefix first, then by trigram word similarity, so
+    # "dup" lists Dupont before Laurent Dupuis and "dupon" still finds a
+    # misspelt "Dupond".
+    term = " ".join(term.split())
+    escaped = escape_like(term)
+    prefix = or_(
+        LAST_NAME_KEY.like(folded(f"{escaped}%"), escape="\\"),
+        FIRST_NAME_KEY.like(folded(f"{escaped}%"), escape="\\"),
+    )
+    matches = [prefix]
+    score = None
+
+    if len(term) >= MIN_TRIGRAM_LENGTH:
+        matches.append(NAME_DOCUMENT.like(folded(f"%{escaped}%"), escape="\\"))
+        matches.append(folded(term).op("<%")(NAME_DOCUMENT))
+        score = func.word_similarity(folded(term), NAME_DOCUMENT)
+
+    digits = re.sub(r"\D", "", term)
+    if len(digits) >= MIN_TRIGRAM_LENGTH:
+        phone = PHONE_DOCUMENT.like(inline(f"%{digits}%"))
+        matches.append(phone)
+        score = case((phone, 1.0), else_=score if score is not None else 0.0)
+
+    ordering = [case((prefix, 0), else_=1)]
+    if score is not None:
+        ordering.append(score.desc())
+    else:
+        score = literal(0.0)
+
+    return (
+        select(
+            Member.id, Member.first_name, Member.last_name, Member.phone, Member.email,
+            Member.parent_name, Member.parent_phone, Member.category, Member.status,
+            Member.belt_level, score.label("score"),
+        )
+        .where(Member.club_id == club_id, or_(*matches))
+        .order_by(*ordering, Member.last_name, Member.first_name, Member.id)
+    )
@@ -1,16 +1,84 @@
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
+from fastapi import HTTPException, status
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Hashes made with another cost are flagged for update, so changing
+# BCRYPT_ROUNDS migrates users as they log in.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS
+)
+
+class PasswordHashPool:
+    # bcrypt releases the GIL, so a few dedicated threads use the CPU fully;
+    # the slot count caps running plus queued hashes, and requests beyond
+    # it are turned away at once instead of tying up the request threadpool.
+    def __init__(self, workers: int, queue_limit: int):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self.slots = threading.BoundedSemaphore(workers + queue_limit)
+
+    def submit(self, fn, *args) -> Future:
+        if not self.slots.acquire(blocking=False):
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many authentication requests in progress",
+                headers={"Retry-After": "1"}
+            )
+
+        future = self.executor.submit(fn, *args)
+        future.add_done_callback(lambda _: self.slots.release())
+        return future
+
+    def run(self, fn, *args):
+        future = self.submit(fn, *args)
+        try:
+            return future.result(timeout=settings.PASSWORD_HASH_TIMEOUT_SECONDS)
+        except TimeoutError:
+            future.cancel()
+            raise overloaded()
+
+    async def run_async(self, fn, *args):
+        # Same admission control, but the event loop keeps serving other
+        # requests while the hash runs.
+        future = self.submit(fn, *args)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), settings.PASSWORD_HASH_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            future.cancel()
+            raise overloaded()
+
+def overloaded() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication service is overloaded",
+        headers={"Retry-After": "5"}
+    )
+
+password_pool = PasswordHashPool(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_QUEUE_LIMIT)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_pool.run(pwd_context.verify, plain_password, hashed_password)
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return password_pool.run(pwd_context.verify_and_update, plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return password_pool.run(pwd_context.hash, password)
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return await password_pool.run_async(pwd_context.verify_and_update, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    return await password_pool.run_async(pwd_context.hash, password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -19,10 +87,20 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
 
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "iat": datetime.utcnow()})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
+# Token type of the short-lived tickets that open /sync/events; access
+# tokens carry no type.
+STREAM_TICKET = "stream"
+
+def create_stream_ticket(principal) -> str:
+    return create_access_token(
+        {"sub": principal.id, "club_id": principal.club_id, "role": principal.role, "typ": STREAM_TICKET},
+        timedelta(seconds=settings.SYNC_EVENTS_TICKET_SECONDS)
+    )
+
 def decode_token(token: str) -> Optional[dict]:
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
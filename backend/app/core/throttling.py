@@ -0,0 +1,21 @@
+import math
+from fastapi import HTTPException, Request, status
+from app.core.cache import get_cache
+
+def client_address(request: Request) -> str:
+    return request.client.host if request.client else "unknown"
+
+def throttle_key(scope: str, identity: str) -> str:
+    return f"throttle:{scope}:{identity}"
+
+def throttle(scope: str, identity: str, limit: int, window: int):
+    retry_after = get_cache().hit_window(throttle_key(scope, identity), limit, window)
+    if retry_after > 0:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many attempts, please try again later",
+            headers={"Retry-After": str(math.ceil(retry_after))}
+        )
+
+def reset_throttle(scope: str, identity: str):
+    get_cache().delete(throttle_key(scope, identity))
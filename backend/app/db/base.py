@@ -1,11 +1,43 @@
+import uuid
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.db.pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool, engine_options
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+engine = create_engine(settings.DATABASE_URL, **engine_options(InstrumentedQueuePool))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+def async_database_url(url: str):
+    # DATABASE_URL stays a psycopg2 URL for scripts and migrations; the
+    # async engine talks to the same database through asyncpg.
+    return make_url(url).set(drivername="postgresql+asyncpg")
+
+# PgBouncer may hand each transaction a different server connection, so
+# asyncpg must not rely on statements prepared on an earlier one.
+PGBOUNCER_ASYNCPG_ARGS = {
+    "statement_cache_size": 0,
+    "prepared_statement_cache_size": 0,
+    "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4().hex}__",
+}
+
+async_engine = create_async_engine(
+    async_database_url(settings.DATABASE_URL),
+    **engine_options(InstrumentedAsyncQueuePool, PGBOUNCER_ASYNCPG_ARGS)
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+replica_engine = None
+ReplicaSessionLocal = None
+if settings.DATABASE_REPLICA_URL:
+    replica_engine = create_async_engine(
+        async_database_url(settings.DATABASE_REPLICA_URL),
+        **engine_options(InstrumentedAsyncQueuePool, PGBOUNCER_ASYNCPG_ARGS)
+    )
+    ReplicaSessionLocal = async_sessionmaker(replica_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 def get_db():
@@ -14,3 +46,7 @@ def get_db():
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,29 @@
+from pathlib import Path
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect, text
+from app.db.base import engine
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+BASELINE_REVISION = "0001"
+# Arbitrary constant shared by every process that may run migrations.
+MIGRATION_LOCK_ID = 7_302_114
+
+def run_migrations():
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option("script_location", str(ALEMBIC_INI.parent / "alembic"))
+
+    with engine.begin() as connection:
+        # Containers started together would otherwise race on the same DDL;
+        # the lock is released when this transaction ends.
+        connection.execute(text("SELECT pg_advisory_xact_lock(:id)"), {"id": MIGRATION_LOCK_ID})
+        config.attributes["connection"] = connection
+
+        inspector = inspect(connection)
+        if not inspector.has_table("alembic_version") and inspector.has_table("clubs"):
+            # Schema built by create_all and the SQL files in migrations/.
+            command.stamp(config, BASELINE_REVISION)
+        command.upgrade(config, "head")
+
+if __name__ == "__main__":
+    run_migrations()
@@ -0,0 +1,99 @@
+import threading
+import time
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+from app.core.config import settings
+
+class PoolStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.checkouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.overflow_events = 0
+        self.timeouts = 0
+
+    def record_checkout(self, wait: float):
+        with self.lock:
+            self.checkouts += 1
+            self.wait_seconds += wait
+            self.max_wait_seconds = max(self.max_wait_seconds, wait)
+
+    def record_timeout(self):
+        with self.lock:
+            self.timeouts += 1
+
+    def record_overflow(self):
+        with self.lock:
+            self.overflow_events += 1
+
+    def as_dict(self) -> dict:
+        with self.lock:
+            return {
+                "checkouts": self.checkouts,
+                "wait_avg_ms": round(1000 * self.wait_seconds / self.checkouts, 3) if self.checkouts else 0.0,
+                "wait_max_ms": round(1000 * self.max_wait_seconds, 3),
+                "overflow_events": self.overflow_events,
+                "timeouts": self.timeouts,
+            }
+
+class InstrumentedPool:
+    # Times every checkout, including the wait for a free connection, so
+    # pool sizes can be set from measured contention rather than guessed.
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.stats.record_timeout()
+            raise
+        self.stats.record_checkout(time.perf_counter() - started)
+        return connection
+
+    def _create_connection(self):
+        if self.overflow() > 0:
+            self.stats.record_overflow()
+        return super()._create_connection()
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+class InstrumentedQueuePool(InstrumentedPool, QueuePool):
+    pass
+
+class InstrumentedAsyncQueuePool(InstrumentedPool, AsyncAdaptedQueuePool):
+    pass
+
+def engine_options(poolclass, pgbouncer_connect_args=None) -> dict:
+    if settings.DB_PGBOUNCER:
+        # In transaction pooling mode PgBouncer owns the server connections;
+        # holding them in a local pool as well would only pin them idle.
+        return {"poolclass": NullPool, "connect_args": pgbouncer_connect_args or {}}
+
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+def pool_status(pool) -> dict:
+    status = {"pool": type(pool).__name__}
+    if isinstance(pool, InstrumentedPool):
+        status.update(
+            size=pool.size(),
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            checked_out=pool.checkedout(),
+            idle=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+            **pool.stats.as_dict()
+        )
+    return status
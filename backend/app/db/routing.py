@@ -0,0 +1,28 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import get_cache
+from app.db.base import AsyncSessionLocal, ReplicaSessionLocal
+from app.models.sync import get_change_seq, written_seq_key
+
+async def open_read_session(club_id: str) -> AsyncSession:
+    # A club that wrote recently reads from the replica only once the replica
+    # has replayed that write; otherwise the primary answers, so a device
+    # never pulls a state older than the one it just pushed or was told about.
+    if ReplicaSessionLocal is None:
+        return AsyncSessionLocal()
+
+    cache = get_cache()
+    written = cache.get(written_seq_key(club_id))
+    if written is None and not cache.available:
+        # Recent writes are unknown while Redis is down.
+        return AsyncSessionLocal()
+
+    db = ReplicaSessionLocal()
+    try:
+        if written is None or await db.run_sync(get_change_seq, club_id) >= int(written):
+            return db
+    except BaseException:
+        await db.close()
+        raise
+
+    await db.close()
+    return AsyncSessionLocal()
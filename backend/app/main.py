@@ -1,15 +1,17 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
-from app.db.base import Base, engine
+from app.core.encoding import RouteGZipMiddleware
+from app.db.base import async_engine, engine, replica_engine
+from app.db.pool import pool_status
 from app.api.routes import auth, clubs, members, payments, licenses, equipment, attendances, transactions, messages, sync, employees
 
-Base.metadata.create_all(bind=engine)
-
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    default_response_class=ORJSONResponse
 )
 
 app.add_middleware(
@@ -18,6 +20,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count"],
+)
+app.add_middleware(
+    RouteGZipMiddleware,
+    minimum_size=1000,
+    exclude_paths=[f"{settings.API_V1_STR}/sync/events"],
 )
 
 @app.get("/")
@@ -32,6 +40,18 @@ def read_root():
 def health_check():
     return {"status": "healthy"}
 
+if settings.POOL_METRICS_ENABLED:
+    @app.get("/health/pool")
+    def pool_health():
+        # Counters are per worker process.
+        pools = {
+            "sync": pool_status(engine.pool),
+            "async": pool_status(async_engine.pool)
+        }
+        if replica_engine is not None:
+            pools["replica"] = pool_status(replica_engine.pool)
+        return pools
+
 app.include_router(auth.router, prefix=f"{settings.API_V1_STR}/auth", tags=["auth"])
 app.include_router(clubs.router, prefix=f"{settings.API_V1_STR}/clubs", tags=["clubs"])
 app.include_router(members.router, prefix=f"{settings.API_V1_STR}/members", tags=["members"])
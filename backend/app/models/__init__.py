@@ -5,9 +5,10 @@ from app.models.member import Member, MemberStatus, MemberCategory, Gender, Disc
 from app.models.payment import Payment, PaymentStatus, PaymentMethod, PaymentType
 from app.models.license import License, LicenseStatus
 from app.models.equipment import Equipment, EquipmentPurchase, EquipmentType
-from app.models.attendance import Attendance
+from app.models.attendance import Attendance, AttendanceMemberMonth, AttendanceCategoryMonth
 from app.models.transaction import Transaction, TransactionType, TransactionCategory
 from app.models.message import Message, MessagePriority
+from app.models.sync import SyncSequence, SyncTombstone, SyncDevice
 
 __all__ = [
     "BaseModel",
@@ -29,9 +30,14 @@ __all__ = [
     "EquipmentPurchase",
     "EquipmentType",
     "Attendance",
+    "AttendanceMemberMonth",
+    "AttendanceCategoryMonth",
     "Transaction",
     "TransactionType",
     "TransactionCategory",
     "Message",
     "MessagePriority",
+    "SyncSequence",
+    "SyncTombstone",
+    "SyncDevice",
 ]
@@ -1,9 +1,17 @@
-from sqlalchemy import Column, String, ForeignKey, Date, Boolean, Text
+from sqlalchemy import Column, Index, Integer, String, ForeignKey, Date, Boolean, Enum, Text, UniqueConstraint
 from sqlalchemy.orm import relationship
+from app.db.base import Base
 from app.models.base import BaseModel
+from app.models.member import MemberCategory
 
 class Attendance(BaseModel):
     __tablename__ = "attendances"
+    __table_args__ = (
+        Index("idx_attendances_club_sync_version", "club_id", "sync_version"),
+        Index("idx_attendances_club_attendance_date", "club_id", "attendance_date", "id"),
+        # One row per member and training day; roll calls upsert against it.
+        UniqueConstraint("member_id", "attendance_date", name="uq_attendances_member_attendance_date"),
+    )
 
     club_id = Column(String(36), ForeignKey("clubs.id"), nullable=False)
     member_id = Column(String(36), ForeignKey("members.id"), nullable=False)
@@ -13,3 +21,29 @@ class Attendance(BaseModel):
     notes = Column(Text, nullable=True)
 
     member = relationship("Member", back_populates="attendances")
+
+# Monthly rollups of attendances, kept up to date by the statement-level
+# triggers of alembic revision 0005 on every write path (ORM, sync push,
+# roll calls). A member's month stays in the category the member had when
+# the month was first recorded.
+class AttendanceMemberMonth(Base):
+    __tablename__ = "attendance_member_months"
+    __table_args__ = (
+        Index("idx_attendance_member_months_club_month", "club_id", "month"),
+    )
+
+    club_id = Column(String(36), ForeignKey("clubs.id", ondelete="CASCADE"), primary_key=True)
+    member_id = Column(String(36), ForeignKey("members.id", ondelete="CASCADE"), primary_key=True)
+    month = Column(Date, primary_key=True)
+    category = Column(Enum(MemberCategory), nullable=False)
+    sessions = Column(Integer, default=0, nullable=False)
+    present = Column(Integer, default=0, nullable=False)
+
+class AttendanceCategoryMonth(Base):
+    __tablename__ = "attendance_category_months"
+
+    club_id = Column(String(36), ForeignKey("clubs.id", ondelete="CASCADE"), primary_key=True)
+    category = Column(Enum(MemberCategory), primary_key=True)
+    month = Column(Date, primary_key=True)
+    sessions = Column(Integer, default=0, nullable=False)
+    present = Column(Integer, default=0, nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, Date, Integer, Numeric, Enum, Text
+from sqlalchemy import Column, Index, String, ForeignKey, Date, Integer, Numeric, Enum, Text
 from sqlalchemy.orm import relationship
 from app.models.base import BaseModel
 import enum
@@ -13,6 +13,9 @@ class EquipmentType(str, enum.Enum):
 
 class Equipment(BaseModel):
     __tablename__ = "equipment"
+    __table_args__ = (
+        Index("idx_equipment_club_sync_version", "club_id", "sync_version"),
+    )
 
     club_id = Column(String(36), ForeignKey("clubs.id"), nullable=False)
     name = Column(String(200), nullable=False)
@@ -27,6 +30,11 @@ class Equipment(BaseModel):
 
 class EquipmentPurchase(BaseModel):
     __tablename__ = "equipment_purchases"
+    __table_args__ = (
+        Index("idx_equipment_purchases_club_sync_version", "club_id", "sync_version"),
+        Index("idx_equipment_purchases_club_purchase_date", "club_id", "purchase_date", "id"),
+        Index("idx_equipment_purchases_member_id", "member_id"),
+    )
 
     club_id = Column(String(36), ForeignKey("clubs.id"), nullable=False)
     member_id = Column(String(36), ForeignKey("members.id"), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, Date, Numeric, Enum
+from sqlalchemy import Column, Index, String, ForeignKey, Date, Numeric, Enum
 from sqlalchemy.orm import relationship
 from app.models.base import BaseModel
 import enum
@@ -10,6 +10,11 @@ class LicenseStatus(str, enum.Enum):
 
 class License(BaseModel):
     __tablename__ = "licenses"
+    __table_args__ = (
+        Index("idx_licenses_club_sync_version", "club_id", "sync_version"),
+        Index("idx_licenses_club_expiry_date", "club_id", "expiry_date", "id"),
+        Index("idx_licenses_member_id", "member_id"),
+    )
 
     club_id = Column(String(36), ForeignKey("clubs.id"), nullable=False)
     member_id = Column(String(36), ForeignKey("members.id"), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, Date, Enum, ForeignKey, Text, Numeric
+from sqlalchemy import Column, Index, String, Boolean, Date, Enum, ForeignKey, Text, Numeric
 from sqlalchemy.orm import relationship
 from app.models.base import BaseModel
 import enum
@@ -30,6 +30,12 @@ class Discipline(str, enum.Enum):
 
 class Member(BaseModel):
     __tablename__ = "members"
+    # The search indexes are expression indexes, created by alembic
+    # revision 0003 to match the queries of app/core/search.py.
+    __table_args__ = (
+        Index("idx_members_club_sync_version", "club_id", "sync_version"),
+        Index("idx_members_club_last_name", "club_id", "last_name", "id"),
+    )
 
     club_id = Column(String(36), ForeignKey("clubs.id"), nullable=False)
     first_name = Column(String(100), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, Boolean, Text, Enum
+from sqlalchemy import Column, Index, String, ForeignKey, Boolean, Text, Enum
 from sqlalchemy.orm import relationship
 from app.models.base import BaseModel
 import enum
@@ -10,6 +10,10 @@ class MessagePriority(str, enum.Enum):
 
 class Message(BaseModel):
     __tablename__ = "messages"
+    __table_args__ = (
+        Index("idx_messages_club_sync_version", "club_id", "sync_version"),
+        Index("idx_messages_club_created_at", "club_id", "created_at", "id"),
+    )
 
     club_id = Column(String(36), ForeignKey("clubs.id"), nullable=False)
     title = Column(String(200), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, Date, Numeric, Enum, Text
+from sqlalchemy import Column, Index, String, ForeignKey, Date, Numeric, Enum, Text
 from sqlalchemy.orm import relationship
 from app.models.base import BaseModel
 import enum
@@ -23,6 +23,12 @@ class PaymentType(str, enum.Enum):
 
 class Payment(BaseModel):
     __tablename__ = "payments"
+    __table_args__ = (
+        Index("idx_payments_club_sync_version", "club_id", "sync_version"),
+        Index("idx_payments_club_payment_date", "club_id", "payment_date", "id"),
+        Index("idx_payments_club_month_year", "club_id", "month_year"),
+        Index("idx_payments_member_payment_date", "member_id", "payment_date"),
+    )
 
     club_id = Column(String(36), ForeignKey("clubs.id"), nullable=False)
     member_id = Column(String(36), ForeignKey("members.id"), nullable=False)
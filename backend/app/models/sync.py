@@ -0,0 +1,194 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Dict
+from sqlalchemy import Column, String, ForeignKey, Integer, DateTime, Index, event, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.cache import get_cache
+from app.core.config import settings
+from app.core.notifications import broker
+from app.db.base import Base, replica_engine
+from app.models.attendance import Attendance
+from app.models.base import BaseModel
+from app.models.club import Club
+from app.models.equipment import Equipment, EquipmentPurchase
+from app.models.license import License
+from app.models.member import Member
+from app.models.message import Message
+from app.models.payment import Payment
+from app.models.transaction import Transaction
+
+# Entities devices pull and push. Only these take sequence numbers and
+# tombstones; users and clubs change without a sync notice.
+MODEL_MAP = {
+    "members": Member,
+    "payments": Payment,
+    "licenses": License,
+    "equipment": Equipment,
+    "equipment_purchases": EquipmentPurchase,
+    "attendances": Attendance,
+    "transactions": Transaction,
+    "messages": Message,
+}
+SYNCED_MODELS = tuple(MODEL_MAP.values())
+
+class SyncSequence(Base):
+    __tablename__ = "sync_sequences"
+
+    club_id = Column(String(36), ForeignKey("clubs.id", ondelete="CASCADE"), primary_key=True)
+    last_seq = Column(Integer, default=0, nullable=False)
+    purged_seq = Column(Integer, default=0, nullable=False)
+
+class SyncTombstone(BaseModel):
+    __tablename__ = "sync_tombstones"
+    __table_args__ = (
+        Index("idx_sync_tombstones_club_sync_version", "club_id", "sync_version"),
+    )
+
+    club_id = Column(String(36), ForeignKey("clubs.id", ondelete="CASCADE"), nullable=False)
+    entity = Column(String(50), nullable=False)
+    record_id = Column(String(36), nullable=False)
+
+class SyncDevice(Base):
+    __tablename__ = "sync_devices"
+
+    club_id = Column(String(36), ForeignKey("clubs.id", ondelete="CASCADE"), primary_key=True)
+    device_id = Column(String(100), primary_key=True)
+    last_seq = Column(Integer, default=0, nullable=False)
+    last_seen_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+def allocate_change_seq(db: Session, club_id: str, count: int = 1) -> int:
+    # The upsert row-locks the club's counter until commit, so writers of the
+    # same club commit in sequence order and readers never observe a gap.
+    stmt = insert(SyncSequence.__table__).values(club_id=club_id, last_seq=count)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[SyncSequence.club_id],
+        set_={"last_seq": SyncSequence.__table__.c.last_seq + count}
+    ).returning(SyncSequence.__table__.c.last_seq)
+
+    last_seq = db.connection().execute(stmt).scalar_one()
+    if count:
+        db.info.setdefault("changed_clubs", {})[club_id] = last_seq
+    return last_seq - count + 1
+
+def lock_change_seq(db: Session, club_id: str):
+    # Writers that compare versions before writing take the club lock first,
+    # in the same order as flushes do, so they cannot deadlock with them.
+    allocate_change_seq(db, club_id, 0)
+
+def get_change_seq(db: Session, club_id: str) -> int:
+    last_seq = db.query(SyncSequence.last_seq).filter(SyncSequence.club_id == club_id).scalar()
+    return last_seq or 0
+
+def written_seq_key(club_id: str) -> str:
+    return f"sync:written:{club_id}"
+
+def get_purged_seq(db: Session, club_id: str) -> int:
+    purged_seq = db.query(SyncSequence.purged_seq).filter(SyncSequence.club_id == club_id).scalar()
+    return purged_seq or 0
+
+def register_device(db: Session, club_id: str, device_id: str, acknowledged_seq: int):
+    stmt = insert(SyncDevice.__table__).values(club_id=club_id, device_id=device_id, last_seq=acknowledged_seq)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[SyncDevice.club_id, SyncDevice.device_id],
+        set_={"last_seq": acknowledged_seq, "last_seen_at": func.now()}
+    )
+    db.execute(stmt)
+
+def purge_tombstones(db: Session, club_id: str, retention_days: int):
+    cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+    db.query(SyncDevice).filter(
+        SyncDevice.club_id == club_id,
+        SyncDevice.last_seen_at < cutoff
+    ).delete(synchronize_session=False)
+
+    floor = db.query(func.min(SyncDevice.last_seq)).filter(SyncDevice.club_id == club_id).scalar()
+    if floor is None:
+        return
+
+    purged = db.query(func.max(SyncTombstone.sync_version)).filter(
+        SyncTombstone.club_id == club_id,
+        SyncTombstone.sync_version <= floor
+    ).scalar()
+    if purged is None:
+        return
+
+    db.query(SyncTombstone).filter(
+        SyncTombstone.club_id == club_id,
+        SyncTombstone.sync_version <= purged
+    ).delete(synchronize_session=False)
+    db.query(SyncSequence).filter(SyncSequence.club_id == club_id).update(
+        {"purged_seq": func.greatest(SyncSequence.purged_seq, purged)},
+        synchronize_session=False
+    )
+
+@event.listens_for(Session, "before_flush")
+def stamp_change_seq(session, flush_context, instances):
+    deleted_clubs = {obj.id for obj in session.deleted if isinstance(obj, Club)}
+
+    for obj in list(session.deleted):
+        if not isinstance(obj, SYNCED_MODELS):
+            continue
+        if not getattr(obj, "club_id", None) or obj.club_id in deleted_clubs:
+            continue
+        session.add(SyncTombstone(
+            club_id=obj.club_id,
+            entity=obj.__tablename__,
+            record_id=obj.id,
+            device_id=obj.device_id
+        ))
+
+    changed = {}
+
+    for obj in list(session.new) + list(session.dirty):
+        if not isinstance(obj, SYNCED_MODELS) or not obj.club_id:
+            continue
+        if obj.club_id in deleted_clubs:
+            continue
+        if obj not in session.new and not session.is_modified(obj, include_collections=False):
+            continue
+        changed.setdefault(obj.club_id, []).append(obj)
+
+    for club_id, objs in changed.items():
+        seq = allocate_change_seq(session, club_id, len(objs))
+        for obj in objs:
+            obj.sync_version = seq
+            seq += 1
+
+publisher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sync-publish")
+
+@event.listens_for(Session, "after_commit")
+def notify_changes(session):
+    changes = session.info.pop("changed_clubs", None)
+    if not changes:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        publish_changes(changes)
+        return
+    # Async sessions commit on the event loop, where the Redis round trips
+    # would stall every other request. A single thread keeps them in commit
+    # order.
+    session.info["published"] = loop.run_in_executor(publisher, publish_changes, changes)
+
+def publish_changes(changes: Dict[str, int]):
+    for club_id, seq in changes.items():
+        if replica_engine is not None:
+            get_cache().set(written_seq_key(club_id), str(seq), settings.DATABASE_REPLICA_MAX_LAG_SECONDS)
+        broker.publish(club_id, seq)
+
+async def changes_published(db: AsyncSession):
+    # Awaited before answering a write, so the client's next read already
+    # sees the written seq and is not routed to a lagging replica.
+    published = db.sync_session.info.pop("published", None)
+    if published is not None:
+        await published
+
+@event.listens_for(Session, "after_soft_rollback")
+def discard_changes(session, previous_transaction):
+    # A rolled back savepoint leaves the outer transaction's changes pending.
+    if not previous_transaction.nested:
+        session.info.pop("changed_clubs", None)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, Date, Numeric, Enum, Text
+from sqlalchemy import Column, Index, String, ForeignKey, Date, Numeric, Enum, Text
 from sqlalchemy.orm import relationship
 from app.models.base import BaseModel
 import enum
@@ -22,6 +22,10 @@ class TransactionCategory(str, enum.Enum):
 
 class Transaction(BaseModel):
     __tablename__ = "transactions"
+    __table_args__ = (
+        Index("idx_transactions_club_sync_version", "club_id", "sync_version"),
+        Index("idx_transactions_club_transaction_date", "club_id", "transaction_date", "id"),
+    )
 
     club_id = Column(String(36), ForeignKey("clubs.id"), nullable=False)
     transaction_type = Column(Enum(TransactionType), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, Enum, ForeignKey
+from sqlalchemy import Column, String, Boolean, Enum, ForeignKey, Integer
 from sqlalchemy.orm import relationship
 from app.models.base import BaseModel
 import enum
@@ -18,5 +18,7 @@ class User(BaseModel):
     phone = Column(String(20), nullable=True)
     role = Column(Enum(UserRole), default=UserRole.SECRETARY, nullable=False)
     is_active = Column(Boolean, default=True, nullable=False)
+    # Tokens issued (iat, whole seconds) before this moment are rejected.
+    tokens_valid_after = Column(Integer, nullable=True)
 
     club = relationship("Club", back_populates="users")
@@ -0,0 +1,47 @@
+from datetime import date
+from typing import List, Optional
+from pydantic import BaseModel, Field
+from app.models.member import MemberCategory
+from app.schemas.base import RecordResponse
+
+class AttendanceResponse(RecordResponse):
+    member_id: str
+    attendance_date: date
+    is_present: bool
+    recorded_by: Optional[str] = None
+    notes: Optional[str] = None
+
+class AttendanceSessionEntry(BaseModel):
+    member_id: str
+    is_present: bool = True
+    notes: Optional[str] = None
+
+class AttendanceSessionRequest(BaseModel):
+    attendance_date: date
+    entries: List[AttendanceSessionEntry] = Field(min_length=1, max_length=500)
+
+class AttendanceSessionSummary(BaseModel):
+    attendance_date: date
+    present: int
+    absent: int
+    created: int
+    updated: int
+    unchanged: int
+
+class AttendanceRate(BaseModel):
+    sessions: int
+    present: int
+    rate: Optional[float] = None
+
+class MemberAttendanceRate(AttendanceRate):
+    member_id: str
+    first_name: str
+    last_name: str
+    category: MemberCategory
+
+class CategoryAttendanceRate(AttendanceRate):
+    category: MemberCategory
+    month: date
+
+class MonthlyAttendanceRate(AttendanceRate):
+    month: date
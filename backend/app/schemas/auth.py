@@ -1,3 +1,4 @@
+from typing import Optional
 from pydantic import BaseModel, EmailStr
 
 class Token(BaseModel):
@@ -9,6 +10,21 @@ class TokenData(BaseModel):
     club_id: str
     role: str
 
+class Principal(BaseModel):
+    id: str
+    club_id: str
+    role: str
+    is_active: bool
+    tokens_valid_after: Optional[int] = None
+
+class UserResponse(BaseModel):
+    id: str
+    email: str
+    first_name: str
+    last_name: str
+    role: str
+    club_id: str
+
 class LoginRequest(BaseModel):
     email: EmailStr
     password: str
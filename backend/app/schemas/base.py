@@ -0,0 +1,16 @@
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel, ConfigDict
+
+class RecordResponse(BaseModel):
+    # Columns of app.models.base.BaseModel. Validates from ORM instances as
+    # well as from row mappings; Numeric columns are declared as float to
+    # keep the JSON numbers clients already receive.
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    club_id: str
+    created_at: datetime
+    updated_at: datetime
+    device_id: Optional[str] = None
+    sync_version: int
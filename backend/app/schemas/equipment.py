@@ -0,0 +1,21 @@
+from datetime import date
+from typing import Optional
+from app.models.equipment import EquipmentType
+from app.schemas.base import RecordResponse
+
+class EquipmentResponse(RecordResponse):
+    name: str
+    equipment_type: EquipmentType
+    size: Optional[str] = None
+    price: float
+    stock_quantity: int
+    description: Optional[str] = None
+
+class EquipmentPurchaseResponse(RecordResponse):
+    member_id: str
+    equipment_id: str
+    quantity: int
+    unit_price: float
+    total_amount: float
+    purchase_date: date
+    notes: Optional[str] = None
@@ -0,0 +1,13 @@
+from datetime import date
+from typing import Optional
+from app.models.license import LicenseStatus
+from app.schemas.base import RecordResponse
+
+class LicenseResponse(RecordResponse):
+    member_id: str
+    license_number: Optional[str] = None
+    season: str
+    issue_date: date
+    expiry_date: date
+    amount: float
+    status: LicenseStatus
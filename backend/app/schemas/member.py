@@ -0,0 +1,48 @@
+from datetime import date
+from typing import Optional
+from pydantic import BaseModel
+from app.models.member import Discipline, Gender, MemberCategory, MemberStatus
+from app.schemas.base import RecordResponse
+
+class MemberResponse(RecordResponse):
+    first_name: str
+    last_name: str
+    date_of_birth: date
+    gender: Gender
+    phone: Optional[str] = None
+    email: Optional[str] = None
+    address: Optional[str] = None
+    photo_url: Optional[str] = None
+
+    parent_name: Optional[str] = None
+    parent_phone: Optional[str] = None
+    parent_email: Optional[str] = None
+
+    category: MemberCategory
+    discipline: Discipline
+    belt_level: str
+    status: MemberStatus
+
+    medical_certificate_url: Optional[str] = None
+    medical_certificate_expiry: Optional[date] = None
+
+    monthly_fee: float
+    registration_fee: Optional[float] = None
+    has_discount: Optional[bool] = None
+    discount_percentage: Optional[float] = None
+
+    registration_date: date
+    last_renewal_date: Optional[date] = None
+
+class MemberSearchResult(BaseModel):
+    id: str
+    first_name: str
+    last_name: str
+    phone: Optional[str] = None
+    email: Optional[str] = None
+    parent_name: Optional[str] = None
+    parent_phone: Optional[str] = None
+    category: MemberCategory
+    status: MemberStatus
+    belt_level: str
+    score: float
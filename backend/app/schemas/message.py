@@ -0,0 +1,10 @@
+from typing import Optional
+from app.models.message import MessagePriority
+from app.schemas.base import RecordResponse
+
+class MessageResponse(RecordResponse):
+    title: str
+    content: str
+    priority: MessagePriority
+    is_published: bool
+    sent_by: Optional[str] = None
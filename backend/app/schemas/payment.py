@@ -0,0 +1,16 @@
+from datetime import date
+from typing import Optional
+from app.models.payment import PaymentMethod, PaymentStatus, PaymentType
+from app.schemas.base import RecordResponse
+
+class PaymentResponse(RecordResponse):
+    member_id: str
+    amount: float
+    payment_type: PaymentType
+    payment_method: PaymentMethod
+    payment_date: date
+    status: PaymentStatus
+    month_year: Optional[str] = None
+    notes: Optional[str] = None
+    receipt_number: Optional[str] = None
+    recorded_by: Optional[str] = None
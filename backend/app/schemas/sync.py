@@ -0,0 +1,29 @@
+from typing import Any, Dict, List, Literal, Optional
+from pydantic import BaseModel, Field, model_validator
+
+class SyncPullRequest(BaseModel):
+    cursors: Dict[str, Optional[int]] = {}
+    page_size: Optional[int] = Field(default=None, ge=1, le=5000)
+    layout: Literal["records", "columnar"] = "records"
+    profile: Optional[str] = None
+    entities: Optional[List[str]] = None
+    columns: Dict[str, List[str]] = {}
+
+    @model_validator(mode="before")
+    @classmethod
+    def reset_legacy_cursors(cls, values):
+        if not isinstance(values, dict):
+            return values
+        if not values.keys() & {"cursors", "page_size", "layout", "profile", "entities", "columns"}:
+            values = {"cursors": values}
+        else:
+            values = dict(values)
+
+        cursors = values.get("cursors") or {}
+        values["cursors"] = {
+            entity: cursor if isinstance(cursor, int) else None
+            for entity, cursor in cursors.items()
+        }
+        return values
+
+SyncPushChanges = Dict[str, List[Dict[str, Any]]]
@@ -0,0 +1,13 @@
+from datetime import date
+from typing import Optional
+from app.models.transaction import TransactionCategory, TransactionType
+from app.schemas.base import RecordResponse
+
+class TransactionResponse(RecordResponse):
+    transaction_type: TransactionType
+    category: TransactionCategory
+    amount: float
+    transaction_date: date
+    description: Optional[str] = None
+    reference: Optional[str] = None
+    recorded_by: Optional[str] = None
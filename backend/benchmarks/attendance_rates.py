@@ -0,0 +1,137 @@
+"""
+Taux de présence : historique brut contre agrégats mensuels
+
+Remplit la base configurée d'un club de N adhérents avec plusieurs saisons
+de présences (les agrégats mensuels sont tenus à jour par les triggers de
+la révision 0005 pendant l'insertion), puis compare p50 / p99 du calcul du
+taux de présence des trois derniers mois par adhérent et par catégorie :
+agrégation de la table attendances, contre lecture des agrégats comme le
+font les routes /attendances/rates. Mesure aussi le temps d'insertion par
+séance, triggers compris.
+
+Usage: python -m benchmarks.attendance_rates --members 300 --seasons 3 --repeat 30
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from datetime import date, timedelta
+from sqlalchemy import Float, cast, func, insert, select
+from app.api.routes.attendances import get_category_rates, get_member_rates, window_start
+from app.db.base import AsyncSessionLocal, SessionLocal, engine
+from app.db.migrate import run_migrations
+from app.models import Attendance, Club, Member
+from app.models.attendance import AttendanceCategoryMonth, AttendanceMemberMonth
+from app.models.sync import SyncSequence
+from app.schemas.auth import Principal
+
+CATEGORIES = ["poussin", "benjamin", "minime", "cadet", "junior", "senior"]
+
+def seed(members_count: int, seasons: int):
+    db = SessionLocal()
+    club = Club(name="Benchmark taux de présence")
+    db.add(club)
+    db.flush()
+    ids = [str(uuid.uuid4()) for _ in range(members_count)]
+    db.execute(insert(Member), [
+        dict(
+            id=member_id, club_id=club.id, first_name=f"Judoka {i}", last_name="Benchmark",
+            date_of_birth=date(2010, 1, 1), gender="male", category=CATEGORIES[i % len(CATEGORIES)],
+            monthly_fee=15000, registration_date=date(2023, 9, 1), sync_version=i + 1,
+        )
+        for i, member_id in enumerate(ids)
+    ])
+    # Three sessions a week, back from today.
+    days = [date.today() - timedelta(days=offset) for offset in range(0, 365 * seasons, 7)]
+    days = sorted(day - timedelta(days=shift) for day in days for shift in (0, 2, 4))
+    seq = members_count
+    started = time.perf_counter()
+    for day in days:
+        db.execute(insert(Attendance), [
+            dict(
+                id=str(uuid.uuid4()), club_id=club.id, member_id=member_id, attendance_date=day,
+                is_present=(i + day.toordinal()) % 4 != 0, sync_version=seq + i + 1,
+            )
+            for i, member_id in enumerate(ids)
+        ])
+        seq += members_count
+    elapsed = time.perf_counter() - started
+    db.commit()
+    with engine.connect() as connection:
+        connection.execution_options(isolation_level="AUTOCOMMIT").exec_driver_sql("ANALYZE")
+    return db, club, len(days), elapsed
+
+def cleanup(db, club):
+    # Attendances first: their triggers write to the rollups.
+    for model_class in (Attendance, AttendanceCategoryMonth, AttendanceMemberMonth, Member, SyncSequence):
+        db.query(model_class).filter(model_class.club_id == club.id).delete()
+    db.delete(club)
+    db.commit()
+    db.close()
+
+def raw_member_rates(club_id: str, since: date):
+    present = func.count().filter(Attendance.is_present)
+    return (
+        select(Attendance.member_id, func.count(), present, cast(present, Float) / func.count())
+        .where(Attendance.club_id == club_id, Attendance.attendance_date >= since)
+        .group_by(Attendance.member_id)
+    )
+
+def raw_category_rates(club_id: str, since: date):
+    month = func.date_trunc("month", Attendance.attendance_date)
+    present = func.count().filter(Attendance.is_present)
+    return (
+        select(Member.category, month, func.count(), present, cast(present, Float) / func.count())
+        .join(Member, Member.id == Attendance.member_id)
+        .where(Attendance.club_id == club_id, Attendance.attendance_date >= since)
+        .group_by(Member.category, month)
+    )
+
+async def fetch_all(db, query):
+    return (await db.execute(query)).all()
+
+async def measure(run, repeat: int):
+    latencies = []
+    async with AsyncSessionLocal() as db:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            rows = await run(db)
+            latencies.append(time.perf_counter() - started)
+    latencies.sort()
+    return len(rows), statistics.median(latencies), latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+
+async def compare(club_id: str, repeat: int):
+    principal = Principal(id=str(uuid.uuid4()), club_id=club_id, role="ADMIN", is_active=True)
+    since = window_start(3)
+
+    scenarios = [
+        ("par adhérent", "historique", lambda db: fetch_all(db, raw_member_rates(club_id, since))),
+        ("par adhérent", "agrégats", lambda db: get_member_rates(months=3, category=None, current_user=principal, db=db)),
+        ("par catégorie", "historique", lambda db: fetch_all(db, raw_category_rates(club_id, since))),
+        ("par catégorie", "agrégats", lambda db: get_category_rates(months=3, current_user=principal, db=db)),
+    ]
+    for label, path, run in scenarios:
+        count, p50, p99 = await measure(run, repeat)
+        print(f"{label:<14} {path:<11} {count:4} lignes  p50 {p50 * 1000:7.2f} ms  p99 {p99 * 1000:7.2f} ms")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--members", type=int, default=300)
+    parser.add_argument("--seasons", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    run_migrations()
+    db, club, sessions, elapsed = seed(args.members, args.seasons)
+    try:
+        print(
+            f"{args.members} adhérents, {sessions} séances, {args.members * sessions} présences, "
+            f"insertion {elapsed / sessions * 1000:.1f} ms par séance, agrégats compris"
+        )
+        asyncio.run(compare(club.id, args.repeat))
+    finally:
+        cleanup(db, club)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Appel d'une séance : requête par judoka contre appel groupé
+
+Remplit la base configurée d'un club de N adhérents, puis enregistre
+plusieurs séances de deux façons à travers l'application (TestClient,
+sans réseau) : une requête POST /attendances/ par adhérent, comme le fait
+aujourd'hui l'application du coach, puis une seule requête
+POST /attendances/session. Sur le terrain, chaque requête du premier
+chemin coûte en plus un aller-retour réseau.
+
+Usage: python -m benchmarks.attendance_session --members 80 --sessions 5
+"""
+import argparse
+import statistics
+import time
+import uuid
+from datetime import date, timedelta
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+from app.core.security import create_access_token
+from app.db.base import SessionLocal
+from app.db.migrate import run_migrations
+from app.main import app
+from app.models import Attendance, Club, Member, User
+from app.models.sync import SyncSequence
+
+def seed(members_count: int):
+    db = SessionLocal()
+    club = Club(name="Benchmark appel")
+    db.add(club)
+    db.flush()
+    user = User(
+        club_id=club.id, email=f"appel-{club.id}@benchmark.invalid", hashed_password="-",
+        first_name="Coach", last_name="Benchmark", role="ADMIN",
+    )
+    db.add(user)
+    ids = [str(uuid.uuid4()) for _ in range(members_count)]
+    db.execute(insert(Member), [
+        dict(
+            id=member_id, club_id=club.id, first_name=f"Judoka {i}", last_name="Benchmark",
+            date_of_birth=date(2010, 1, 1), gender="male", category="minime", monthly_fee=15000,
+            registration_date=date(2023, 9, 1), sync_version=i + 1,
+        )
+        for i, member_id in enumerate(ids)
+    ])
+    db.commit()
+    return db, club, user, ids
+
+def cleanup(db, club, user):
+    for model_class in (Attendance, Member, SyncSequence):
+        db.query(model_class).filter(model_class.club_id == club.id).delete()
+    db.delete(user)
+    db.delete(club)
+    db.commit()
+    db.close()
+
+def one_by_one(client, headers, member_ids, day: date):
+    for i, member_id in enumerate(member_ids):
+        response = client.post("/api/v1/attendances/", headers=headers, json={
+            "member_id": member_id, "attendance_date": day.isoformat(), "is_present": i % 5 != 0,
+        })
+        response.raise_for_status()
+
+def grouped(client, headers, member_ids, day: date):
+    response = client.post("/api/v1/attendances/session", headers=headers, json={
+        "attendance_date": day.isoformat(),
+        "entries": [{"member_id": member_id, "is_present": i % 5 != 0} for i, member_id in enumerate(member_ids)],
+    })
+    response.raise_for_status()
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--members", type=int, default=80)
+    parser.add_argument("--sessions", type=int, default=5)
+    args = parser.parse_args()
+
+    run_migrations()
+    db, club, user, member_ids = seed(args.members)
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': user.id, 'club_id': club.id, 'role': 'ADMIN'})}"}
+    day = date(2024, 1, 1)
+    try:
+        with TestClient(app) as client:
+            for label, record in (("une requête par adhérent", one_by_one), ("appel groupé", grouped)):
+                timings = []
+                for _ in range(args.sessions):
+                    started = time.perf_counter()
+                    record(client, headers, member_ids, day)
+                    timings.append(time.perf_counter() - started)
+                    day += timedelta(days=1)
+                print(f"{label:<26} {args.members} adhérents  médiane {statistics.median(timings) * 1000:8.1f} ms par séance")
+    finally:
+        cleanup(db, club, user)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Temps de démarrage à froid d'un worker de l'API
+
+Mesure, chacune dans un interpréteur neuf : l'import de app.main, le
+create_all que chaque worker exécutait auparavant au démarrage (contre la
+base configurée, déjà migrée), et le délai entre le lancement d'uvicorn et
+la première réponse de /health.
+
+Usage: python -m benchmarks.cold_start --runs 5
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+import httpx
+
+IMPORT_APP = "import time; t = time.perf_counter(); import app.main; print(time.perf_counter() - t)"
+CREATE_ALL = (
+    "import time; from app.db.base import Base, engine; import app.models; "
+    "t = time.perf_counter(); Base.metadata.create_all(bind=engine); print(time.perf_counter() - t)"
+)
+
+def timed_script(code: str) -> float:
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return float(output.stdout.strip().splitlines()[-1])
+
+def time_to_first_response(port: int) -> float:
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        stderr=subprocess.DEVNULL
+    )
+    try:
+        while True:
+            if server.poll() is not None:
+                raise SystemExit("Le serveur uvicorn s'est arrêté au démarrage")
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1).status_code == 200:
+                    return time.perf_counter() - started
+            except httpx.TransportError:
+                time.sleep(0.02)
+    finally:
+        server.terminate()
+        server.wait()
+
+def report(label: str, samples):
+    print(f"{label:<28} médiane {statistics.median(samples) * 1000:7.0f} ms  min {min(samples) * 1000:7.0f} ms")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8090)
+    args = parser.parse_args()
+
+    report("import app.main", [timed_script(IMPORT_APP) for _ in range(args.runs)])
+    report("create_all (supprimé)", [timed_script(CREATE_ALL) for _ in range(args.runs)])
+    report("uvicorn jusqu'à /health", [time_to_first_response(args.port) for _ in range(args.runs)])
+
+if __name__ == "__main__":
+    main()
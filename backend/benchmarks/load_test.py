@@ -0,0 +1,129 @@
+"""
+Charge sur une route de liste : pile synchrone contre pile asynchrone
+
+Sert la même liste d'adhérents par une route def + Session (psycopg2,
+threadpool de Starlette) et par une route async def + AsyncSession
+(asyncpg), dans un serveur uvicorn à un worker, puis mesure le débit et
+les latences p50 / p99 sous N clients simultanés. Le client tourne sur la
+même machine : comparer les deux piles entre elles, pas aux chiffres de
+production.
+
+Usage: python -m benchmarks.load_test --members 200 --concurrency 64 --requests 3000
+"""
+import argparse
+import asyncio
+import statistics
+import subprocess
+import sys
+import time
+from datetime import date
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.db.base import Base, SessionLocal, engine, get_async_db, get_db
+from app.models import Club, Member
+
+app = FastAPI()
+
+@app.get("/sync/members/{club_id}")
+def sync_members(club_id: str, db: Session = Depends(get_db)):
+    return db.query(Member).filter(Member.club_id == club_id).all()
+
+@app.get("/async/members/{club_id}")
+async def async_members(club_id: str, db: AsyncSession = Depends(get_async_db)):
+    result = await db.execute(select(Member).where(Member.club_id == club_id))
+    return result.scalars().all()
+
+async def drive(url: str, requests: int, concurrency: int, method: str = "GET", headers=None, body=None):
+    latencies = []
+    failures = 0
+    remaining = iter(range(requests))
+
+    async def client(http):
+        nonlocal failures
+        for _ in remaining:
+            started = time.perf_counter()
+            response = await http.request(method, url, headers=headers, json=body)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                failures += 1
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=120) as http:
+        started = time.perf_counter()
+        await asyncio.gather(*(client(http) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return latencies, failures, elapsed
+
+def report(label: str, latencies, failures: int, elapsed: float):
+    latencies = sorted(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(
+        f"{label:<10} {len(latencies) / elapsed:8.0f} req/s  "
+        f"p50 {statistics.median(latencies) * 1000:7.1f} ms  p99 {p99 * 1000:7.1f} ms  "
+        f"échecs {failures}"
+    )
+
+def wait_until_ready(base_url: str, server: subprocess.Popen):
+    for _ in range(100):
+        if server.poll() is not None:
+            raise SystemExit("Le serveur uvicorn s'est arrêté au démarrage")
+        try:
+            httpx.get(f"{base_url}/docs", timeout=1)
+            return
+        except httpx.TransportError:
+            time.sleep(0.1)
+    raise SystemExit("Le serveur uvicorn ne répond pas")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--members", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--port", type=int, default=8089)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    club = Club(name="Benchmark charge")
+    db.add(club)
+    db.flush()
+    db.add_all([
+        Member(
+            club_id=club.id,
+            first_name=f"Judoka {i}",
+            last_name="Benchmark",
+            date_of_birth=date(2010, 1, 1),
+            gender="male",
+            category="minime",
+            monthly_fee=15000,
+            registration_date=date(2023, 9, 1),
+        )
+        for i in range(args.members)
+    ])
+    db.commit()
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    server = subprocess.Popen([
+        sys.executable, "-m", "uvicorn", "benchmarks.load_test:app",
+        "--port", str(args.port), "--log-level", "warning", "--no-access-log"
+    ])
+    try:
+        wait_until_ready(base_url, server)
+        print(f"{args.requests} requêtes, {args.concurrency} clients, {args.members} adhérents par réponse")
+        for label in ("sync", "async"):
+            url = f"{base_url}/{label}/members/{club.id}"
+            asyncio.run(drive(url, args.concurrency * 2, args.concurrency))
+            report(label, *asyncio.run(drive(url, args.requests, args.concurrency)))
+    finally:
+        server.terminate()
+        server.wait()
+        db.query(Member).filter(Member.club_id == club.id).delete()
+        db.delete(club)
+        db.commit()
+        db.close()
+
+if __name__ == "__main__":
+    main()
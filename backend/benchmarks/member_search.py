@@ -0,0 +1,100 @@
+"""
+Latence de la recherche d'adhérents
+
+Remplit la base configurée (migrée, avec unaccent et pg_trgm) de clubs
+dont les adhérents portent des noms français accentués, puis mesure
+p50 / p99 de la requête de /members/search pour des saisies typiques
+de l'accueil : préfixe court, nom sans accent, faute de frappe, numéro
+de téléphone. Affiche aussi les index retenus par le planificateur.
+
+Usage: python -m benchmarks.member_search --clubs 10 --members 5000 --repeat 50
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+import uuid
+from datetime import date
+from sqlalchemy import insert
+from app.core.search import member_search_query
+from app.db.base import AsyncSessionLocal, SessionLocal, engine
+from app.db.migrate import run_migrations
+from app.models import Club, Member
+from app.models.sync import SyncSequence
+from benchmarks.query_plans import explain, plan_nodes
+
+FIRST_NAMES = ["Amélie", "Éric", "Hélène", "François", "Zoé", "Jérôme", "Noémie", "Cédric", "Anaïs", "Gaëlle", "Loïc", "Maëva"]
+LAST_NAMES = ["Dupont", "Lefèvre", "Mercier", "Béranger", "Gauthier", "Fabré", "Mallé", "Ndiaye", "Diop", "Faÿ", "Thérond", "Giraud"]
+QUERIES = ["du", "lefevre", "helene ber", "gautier", "77 12", "noemie"]
+
+def seed(clubs: int, members_count: int):
+    random.seed(0)
+    db = SessionLocal()
+    club_ids = []
+    for i in range(clubs):
+        club = Club(name=f"Benchmark recherche {i}")
+        db.add(club)
+        db.flush()
+        club_ids.append(club.id)
+        db.execute(insert(Member), [
+            dict(
+                id=str(uuid.uuid4()), club_id=club.id, sync_version=n + 1,
+                first_name=random.choice(FIRST_NAMES), last_name=f"{random.choice(LAST_NAMES)}{n % 97 or ''}",
+                parent_name=f"{random.choice(FIRST_NAMES)} {random.choice(LAST_NAMES)}",
+                phone=f"+221 77 {random.randrange(100, 999)} {random.randrange(10, 99)} {random.randrange(10, 99)}",
+                date_of_birth=date(2010, 1, 1), gender="male", category="minime", monthly_fee=15000,
+                registration_date=date(2023, 9, 1),
+            )
+            for n in range(members_count)
+        ])
+    db.commit()
+    with engine.connect() as connection:
+        connection.execution_options(isolation_level="AUTOCOMMIT").exec_driver_sql("ANALYZE members")
+    return db, club_ids
+
+def cleanup(db, club_ids):
+    for model_class in (Member, SyncSequence):
+        db.query(model_class).filter(model_class.club_id.in_(club_ids)).delete(synchronize_session=False)
+    db.query(Club).filter(Club.id.in_(club_ids)).delete(synchronize_session=False)
+    db.commit()
+    db.close()
+
+def plan_indexes(statement) -> str:
+    with engine.connect() as connection:
+        nodes = plan_nodes(explain(connection, statement))
+        return ", ".join(sorted({node["Index Name"] for node in nodes if "Index Name" in node})) or "parcours séquentiel"
+
+async def measure(club_id: str, term: str, repeat: int):
+    latencies = []
+    async with AsyncSessionLocal() as db:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = await db.execute(member_search_query(club_id, term).limit(20))
+            rows = result.all()
+            latencies.append(time.perf_counter() - started)
+    latencies.sort()
+    return len(rows), statistics.median(latencies), latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+
+async def run(club_id: str, repeat: int):
+    for term in QUERIES:
+        count, p50, p99 = await measure(club_id, term, repeat)
+        print(f"{term!r:<14} {count:3} résultats  p50 {p50 * 1000:6.2f} ms  p99 {p99 * 1000:6.2f} ms  {plan_indexes(member_search_query(club_id, term).limit(20))}")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clubs", type=int, default=10)
+    parser.add_argument("--members", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    run_migrations()
+    db, club_ids = seed(args.clubs, args.members)
+    try:
+        print(f"{args.clubs} clubs de {args.members} adhérents")
+        asyncio.run(run(club_ids[0], args.repeat))
+    finally:
+        cleanup(db, club_ids)
+
+if __name__ == "__main__":
+    main()
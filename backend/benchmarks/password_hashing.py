@@ -0,0 +1,70 @@
+"""
+Débit de connexion et admission contrôlée du hachage bcrypt
+
+Mesure d'abord le coût d'une vérification selon le nombre de rounds, puis
+simule une rafale de connexions simultanées (début d'entraînement) à
+travers le pool de hachage : connexions acceptées, refusées (429/503) et
+latence observée par les requêtes acceptées.
+
+Usage: python -m benchmarks.password_hashing --logins 24 --workers 2 --queue 8
+"""
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException
+from passlib.context import CryptContext
+from app.core.security import PasswordHashPool
+
+def measure_rounds(rounds_list, samples: int):
+    for rounds in rounds_list:
+        context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds)
+        hashed = context.hash("motdepasse")
+        started = time.perf_counter()
+        for _ in range(samples):
+            context.verify("motdepasse", hashed)
+        elapsed = (time.perf_counter() - started) / samples
+        print(f"rounds={rounds:<3} {elapsed * 1000:7.1f} ms / vérification  {1 / elapsed:6.1f} vérifications/s par cœur")
+
+def burst(logins: int, workers: int, queue_limit: int, rounds: int):
+    context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds)
+    hashed = context.hash("motdepasse")
+    pool = PasswordHashPool(workers, queue_limit)
+    latencies = []
+    rejected = []
+
+    def login():
+        started = time.perf_counter()
+        try:
+            pool.run(context.verify, "motdepasse", hashed)
+            latencies.append(time.perf_counter() - started)
+        except HTTPException as e:
+            rejected.append(e.status_code)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=logins) as clients:
+        for _ in range(logins):
+            clients.submit(login)
+    elapsed = time.perf_counter() - started
+
+    print(f"{logins} connexions simultanées, {workers} workers, file de {queue_limit}, rounds={rounds}")
+    print(f"  acceptées {len(latencies)}  refusées {len(rejected)} {sorted(set(rejected))}")
+    if latencies:
+        print(f"  latence p50 {statistics.median(latencies) * 1000:.0f} ms  max {max(latencies) * 1000:.0f} ms")
+        print(f"  débit {len(latencies) / elapsed:.1f} connexions/s")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=24)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--queue", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--samples", type=int, default=5)
+    args = parser.parse_args()
+
+    measure_rounds([10, 11, 12, 13], args.samples)
+    print()
+    burst(args.logins, args.workers, args.queue, args.rounds)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Coût par ligne des listes d'adhérents et de paiements
+
+Compare, sur les mêmes lignes, l'ancien chemin des routes de
+liste (instances ORM puis jsonable_encoder et json.dumps) et le nouveau
+(mappings de colonnes, validation et sérialisation par le modèle de
+réponse Pydantic comme le fait FastAPI, puis orjson). Les deux temps sont
+mesurés séparément : chargement depuis PostgreSQL par asyncpg, puis
+sérialisation en JSON.
+
+Usage: python -m benchmarks.serialization --members 2000 --payments 10 --repeat 5
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from datetime import date, timedelta
+from typing import List
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import insert, select
+from app.db.base import AsyncSessionLocal, SessionLocal
+from app.db.migrate import run_migrations
+from app.models import Club, Member, Payment
+from app.models.sync import SyncSequence
+from app.schemas.member import MemberResponse
+from app.schemas.payment import PaymentResponse
+
+def seed(members_count: int, payments: int):
+    db = SessionLocal()
+    club = Club(name="Benchmark sérialisation")
+    db.add(club)
+    db.flush()
+    ids = [str(uuid.uuid4()) for _ in range(members_count)]
+    db.execute(insert(Member), [
+        dict(
+            id=member_id, club_id=club.id, first_name=f"Judoka {i}", last_name="Benchmark",
+            date_of_birth=date(2010, 1, 1), gender="male", category="minime", monthly_fee=15000,
+            registration_date=date(2023, 9, 1), phone="+221 77 000 00 00", sync_version=i + 1,
+        )
+        for i, member_id in enumerate(ids)
+    ])
+    db.execute(insert(Payment), [
+        dict(
+            id=str(uuid.uuid4()), club_id=club.id, member_id=member_id, amount=15000, payment_type="monthly_fee",
+            payment_date=date(2024, 1, 5) + timedelta(days=30 * month), month_year=f"2024-{month + 1:02d}",
+            sync_version=members_count + i * payments + month + 1,
+        )
+        for i, member_id in enumerate(ids)
+        for month in range(payments)
+    ])
+    db.commit()
+    return db, club
+
+def cleanup(db, club):
+    for model_class in (Payment, Member, SyncSequence):
+        db.query(model_class).filter(model_class.club_id == club.id).delete()
+    db.delete(club)
+    db.commit()
+    db.close()
+
+def encode_orm(rows) -> bytes:
+    return JSONResponse(jsonable_encoder(rows)).body
+
+def encoder_for(schema):
+    adapter = TypeAdapter(List[schema])
+
+    def encode(rows) -> bytes:
+        return ORJSONResponse(adapter.dump_python(adapter.validate_python(rows), mode="json")).body
+
+    return encode
+
+async def measure(model_class, club_id: str, as_mappings: bool, encode, repeat: int):
+    load_times, encode_times = [], []
+    for _ in range(repeat):
+        async with AsyncSessionLocal() as db:
+            started = time.perf_counter()
+            if as_mappings:
+                result = await db.execute(select(*model_class.__table__.columns).where(model_class.club_id == club_id))
+                rows = result.mappings().all()
+            else:
+                result = await db.execute(select(model_class).where(model_class.club_id == club_id))
+                rows = result.scalars().all()
+            load_times.append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            body = encode(rows)
+            encode_times.append(time.perf_counter() - started)
+    return len(rows), statistics.median(load_times), statistics.median(encode_times), len(body)
+
+async def compare(club_id: str, repeat: int):
+    for label, model_class, schema in (("adhérents", Member, MemberResponse), ("paiements", Payment, PaymentResponse)):
+        for path, as_mappings, encode in (("ORM", False, encode_orm), ("schéma", True, encoder_for(schema))):
+            count, load, encode_time, size = await measure(model_class, club_id, as_mappings, encode, repeat)
+            print(
+                f"{label:<10} {path:<7} {count} lignes  "
+                f"chargement {load / count * 1e6:6.1f} µs/ligne  "
+                f"sérialisation {encode_time / count * 1e6:6.1f} µs/ligne  "
+                f"{size / 1024:6.0f} Ko"
+            )
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--members", type=int, default=2000)
+    parser.add_argument("--payments", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    run_migrations()
+    db, club = seed(args.members, args.payments)
+    try:
+        asyncio.run(compare(club.id, args.repeat))
+    finally:
+        cleanup(db, club)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Taille et coût CPU des encodages de /sync/pull sur un club réaliste
+
+Compare les combinaisons disposition (records / columnar), format
+(NDJSON / MessagePack) et compression (aucune / gzip / zstd) sur un jeu
+de données généré en mémoire, sans base de données. --profile applique
+la projection de colonnes d'un profil de synchronisation (full, coach).
+
+Usage: python -m benchmarks.sync_payload --members 300 --months 24 --profile coach
+"""
+import argparse
+import random
+import time
+import uuid
+from collections import namedtuple
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from app.api.routes.sync import MODEL_MAP, record_payloads, resolve_projection
+from app.core.encoding import NDJSON, MSGPACK, compress_stream, encoder_for, msgpack, zstandard
+from app.schemas.sync import SyncPullRequest
+from app.models import MemberCategory, Gender, Discipline, MemberStatus, PaymentType, PaymentMethod, PaymentStatus
+
+FIRST_NAMES = ["Aminata", "Moussa", "Fatou", "Ibrahim", "Awa", "Cheikh", "Mariam", "Ousmane", "Aïssatou", "Mamadou", "Léa", "Hugo", "Chloé", "Théo"]
+LAST_NAMES = ["Diallo", "Traoré", "Koné", "Ndiaye", "Camara", "Sow", "Diop", "Martin", "Bernard", "Dubois", "Kouassi", "Ouédraogo"]
+
+def make_record(model_class, seq, **values):
+    defaults = {c.name: None for c in model_class.__table__.columns}
+    now = datetime(2024, 6, 1, tzinfo=timezone.utc) + timedelta(seconds=seq)
+    defaults.update(id=str(uuid.uuid4()), created_at=now, updated_at=now, device_id=None, sync_version=seq)
+    defaults.update(values)
+    return SimpleNamespace(**defaults)
+
+def build_dataset(members_count: int, months: int, club_id: str):
+    rng = random.Random(42)
+    seq = 0
+    members = []
+    payments = []
+    attendances = []
+
+    for _ in range(members_count):
+        seq += 1
+        first_name = rng.choice(FIRST_NAMES)
+        last_name = rng.choice(LAST_NAMES)
+        members.append(make_record(
+            MODEL_MAP["members"], seq,
+            club_id=club_id,
+            first_name=first_name,
+            last_name=last_name,
+            date_of_birth=date(2005 + rng.randint(0, 12), rng.randint(1, 12), rng.randint(1, 28)),
+            gender=rng.choice(list(Gender)),
+            phone=f"+225 07 {rng.randint(10, 99)} {rng.randint(10, 99)} {rng.randint(10, 99)} {rng.randint(10, 99)}",
+            email=f"{first_name.lower()}.{last_name.lower()}@exemple.ci" if rng.random() < 0.4 else None,
+            address=f"{rng.randint(1, 200)} rue des Jardins, Cocody" if rng.random() < 0.6 else None,
+            parent_name=f"{rng.choice(FIRST_NAMES)} {last_name}",
+            parent_phone=f"+225 05 {rng.randint(10, 99)} {rng.randint(10, 99)} {rng.randint(10, 99)} {rng.randint(10, 99)}",
+            category=rng.choice(list(MemberCategory)),
+            discipline=Discipline.JUDO,
+            belt_level=rng.choice(["white", "yellow", "orange", "green", "blue", "brown", "black"]),
+            status=MemberStatus.ACTIVE,
+            monthly_fee=Decimal("15000.00"),
+            has_discount=False,
+            discount_percentage=Decimal("0.00"),
+            registration_date=date(2023, 9, rng.randint(1, 28)),
+        ))
+
+    start = date(2023, 1, 1)
+    for month in range(months):
+        month_start = date(start.year + (start.month + month - 1) // 12, (start.month + month - 1) % 12 + 1, 1)
+        for member in members:
+            seq += 1
+            payments.append(make_record(
+                MODEL_MAP["payments"], seq,
+                club_id=club_id,
+                member_id=member.id,
+                amount=Decimal("15000.00"),
+                payment_type=PaymentType.MONTHLY_FEE,
+                payment_method=rng.choice(list(PaymentMethod)),
+                payment_date=month_start + timedelta(days=rng.randint(0, 20)),
+                status=PaymentStatus.PAID,
+                month_year=month_start.strftime("%Y-%m"),
+                receipt_number=f"REC-{seq:06d}",
+            ))
+            for session in range(8):
+                seq += 1
+                attendances.append(make_record(
+                    MODEL_MAP["attendances"], seq,
+                    club_id=club_id,
+                    member_id=member.id,
+                    attendance_date=month_start + timedelta(days=session * 3),
+                    is_present=rng.random() < 0.8,
+                ))
+
+    return {"members": members, "payments": payments, "attendances": attendances}
+
+def project_dataset(dataset, profile: str):
+    # Reproduit les lignes renvoyées par select(*colonnes) pour le profil demandé.
+    projection = resolve_projection(SyncPullRequest(profile=profile))
+    projected = {}
+    for entity_name, records in dataset.items():
+        if entity_name not in projection:
+            continue
+        columns = projection[entity_name]
+        row_class = namedtuple("Row", [c.name for c in columns])
+        projected[entity_name] = (columns, [row_class(*(getattr(record, c.name) for c in columns)) for record in records])
+    return projected
+
+def encode_dataset(dataset, layout: str, media_type: str, content_encoding):
+    encode = encoder_for(media_type)
+
+    def chunks():
+        for entity_name, (columns, records) in dataset.items():
+            header, to_payloads = record_payloads(entity_name, columns, layout)
+            for start in range(0, len(records), 200):
+                chunk = records[start:start + 200]
+                payloads = to_payloads(chunk)
+                if header and start == 0:
+                    payloads.insert(0, header)
+                payloads.append({"type": "cursor", "entity": entity_name, "cursor": chunk[-1].sync_version})
+                yield b"".join(encode(payload) for payload in payloads)
+
+    started = time.process_time()
+    size = sum(len(part) for part in compress_stream(chunks(), content_encoding))
+    return size, time.process_time() - started
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--members", type=int, default=300)
+    parser.add_argument("--months", type=int, default=24)
+    parser.add_argument("--profile", default="full")
+    args = parser.parse_args()
+
+    dataset = project_dataset(build_dataset(args.members, args.months, str(uuid.uuid4())), args.profile)
+    rows = sum(len(records) for _, records in dataset.values())
+    print(f"{rows} lignes ({args.members} adhérents, {args.months} mois, profil {args.profile})")
+
+    media_types = [NDJSON] + ([MSGPACK] if msgpack else [])
+    encodings = [None, "gzip"] + (["zstd"] if zstandard else [])
+    baseline = None
+
+    for layout in ("records", "columnar"):
+        for media_type in media_types:
+            for content_encoding in encodings:
+                size, cpu = encode_dataset(dataset, layout, media_type, content_encoding)
+                baseline = baseline or size
+                label = f"{layout:<9} {media_type.split('/')[-1]:<10} {content_encoding or 'aucune':<7}"
+                print(f"{label} {size / 1024:10.0f} Ko  {100 * size / baseline:6.1f} %  {cpu * 1000:8.0f} ms CPU")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmark de /sync/push : ancien traitement ligne par ligne contre upsert groupé
+
+Chaque passe enregistre ses présences sur sa propre plage de dates : une
+présence est unique par adhérent et par jour, et une passe qui réécrirait
+les couples de la précédente ne mesurerait que des conflits. Le benchmark
+s'arrête si le traitement groupé renvoie une erreur ou un conflit.
+
+Usage: python -m benchmarks.sync_push --rows 2000
+"""
+import argparse
+import time
+import uuid
+from datetime import date, timedelta
+from app.api.routes.sync import MODEL_MAP, apply_changes
+from app.db.base import SessionLocal
+from app.db.migrate import run_migrations
+from app.models import Club, Member, Attendance, Payment
+from app.models.attendance import AttendanceCategoryMonth, AttendanceMemberMonth
+from app.models.sync import SyncSequence
+
+def legacy_push(db, changes, club_id):
+    for entity_name, records in changes.items():
+        model_class = MODEL_MAP[entity_name]
+        for record_data in records:
+            data = dict(record_data["data"], club_id=club_id)
+            existing = db.query(model_class).filter(model_class.id == record_data["id"]).first()
+            if existing:
+                for key, value in data.items():
+                    if key not in ["id", "created_at"]:
+                        setattr(existing, key, value)
+            else:
+                db.add(model_class(**data))
+            db.commit()
+
+def build_changes(member_ids, rows, start: date):
+    attendances = []
+    payments = []
+    for i in range(rows // 2):
+        member_id = member_ids[i % len(member_ids)]
+        attendance_id = str(uuid.uuid4())
+        payment_id = str(uuid.uuid4())
+        attendances.append({"id": attendance_id, "data": {
+            "id": attendance_id,
+            "member_id": member_id,
+            "attendance_date": (start + timedelta(days=i // len(member_ids))).isoformat(),
+            "is_present": i % 5 != 0,
+        }})
+        payments.append({"id": payment_id, "data": {
+            "id": payment_id,
+            "member_id": member_id,
+            "amount": 15000,
+            "payment_type": "monthly_fee",
+            "payment_method": "mobile_money",
+            "payment_date": start.isoformat(),
+            "month_year": start.strftime("%Y-%m"),
+        }})
+    return {"attendances": attendances, "payments": payments}
+
+def run(label, push, db, changes, club_id):
+    rows = sum(len(records) for records in changes.values())
+    started = time.perf_counter()
+    results = push(db, changes, club_id)
+    elapsed = time.perf_counter() - started
+    if results and (results["errors"] or results["conflicts"]):
+        raise SystemExit(
+            f"{label} : {len(results['errors'])} erreurs, {len(results['conflicts'])} conflits, "
+            f"première : {(results['errors'] or results['conflicts'])[0]}"
+        )
+    print(f"{label:<10} {rows:>6} lignes  {elapsed:8.2f} s  {rows / elapsed:10.0f} lignes/s")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--members", type=int, default=80)
+    args = parser.parse_args()
+
+    run_migrations()
+    db = SessionLocal()
+    club = Club(name="Benchmark sync push")
+    db.add(club)
+    db.flush()
+
+    members = [
+        Member(
+            club_id=club.id,
+            first_name=f"Judoka {i}",
+            last_name="Benchmark",
+            date_of_birth=date(2010, 1, 1),
+            gender="male",
+            category="minime",
+            monthly_fee=15000,
+            registration_date=date(2023, 9, 1),
+        )
+        for i in range(args.members)
+    ]
+    db.add_all(members)
+    db.commit()
+    member_ids = [member.id for member in members]
+
+    # One training day per member and row pair, and a separate range per run.
+    days = (args.rows // 2 + len(member_ids) - 1) // len(member_ids)
+    legacy_start = date(2024, 1, 1)
+    grouped_start = legacy_start + timedelta(days=days)
+    try:
+        run("ancien", legacy_push, db, build_changes(member_ids, args.rows, legacy_start), club.id)
+        run("groupé", apply_changes, db, build_changes(member_ids, args.rows, grouped_start), club.id)
+    finally:
+        db.rollback()
+        # Attendances first: their triggers write to the rollups.
+        for model_class in (Attendance, AttendanceCategoryMonth, AttendanceMemberMonth, Payment, Member, SyncSequence):
+            db.query(model_class).filter(model_class.club_id == club.id).delete()
+        db.delete(club)
+        db.commit()
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Montée en charge de gunicorn de 1 à N workers
+
+Lance l'API avec gunicorn.conf.py pour chaque nombre de workers demandé
+et mesure débit et latences p50 / p99 sur la liste des adhérents et sur
+/sync/pull (appareil sans curseur). Le client tourne sur la même machine
+et consomme lui aussi du CPU : au-delà du nombre de cœurs, les chiffres
+mesurent surtout la contention.
+
+Usage: python -m benchmarks.worker_scaling --workers 1 2 4 --concurrency 64 --requests 2000
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+import uuid
+from datetime import date, timedelta
+import httpx
+from app.core.security import create_access_token
+from app.db.base import SessionLocal
+from app.db.migrate import run_migrations
+from app.models import Attendance, Club, Member, User
+from app.models.sync import SyncSequence
+from benchmarks.load_test import drive, report
+
+def seed(members_count: int, sessions: int):
+    db = SessionLocal()
+    club = Club(name="Benchmark workers")
+    db.add(club)
+    db.flush()
+    # Tokens are only accepted for an existing user.
+    db.add(User(
+        club_id=club.id, email=f"workers-{club.id}@benchmark.invalid", hashed_password="-",
+        first_name="Benchmark", last_name="Workers", role="ADMIN",
+    ))
+    members = [
+        Member(
+            id=str(uuid.uuid4()),
+            club_id=club.id,
+            first_name=f"Judoka {i}",
+            last_name="Benchmark",
+            date_of_birth=date(2010, 1, 1),
+            gender="male",
+            category="minime",
+            monthly_fee=15000,
+            registration_date=date(2023, 9, 1),
+        )
+        for i in range(members_count)
+    ]
+    db.add_all(members)
+    db.add_all([
+        Attendance(club_id=club.id, member_id=member.id, attendance_date=date(2024, 1, 1) + timedelta(days=3 * day), is_present=True)
+        for member in members
+        for day in range(sessions)
+    ])
+    db.commit()
+    return db, club
+
+def cleanup(db, club):
+    for model_class in (Attendance, Member, SyncSequence):
+        db.query(model_class).filter(model_class.club_id == club.id).delete()
+    db.delete(club)
+    db.commit()
+    db.close()
+
+def start_server(workers: int, port: int) -> subprocess.Popen:
+    env = dict(os.environ, WEB_CONCURRENCY=str(workers), BIND=f"127.0.0.1:{port}")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "--access-logfile", "/dev/null", "app.main:app"],
+        env=env, stderr=subprocess.DEVNULL
+    )
+    for _ in range(300):
+        if server.poll() is not None:
+            raise SystemExit("gunicorn s'est arrêté au démarrage")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1).status_code == 200:
+                # /health answers as soon as one worker is up.
+                time.sleep(workers)
+                return server
+        except httpx.TransportError:
+            time.sleep(0.1)
+    server.terminate()
+    raise SystemExit("gunicorn ne répond pas")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--members", type=int, default=100)
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--port", type=int, default=8091)
+    args = parser.parse_args()
+
+    run_migrations()
+    db, club = seed(args.members, args.sessions)
+    user = db.query(User).filter(User.club_id == club.id).one()
+    token = create_access_token({"sub": user.id, "club_id": club.id, "role": "ADMIN"})
+    headers = {"Authorization": f"Bearer {token}"}
+    base_url = f"http://127.0.0.1:{args.port}/api/v1"
+    scenarios = [
+        ("liste", "GET", f"{base_url}/members/", None),
+        ("pull", "POST", f"{base_url}/sync/pull", {"cursors": {}}),
+    ]
+
+    print(f"{os.cpu_count()} cœurs, {args.concurrency} clients, {args.members} adhérents, {args.members * args.sessions} présences")
+    try:
+        for workers in args.workers:
+            server = start_server(workers, args.port)
+            try:
+                for label, method, url, body in scenarios:
+                    asyncio.run(drive(url, args.concurrency, args.concurrency, method, headers, body))
+                    report(f"{workers}w {label}", *asyncio.run(drive(url, args.requests, args.concurrency, method, headers, body)))
+            finally:
+                server.terminate()
+                server.wait()
+    finally:
+        cleanup(db, club)
+
+if __name__ == "__main__":
+    main()
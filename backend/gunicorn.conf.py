@@ -0,0 +1,49 @@
+# Production server: gunicorn -c gunicorn.conf.py app.main:app
+import multiprocessing
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# One event loop per core. Each worker holds its own database pools, so
+# workers * 2 * (DB_POOL_SIZE + DB_MAX_OVERFLOW) must stay under Postgres
+# max_connections (or PgBouncer's client limit); cap with WEB_CONCURRENCY.
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+
+# The app is imported once in the master and shared copy-on-write.
+preload_app = True
+
+# Workers are recycled after a jittered number of requests, so they do not
+# all restart at once.
+max_requests = int(os.getenv("MAX_REQUESTS", 5000))
+max_requests_jitter = int(os.getenv("MAX_REQUESTS_JITTER", 500))
+
+# On SIGTERM or a recycle, a worker stops accepting connections and lets
+# in-flight requests finish for up to graceful_timeout before being killed.
+# Open /sync/events streams never finish on their own, so a worker with
+# connected devices always uses the full delay; EventSource reconnects to
+# another worker once the stream is cut.
+graceful_timeout = int(os.getenv("GRACEFUL_TIMEOUT", 30))
+timeout = int(os.getenv("WORKER_TIMEOUT", 60))
+keepalive = 5
+
+accesslog = "-"
+
+def on_starting(server):
+    # Runs in the master before any worker is forked, so migrations are
+    # applied exactly once per deployment.
+    from app.db.migrate import run_migrations
+    from app.db.base import engine
+
+    run_migrations()
+    engine.dispose()
+
+def post_fork(server, worker):
+    # Connections opened in the master must not be shared with the workers;
+    # close=False leaves them to the master instead of closing its sockets.
+    from app.db.base import async_engine, engine, replica_engine
+
+    engine.dispose(close=False)
+    async_engine.sync_engine.dispose(close=False)
+    if replica_engine is not None:
+        replica_engine.sync_engine.dispose(close=False)
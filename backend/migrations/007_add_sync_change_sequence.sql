@@ -0,0 +1,51 @@
+-- Migration: Per-club change sequence for synchronisation
+--
+-- Every write to a synchronised table is stamped with a per-club, strictly
+-- increasing sequence number stored in the existing sync_version column.
+-- /sync/pull then reads "sync_version > cursor" instead of comparing
+-- updated_at against the client clock.
+--
+-- 1. sync_sequences holds the last sequence number handed out for each club
+-- 2. Existing rows are renumbered per club so that no two rows share a number
+-- 3. (club_id, sync_version) indexes turn pulls into index range scans
+
+CREATE TABLE IF NOT EXISTS sync_sequences (
+    club_id VARCHAR(36) PRIMARY KEY REFERENCES clubs(id) ON DELETE CASCADE,
+    last_seq INTEGER NOT NULL DEFAULT 0
+);
+
+INSERT INTO sync_sequences (club_id, last_seq)
+SELECT id, 0 FROM clubs
+ON CONFLICT (club_id) DO NOTHING;
+
+DO $$
+DECLARE
+    synced_table TEXT;
+BEGIN
+    FOREACH synced_table IN ARRAY ARRAY[
+        'members', 'payments', 'licenses', 'equipment',
+        'equipment_purchases', 'attendances', 'transactions', 'messages'
+    ]
+    LOOP
+        EXECUTE format(
+            'UPDATE %1$I t SET sync_version = s.last_seq + r.rn
+             FROM (SELECT id, club_id, row_number() OVER (PARTITION BY club_id ORDER BY updated_at, id) AS rn FROM %1$I) r
+             JOIN sync_sequences s ON s.club_id = r.club_id
+             WHERE t.id = r.id',
+            synced_table
+        );
+
+        EXECUTE format(
+            'UPDATE sync_sequences s SET last_seq = s.last_seq + c.n
+             FROM (SELECT club_id, count(*) AS n FROM %1$I GROUP BY club_id) c
+             WHERE s.club_id = c.club_id',
+            synced_table
+        );
+
+        EXECUTE format(
+            'CREATE INDEX IF NOT EXISTS %1$I ON %2$I (club_id, sync_version)',
+            'idx_' || synced_table || '_club_sync_version',
+            synced_table
+        );
+    END LOOP;
+END $$;
@@ -0,0 +1,31 @@
+-- Migration: Propagate deletions through /sync/pull
+--
+-- 1. sync_tombstones records every deleted row of a synchronised table,
+--    numbered with the club change sequence like any other write
+-- 2. sync_devices remembers, per device, the last tombstone it applied, so
+--    tombstones can be purged once every active device has seen them
+-- 3. sync_sequences.purged_seq marks how far tombstones were purged; a
+--    device that comes back from behind that point is told to reload
+
+ALTER TABLE sync_sequences ADD COLUMN IF NOT EXISTS purged_seq INTEGER NOT NULL DEFAULT 0;
+
+CREATE TABLE IF NOT EXISTS sync_tombstones (
+    id VARCHAR(36) PRIMARY KEY,
+    club_id VARCHAR(36) NOT NULL REFERENCES clubs(id) ON DELETE CASCADE,
+    entity VARCHAR(50) NOT NULL,
+    record_id VARCHAR(36) NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+    device_id VARCHAR(100),
+    sync_version INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_sync_tombstones_club_sync_version ON sync_tombstones(club_id, sync_version);
+
+CREATE TABLE IF NOT EXISTS sync_devices (
+    club_id VARCHAR(36) NOT NULL REFERENCES clubs(id) ON DELETE CASCADE,
+    device_id VARCHAR(100) NOT NULL,
+    last_seq INTEGER NOT NULL DEFAULT 0,
+    last_seen_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+    PRIMARY KEY (club_id, device_id)
+);
@@ -0,0 +1,15 @@
+from urllib.parse import urlencode
+import pytest
+from starlette.requests import Request
+from app.core.pagination import ListParams
+
+@pytest.fixture
+def list_params():
+    # ListParams as FastAPI builds it from a list request's query string.
+    def build(**query) -> ListParams:
+        request = Request({"type": "http", "query_string": urlencode(query, doseq=True).encode(), "headers": []})
+        return ListParams(
+            request, limit=query.get("limit", 100), cursor=query.get("cursor"), sort=query.get("sort"),
+            date_from=query.get("date_from"), date_to=query.get("date_to"), include_total=False,
+        )
+    return build
@@ -0,0 +1,25 @@
+from datetime import date
+import pytest
+from app.api.routes import attendances
+from app.api.routes.attendances import window_start
+
+def frozen_today(monkeypatch, today: date):
+    class FrozenDate(date):
+        @classmethod
+        def today(cls):
+            return cls(today.year, today.month, today.day)
+    monkeypatch.setattr(attendances, "date", FrozenDate)
+
+@pytest.mark.parametrize("today, months, start", [
+    (date(2024, 5, 17), 1, date(2024, 5, 1)),
+    (date(2024, 5, 1), 3, date(2024, 3, 1)),
+    (date(2024, 5, 31), 5, date(2024, 1, 1)),
+    (date(2024, 2, 29), 3, date(2023, 12, 1)),
+    (date(2024, 1, 10), 1, date(2024, 1, 1)),
+    (date(2024, 1, 10), 2, date(2023, 12, 1)),
+    (date(2024, 12, 31), 12, date(2024, 1, 1)),
+    (date(2024, 12, 31), 60, date(2020, 1, 1)),
+])
+def test_window_covers_the_current_month_and_the_ones_before(monkeypatch, today, months, start):
+    frozen_today(monkeypatch, today)
+    assert window_start(months) == start
@@ -0,0 +1,64 @@
+import gzip
+import json
+import pytest
+from fastapi import HTTPException
+from app.core.encoding import MSGPACK, NDJSON, decode_body, encoder_for, msgpack, negotiate_media_type, zstandard
+
+LIMIT = 64 * 1024
+
+def status_of(body: bytes, content_encoding=None, content_type="application/json") -> int:
+    with pytest.raises(HTTPException) as error:
+        decode_body(body, content_type, content_encoding, LIMIT)
+    return error.value.status_code
+
+@pytest.mark.parametrize("accept", [None, "", "*/*", "application/json", "text/html, application/xml;q=0.9", "application/x-msgpack;q=0"])
+def test_missing_or_unknown_accept_falls_back_to_ndjson(accept):
+    assert negotiate_media_type(accept) == NDJSON
+
+def test_ndjson_is_kept_when_asked_for():
+    assert negotiate_media_type("application/x-ndjson") == NDJSON
+
+@pytest.mark.skipif(msgpack is None, reason="msgpack is not installed")
+def test_msgpack_only_when_listed():
+    assert negotiate_media_type("application/x-msgpack") == MSGPACK
+
+def test_ndjson_encoder_writes_one_line_per_payload():
+    line = encoder_for(NDJSON)({"type": "cursor", "entity": "members", "cursor": 3})
+    assert line.endswith(b"\n") and line.count(b"\n") == 1
+    assert json.loads(line) == {"type": "cursor", "entity": "members", "cursor": 3}
+
+def test_body_within_the_limit_is_decoded():
+    payload = {"members": [{"id": "m-1", "data": {"first_name": "Awa"}}]}
+    assert decode_body(json.dumps(payload).encode(), "application/json", None, LIMIT) == payload
+    assert decode_body(gzip.compress(json.dumps(payload).encode()), "application/json", "gzip", LIMIT) == payload
+
+def test_raw_body_over_the_limit_is_refused():
+    assert status_of(b" " * (LIMIT + 1)) == 413
+
+def test_decompressed_size_is_what_counts():
+    # A few hundred bytes of gzip that expand past the limit.
+    bomb = gzip.compress(b" " * (LIMIT * 16))
+    assert len(bomb) < LIMIT
+    assert status_of(bomb, "gzip") == 413
+
+def test_body_exactly_at_the_limit_is_accepted():
+    body = json.dumps("x" * (LIMIT - 2)).encode()
+    assert len(body) == LIMIT
+    assert decode_body(gzip.compress(body), "application/json", "gzip", LIMIT) == "x" * (LIMIT - 2)
+
+def test_concatenated_gzip_members_are_read_whole():
+    body = gzip.compress(b'{"members": ') + gzip.compress(b"[]}")
+    assert decode_body(body, "application/json", "gzip", LIMIT) == {"members": []}
+
+@pytest.mark.skipif(zstandard is None, reason="zstandard is not installed")
+def test_zstd_bomb_without_content_size_is_refused():
+    # Streamed frames carry no content size, so only reading bounds them.
+    compressor = zstandard.ZstdCompressor(write_content_size=False)
+    bomb = compressor.compress(b" " * (LIMIT * 16))
+    assert status_of(bomb, "zstd") == 413
+
+def test_truncated_gzip_is_a_bad_request():
+    assert status_of(gzip.compress(b'{"members": []}')[:-6], "gzip") == 400
+
+def test_unknown_encoding_is_unsupported():
+    assert status_of(b"{}", "br") == 415
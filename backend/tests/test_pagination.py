@@ -0,0 +1,58 @@
+from datetime import date
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from app.api.routes.members import MEMBER_LIST
+from app.api.routes.payments import PAYMENT_LIST
+from app.core.pagination import decode_cursor, encode_cursor, page_query
+from app.models import Member, Payment
+
+def compiled(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+def test_cursor_round_trip():
+    cursor = encode_cursor("-payment_date", date(2024, 3, 5), "a1b2")
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == {"s": "-payment_date", "v": "2024-03-05", "id": "a1b2"}
+
+@pytest.mark.parametrize("cursor", ["not a cursor!", "e30", encode_cursor("last_name", "Diallo", "x")[:-4]])
+def test_malformed_cursor_is_rejected(cursor):
+    # "e30" is {} once decoded: valid JSON without the cursor keys.
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor)
+    assert error.value.status_code == 422
+
+def test_first_page_orders_by_sort_key_then_id(list_params):
+    sql = compiled(page_query(select(Member), MEMBER_LIST, list_params(limit=20)))
+    assert "ORDER BY members.last_name ASC, members.id ASC" in sql
+    assert "LIMIT 21" in sql
+    assert "(members.last_name, members.id) >" not in sql
+
+def test_next_page_seeks_past_the_cursor(list_params):
+    cursor = encode_cursor("last_name", "Diallo", "m-42")
+    sql = compiled(page_query(select(Member), MEMBER_LIST, list_params(cursor=cursor)))
+    assert "(members.last_name, members.id) > ('Diallo', 'm-42')" in sql
+
+def test_descending_sort_seeks_backwards(list_params):
+    cursor = encode_cursor("-payment_date", date(2024, 3, 5), "p-7")
+    sql = compiled(page_query(select(Payment), PAYMENT_LIST, list_params(cursor=cursor)))
+    assert "(payments.payment_date, payments.id) < ('2024-03-05', 'p-7')" in sql
+    assert "ORDER BY payments.payment_date DESC, payments.id DESC" in sql
+
+def test_cursor_from_another_sort_is_rejected(list_params):
+    cursor = encode_cursor("first_name", "Awa", "m-1")
+    with pytest.raises(HTTPException) as error:
+        page_query(select(Member), MEMBER_LIST, list_params(cursor=cursor))
+    assert error.value.detail == "Cursor does not match the requested sort"
+
+def test_unknown_sort_field_is_rejected(list_params):
+    with pytest.raises(HTTPException) as error:
+        page_query(select(Member), MEMBER_LIST, list_params(sort="monthly_fee"))
+    assert error.value.status_code == 422
+
+def test_cursor_value_is_validated(list_params):
+    cursor = encode_cursor("-payment_date", "not a date", "p-7")
+    with pytest.raises(HTTPException) as error:
+        page_query(select(Payment), PAYMENT_LIST, list_params(cursor=cursor))
+    assert error.value.detail == "Invalid value for payment_date"
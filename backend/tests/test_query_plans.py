@@ -0,0 +1,183 @@
+import random
+import uuid
+from datetime import date, timedelta
+import pytest
+from sqlalchemy import insert, select
+from sqlalchemy.exc import OperationalError
+from app.api.routes.attendances import ATTENDANCE_LIST
+from app.api.routes.equipment import PURCHASE_LIST
+from app.api.routes.licenses import LICENSE_LIST
+from app.api.routes.members import MEMBER_LIST
+from app.api.routes.messages import MESSAGE_LIST
+from app.api.routes.payments import PAYMENT_LIST
+from app.api.routes.transactions import TRANSACTION_LIST
+from app.core.pagination import apply_filters, count_query, encode_cursor, page_query
+from app.db.base import SessionLocal, engine
+from app.db.migrate import run_migrations
+from app.models import Attendance, Club, Equipment, EquipmentPurchase, License, Member, Message, Payment, Transaction
+from app.models.sync import SyncSequence
+
+# Every hot query (list pages, first and next page, filters, member
+# history, /sync/pull) must read its table through an index, never a
+# sequential scan; on the largest tables the expected index is enforced.
+# The queries are built by the same functions as the routes, against the
+# configured PostgreSQL database after migrating it, on enough clubs for
+# the planner to prefer the per-club indexes.
+CLUBS = 20
+MEMBERS = 200
+SESSIONS = 50
+
+SEEDED = (Attendance, Payment, Transaction, License, Message, EquipmentPurchase, Equipment, Member, SyncSequence)
+
+LIST_QUERIES = [
+    ("members", MEMBER_LIST, {}, None),
+    ("payments", PAYMENT_LIST, {}, "idx_payments_club_payment_date"),
+    ("payments of a month", PAYMENT_LIST, {"month_year": "2024-03"}, "idx_payments_club_month_year"),
+    ("payments by period", PAYMENT_LIST, {"date_from": "2024-01-01", "date_to": "2024-03-31"}, "idx_payments_club_payment_date"),
+    ("attendances", ATTENDANCE_LIST, {}, "idx_attendances_club_attendance_date"),
+    ("attendances of a member", ATTENDANCE_LIST, {"member_id": None}, None),
+    ("transactions", TRANSACTION_LIST, {}, "idx_transactions_club_transaction_date"),
+    ("licenses", LICENSE_LIST, {}, None),
+    ("messages", MESSAGE_LIST, {}, None),
+    ("purchases", PURCHASE_LIST, {}, None),
+]
+
+def new_id() -> str:
+    return str(uuid.uuid4())
+
+def seed_club(db, club_id: str, members_count: int, sessions: int):
+    seq = iter(range(1, 10**9))
+    start = date(2023, 9, 1)
+
+    def rows(model_class, items):
+        db.execute(insert(model_class), [dict(item, club_id=club_id, sync_version=next(seq)) for item in items])
+
+    members = [
+        dict(
+            id=new_id(), first_name=f"Judoka {i}", last_name=f"Nom {random.randrange(500)}",
+            date_of_birth=date(2010, 1, 1), gender="male", category="minime", monthly_fee=15000,
+            registration_date=start + timedelta(days=i % 365),
+        )
+        for i in range(members_count)
+    ]
+    rows(Member, members)
+    ids = [member["id"] for member in members]
+    equipment_id = new_id()
+    rows(Equipment, [dict(id=equipment_id, name="Judogi", equipment_type="judogi", price=20000, stock_quantity=10)])
+
+    rows(Attendance, [
+        dict(id=new_id(), member_id=member_id, attendance_date=start + timedelta(days=3 * day), is_present=day % 5 != 0)
+        for member_id in ids
+        for day in range(sessions)
+    ])
+    rows(Payment, [
+        dict(
+            id=new_id(), member_id=member_id, amount=15000, payment_type="monthly_fee",
+            payment_date=date(2023 + month // 12, month % 12 + 1, 5), month_year=f"{2023 + month // 12}-{month % 12 + 1:02d}",
+        )
+        for member_id in ids
+        for month in range(12)
+    ])
+    rows(Transaction, [
+        dict(id=new_id(), transaction_type="income", category="membership_fee", amount=15000, transaction_date=start + timedelta(days=i % 700))
+        for i in range(members_count * 3)
+    ])
+    rows(License, [
+        dict(id=new_id(), member_id=member_id, season="2023-2024", issue_date=start, expiry_date=start + timedelta(days=365), amount=5000)
+        for member_id in ids
+    ])
+    rows(Message, [dict(id=new_id(), title=f"Annonce {i}", content="...") for i in range(members_count)])
+    rows(EquipmentPurchase, [
+        dict(id=new_id(), member_id=member_id, equipment_id=equipment_id, unit_price=20000, total_amount=20000, purchase_date=start)
+        for member_id in ids
+    ])
+    db.add(SyncSequence(club_id=club_id, last_seq=next(seq)))
+    return ids
+
+@pytest.fixture(scope="module")
+def seeded():
+    try:
+        with engine.connect():
+            pass
+    except OperationalError:
+        pytest.skip("PostgreSQL is not reachable")
+
+    run_migrations()
+    random.seed(0)
+    db = SessionLocal()
+    club_ids = []
+    try:
+        for i in range(CLUBS):
+            club = Club(name=f"Query plans {i}")
+            db.add(club)
+            db.flush()
+            club_ids.append(club.id)
+            member_ids = seed_club(db, club.id, MEMBERS, SESSIONS)
+        db.commit()
+        with engine.connect() as connection:
+            connection.execution_options(isolation_level="AUTOCOMMIT").exec_driver_sql("ANALYZE")
+        yield db, club_ids[-1], member_ids[0]
+    finally:
+        db.rollback()
+        for model_class in SEEDED:
+            db.query(model_class).filter(model_class.club_id.in_(club_ids)).delete(synchronize_session=False)
+        db.query(Club).filter(Club.id.in_(club_ids)).delete(synchronize_session=False)
+        db.commit()
+        db.close()
+
+def plan_nodes(node):
+    yield node
+    for child in node.get("Plans", []):
+        yield from plan_nodes(child)
+
+def assert_indexed(table: str, statement, expected=None):
+    sql = str(statement.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+    with engine.connect() as connection:
+        plan = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}").scalar()[0]["Plan"]
+    nodes = list(plan_nodes(plan))
+    seq_scans = [node for node in nodes if node["Node Type"] == "Seq Scan" and node.get("Relation Name") == table]
+    indexes = {node["Index Name"] for node in nodes if "Index Name" in node}
+    assert not seq_scans, f"sequential scan on {table}"
+    assert indexes, f"no index read on {table}"
+    if expected is not None:
+        assert expected in indexes, f"{expected} not used, plan reads {sorted(indexes)}"
+
+@pytest.mark.parametrize("variant", ["page", "next page", "total"])
+@pytest.mark.parametrize("spec, query, expected", [case[1:] for case in LIST_QUERIES], ids=[case[0] for case in LIST_QUERIES])
+def test_list_query_is_indexed(seeded, list_params, spec, query, expected, variant):
+    db, club_id, member_id = seeded
+    query = {key: value or member_id for key, value in query.items()}
+    base = select(spec.model).where(spec.model.club_id == club_id)
+    params = list_params(**query)
+    filtered = apply_filters(base, spec, params)
+
+    if variant == "total":
+        # Counts only need to avoid a sequential scan.
+        assert_indexed(spec.model.__tablename__, count_query(filtered))
+        return
+    if variant == "next page":
+        sample = db.scalars(base.offset(50).limit(1)).one()
+        sort = query.get("sort") or spec.default_sort
+        cursor = encode_cursor(sort, getattr(sample, sort.lstrip("-")), sample.id)
+        params = list_params(cursor=cursor, **query)
+    assert_indexed(spec.model.__tablename__, page_query(filtered, spec, params), expected)
+
+@pytest.mark.parametrize("model_class, column, expected", [
+    (Payment, Payment.payment_date, "idx_payments_member_payment_date"),
+    (Attendance, Attendance.attendance_date, "uq_attendances_member_attendance_date"),
+], ids=["payments", "attendances"])
+def test_member_history_is_indexed(seeded, model_class, column, expected):
+    _, _, member_id = seeded
+    statement = select(model_class).where(model_class.member_id == member_id).order_by(column.desc())
+    assert_indexed(model_class.__tablename__, statement, expected)
+
+@pytest.mark.parametrize("model_class", [Member, Payment, Attendance, Transaction, License, Message, EquipmentPurchase], ids=lambda model_class: model_class.__tablename__)
+def test_sync_pull_is_indexed(seeded, model_class):
+    db, club_id, _ = seeded
+    # Same shape as stream_entity_changes for a device halfway through.
+    middle = db.scalar(select(model_class.sync_version).where(model_class.club_id == club_id).offset(50).limit(1))
+    statement = (
+        select(model_class).where(model_class.club_id == club_id, model_class.sync_version > middle)
+        .order_by(model_class.sync_version).limit(1001)
+    )
+    assert_indexed(model_class.__tablename__, statement)
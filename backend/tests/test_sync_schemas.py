@@ -0,0 +1,38 @@
+import pytest
+from pydantic import ValidationError
+from app.schemas.sync import SyncPullRequest
+
+def test_legacy_body_is_read_as_cursors():
+    # Older clients posted their cursors as the whole body.
+    request = SyncPullRequest.model_validate({"members": 12, "payments": 0})
+    assert request.cursors == {"members": 12, "payments": 0}
+    assert request.layout == "records"
+    assert request.page_size is None
+
+def test_legacy_timestamps_restart_the_entity():
+    # Timestamp cursors predate sequence numbers and cannot be resumed.
+    request = SyncPullRequest.model_validate({"members": "2024-03-01T10:00:00", "payments": 7})
+    assert request.cursors == {"members": None, "payments": 7}
+
+def test_empty_body_pulls_everything():
+    assert SyncPullRequest.model_validate({}).cursors == {}
+
+def test_current_body_is_kept():
+    request = SyncPullRequest.model_validate({
+        "cursors": {"members": 3, "attendances": "2024-01-01"},
+        "page_size": 200,
+        "layout": "columnar",
+        "profile": "coach",
+    })
+    assert request.cursors == {"members": 3, "attendances": None}
+    assert request.page_size == 200
+    assert request.layout == "columnar"
+    assert request.profile == "coach"
+
+def test_null_cursors_mean_no_cursors():
+    assert SyncPullRequest.model_validate({"cursors": None, "layout": "records"}).cursors == {}
+
+@pytest.mark.parametrize("body", [{"page_size": 0}, {"page_size": 5001}, {"layout": "rows"}])
+def test_invalid_options_are_rejected(body):
+    with pytest.raises(ValidationError):
+        SyncPullRequest.model_validate(body)
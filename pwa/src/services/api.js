@@ -36,11 +36,30 @@ const clearAuthData = async () => {
   await db.delete('auth_data', 'credentials');
 };
 
+// EventSource cannot send headers and URLs end up in access logs, so the
+// stream opens with a short-lived ticket rather than the access token.
+export const openEventSource = async (endpoint) => {
+  const { ticket } = await apiCall(`${endpoint}/ticket`, { method: 'POST' });
+  const url = new URL(`${API_BASE}${endpoint}`);
+  url.searchParams.set('ticket', ticket);
+  return new EventSource(url);
+};
+
+export const getDeviceId = () => {
+  let deviceId = localStorage.getItem('device_id');
+  if (!deviceId) {
+    deviceId = crypto.randomUUID();
+    localStorage.setItem('device_id', deviceId);
+  }
+  return deviceId;
+};
+
 export const apiCall = async (endpoint, options = {}) => {
   const token = getAuthToken();
 
   const headers = {
     'Content-Type': 'application/json',
+    'X-Device-Id': getDeviceId(),
     ...options.headers,
   };
 
@@ -85,6 +104,67 @@ export const apiCall = async (endpoint, options = {}) => {
   }
 };
 
+export const apiStream = async (endpoint, options = {}) => {
+  const token = getAuthToken();
+
+  // readNdjson is the only decoder here; the server can also answer in
+  // MessagePack when asked.
+  const headers = {
+    'Content-Type': 'application/json',
+    'Accept': 'application/x-ndjson',
+    'X-Device-Id': getDeviceId(),
+    ...options.headers,
+  };
+
+  if (token) {
+    headers['Authorization'] = `Bearer ${token}`;
+  }
+
+  const response = await fetch(`${API_BASE}${endpoint}`, {
+    ...options,
+    headers,
+  });
+
+  if (response.status === 401) {
+    clearAuthToken();
+    await clearAuthData();
+    window.location.href = '/login';
+    throw new Error('Unauthorized');
+  }
+
+  if (!response.ok) {
+    const error = await response.json().catch(() => ({ detail: 'Request failed' }));
+    throw new Error(error.detail || 'Request failed');
+  }
+
+  return response;
+};
+
+export async function* readNdjson(response) {
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+
+    buffer += decoder.decode(value, { stream: true });
+    const lines = buffer.split('\n');
+    buffer = lines.pop();
+
+    for (const line of lines) {
+      if (line.trim()) {
+        yield JSON.parse(line);
+      }
+    }
+  }
+
+  if (buffer.trim()) {
+    yield JSON.parse(buffer);
+  }
+}
+
 export const login = async (email, password) => {
   try {
     const response = await apiCall('/auth/login', {
@@ -1,26 +1,83 @@
 import { getDB, addToStore, getAllFromStore } from '../db';
-import { apiCall } from './api';
+import { apiCall, apiStream, openEventSource, readNdjson } from './api';
 
 const SYNC_INTERVAL = 30000;
+// With change notifications, polling only covers missed events and the
+// local queue, so it can run rarely.
+const FALLBACK_SYNC_INTERVAL = 5 * 60 * 1000;
+const SYNC_ENTITIES = ['members', 'payments', 'licenses', 'equipment', 'equipment_purchases', 'attendances', 'transactions', 'messages'];
 let syncIntervalId = null;
+let eventSource = null;
+let eventsRetryId = null;
+let syncRunning = null;
+let syncRequested = false;
 
 export const startSync = () => {
   if (syncIntervalId) return;
 
   performSync();
 
+  const interval = typeof EventSource === 'undefined' ? SYNC_INTERVAL : FALLBACK_SYNC_INTERVAL;
   syncIntervalId = setInterval(() => {
     performSync();
-  }, SYNC_INTERVAL);
+  }, interval);
+
+  if (typeof EventSource !== 'undefined') {
+    openEvents();
+  }
 
   window.addEventListener('online', performSync);
 };
 
+const openEvents = async () => {
+  let source;
+  try {
+    source = await openEventSource('/sync/events');
+  } catch (error) {
+    scheduleEvents();
+    return;
+  }
+  if (!syncIntervalId) {
+    source.close();
+    return;
+  }
+
+  eventSource = source;
+  source.addEventListener('change', performSync);
+  // Reconnections may have missed events, so catch up whenever the stream reopens.
+  source.addEventListener('open', performSync);
+  // The browser reconnects with the same ticket; once it has expired the
+  // stream is refused and closed, and a new ticket is needed.
+  source.addEventListener('error', () => {
+    if (source.readyState === EventSource.CLOSED && eventSource === source) {
+      eventSource = null;
+      scheduleEvents();
+    }
+  });
+};
+
+const scheduleEvents = () => {
+  if (syncIntervalId && !eventsRetryId) {
+    eventsRetryId = setTimeout(() => {
+      eventsRetryId = null;
+      openEvents();
+    }, SYNC_INTERVAL);
+  }
+};
+
 export const stopSync = () => {
   if (syncIntervalId) {
     clearInterval(syncIntervalId);
     syncIntervalId = null;
   }
+  if (eventsRetryId) {
+    clearTimeout(eventsRetryId);
+    eventsRetryId = null;
+  }
+  if (eventSource) {
+    eventSource.close();
+    eventSource = null;
+  }
   window.removeEventListener('online', performSync);
 };
 
@@ -29,11 +86,28 @@ export const performSync = async () => {
     return;
   }
 
+  // Notifications arriving during a sync are folded into a single follow-up run.
+  if (syncRunning) {
+    syncRequested = true;
+    return syncRunning;
+  }
+
+  syncRunning = (async () => {
+    do {
+      syncRequested = false;
+      try {
+        await pushChanges();
+        await pullChanges();
+      } catch (error) {
+        console.error('Sync failed:', error);
+      }
+    } while (syncRequested);
+  })();
+
   try {
-    await pushChanges();
-    await pullChanges();
-  } catch (error) {
-    console.error('Sync failed:', error);
+    await syncRunning;
+  } finally {
+    syncRunning = null;
   }
 };
 
@@ -43,64 +117,228 @@ const pushChanges = async () => {
 
   if (syncQueue.length === 0) return;
 
+  const { batch, idempotencyKey } = await loadPushBatch(db, syncQueue);
   const changesByEntity = {};
 
-  for (const item of syncQueue) {
+  for (const item of batch) {
     if (!changesByEntity[item.entity]) {
       changesByEntity[item.entity] = [];
     }
     changesByEntity[item.entity].push({
       id: item.record_id,
-      data: item.data
+      data: item.data,
+      base_version: item.base_version ?? item.data?.sync_version ?? null
     });
   }
 
   try {
+    const { body, headers } = await encodePushBody(changesByEntity);
     const response = await apiCall('/sync/push', {
       method: 'POST',
-      body: JSON.stringify(changesByEntity)
+      body,
+      headers: { ...headers, 'Idempotency-Key': idempotencyKey }
     });
 
-    if (response.results.success.length > 0) {
-      for (const item of syncQueue) {
+    const { success, errors = [], conflicts = [] } = response.results;
+
+    // Rows the server rejected stay queued and go out again with the next batch.
+    const rejected = new Set(errors.map((error) => `${error.entity}:${error.id}`));
+    for (const item of batch) {
+      if (!rejected.has(`${item.entity}:${item.record_id}`)) {
         await db.delete('sync_queue', item.id);
       }
     }
+    await db.delete('sync_metadata', 'push_batch');
+
+    for (const applied of success) {
+      await setLocalVersion(db, applied.entity, applied.id, applied.version);
+    }
+
+    for (const conflict of conflicts) {
+      const localItem = batch.filter(
+        (item) => item.entity === conflict.entity && item.record_id === conflict.id
+      ).pop();
+      await resolveConflict(db, conflict, localItem?.data);
+    }
   } catch (error) {
     console.error('Push failed:', error);
   }
 };
 
-const pullChanges = async () => {
-  const db = await getDB();
+// A batch keeps its items and key until the server answers, so a retry after
+// a timeout is recognised and replayed instead of being applied twice.
+const loadPushBatch = async (db, syncQueue) => {
+  const pending = await db.get('sync_metadata', 'push_batch');
+
+  if (pending) {
+    const ids = new Set(pending.items);
+    const batch = syncQueue.filter((item) => ids.has(item.id));
+    if (batch.length === pending.items.length) {
+      return { batch, idempotencyKey: pending.idempotency_key };
+    }
+  }
+
+  const idempotencyKey = crypto.randomUUID();
+  await db.put('sync_metadata', {
+    key: 'push_batch',
+    idempotency_key: idempotencyKey,
+    items: syncQueue.map((item) => item.id)
+  });
+  return { batch: syncQueue, idempotencyKey };
+};
 
-  const lastSync = {};
-  const stores = ['members', 'payments', 'licenses', 'equipment', 'equipment_purchases', 'attendances', 'transactions', 'messages', 'employees'];
+const encodePushBody = async (changes) => {
+  const body = JSON.stringify(changes);
 
-  for (const store of stores) {
+  if (typeof CompressionStream === 'undefined') {
+    return { body, headers: {} };
+  }
+
+  const compressed = new Blob([body]).stream().pipeThrough(new CompressionStream('gzip'));
+  return {
+    body: await new Response(compressed).arrayBuffer(),
+    headers: { 'Content-Encoding': 'gzip' }
+  };
+};
+
+const setLocalVersion = async (db, entity, id, version) => {
+  if (!SYNC_ENTITIES.includes(entity)) return;
+
+  const record = await db.get(entity, id);
+  if (record) {
+    record.sync_version = version;
+    await db.put(entity, record);
+  }
+};
+
+const resolveConflict = async (db, conflict, localData) => {
+  if (!SYNC_ENTITIES.includes(conflict.entity)) return;
+
+  if (!conflict.server) {
+    await db.delete(conflict.entity, conflict.id);
+    return;
+  }
+
+  // Another device created the same record (same member and day for an
+  // attendance) under its own id: the local copy is replaced by the server row.
+  const serverId = conflict.server.id;
+  if (serverId !== conflict.id) {
+    await db.delete(conflict.entity, conflict.id);
+  }
+
+  if (!localData) {
+    await db.put(conflict.entity, conflict.server);
+    return;
+  }
+
+  const rebased = { ...conflict.server, ...localData, id: serverId, sync_version: conflict.server_version };
+  await db.put(conflict.entity, rebased);
+  await db.add('sync_queue', {
+    entity: conflict.entity,
+    record_id: serverId,
+    data: rebased,
+    base_version: conflict.server_version,
+    queued_at: new Date().toISOString()
+  });
+};
+
+const loadCursors = async (db) => {
+  const cursors = {};
+
+  for (const store of [...SYNC_ENTITIES, 'tombstones']) {
     const metadata = await db.get('sync_metadata', store);
-    if (metadata) {
-      lastSync[store] = metadata.last_sync;
+    if (Number.isInteger(metadata?.cursor)) {
+      cursors[store] = metadata.cursor;
     }
   }
 
-  try {
-    const response = await apiCall('/sync/pull', {
-      method: 'POST',
-      body: JSON.stringify(lastSync)
-    });
+  return cursors;
+};
+
+const applyTombstone = async (db, tombstone) => {
+  if (!SYNC_ENTITIES.includes(tombstone.entity)) return;
+
+  const record = await db.get(tombstone.entity, tombstone.id);
+  if (record && !(record.sync_version > tombstone.seq)) {
+    await db.delete(tombstone.entity, tombstone.id);
+  }
+};
+
+const resetLocalData = async (db, cursors) => {
+  for (const store of SYNC_ENTITIES) {
+    await db.clear(store);
+  }
+  await db.clear('sync_metadata');
+
+  for (const key of Object.keys(cursors)) {
+    delete cursors[key];
+  }
+};
+
+const pullPage = async (db, cursors) => {
+  const response = await apiStream('/sync/pull', {
+    method: 'POST',
+    body: JSON.stringify({ cursors, layout: 'columnar' })
+  });
+
+  return applyPullStream(db, response, cursors);
+};
 
-    if (response.changes) {
-      for (const [entityName, records] of Object.entries(response.changes)) {
-        for (const record of records) {
-          await addToStore(entityName, record.data);
-        }
+const applyPullStream = async (db, response, cursors) => {
+  let hasMore = false;
+  const columns = {};
 
-        await db.put('sync_metadata', {
-          key: entityName,
-          last_sync: response.sync_timestamp
-        });
+  for await (const line of readNdjson(response)) {
+    if (line.type === 'columns') {
+      columns[line.entity] = line.columns;
+    } else if (line.type === 'rows') {
+      const names = columns[line.entity];
+      for (const row of line.rows) {
+        await addToStore(line.entity, Object.fromEntries(names.map((name, index) => [name, row[index]])));
       }
+    } else if (line.type === 'record') {
+      await addToStore(line.entity, line.data);
+    } else if (line.type === 'delete') {
+      await applyTombstone(db, line);
+    } else if (line.type === 'reset') {
+      await resetLocalData(db, cursors);
+    } else if (line.type === 'cursor') {
+      cursors[line.entity] = line.cursor;
+      await db.put('sync_metadata', {
+        key: line.entity,
+        cursor: line.cursor
+      });
+      if (line.has_more) {
+        hasMore = true;
+      }
+    }
+  }
+
+  return hasMore;
+};
+
+// A device without cursors starts from the club snapshot, then pulls only
+// what changed since it was built. Without a snapshot it pulls everything.
+const bootstrapFromSnapshot = async (db, cursors) => {
+  try {
+    const response = await apiStream('/sync/snapshot');
+    await applyPullStream(db, response, cursors);
+  } catch (error) {
+    console.warn('Snapshot unavailable, falling back to a full pull:', error);
+  }
+};
+
+const pullChanges = async () => {
+  const db = await getDB();
+  const cursors = await loadCursors(db);
+
+  try {
+    if (Object.keys(cursors).length === 0) {
+      await bootstrapFromSnapshot(db, cursors);
+    }
+
+    while (await pullPage(db, cursors)) {
+      if (!navigator.onLine) break;
     }
   } catch (error) {
     console.error('Pull failed:', error);